@@ -137,6 +137,8 @@ class AdvancedFeaturesConfig(BaseSettings):
     default_batch_size: int = Field(default=10, description="Default batch size for processing")
     max_batch_size: int = Field(default=100, description="Maximum batch size")
     parallel_processing: bool = Field(default=True, description="Enable parallel processing")
+    ingest_batch_size: int = Field(default=32, description="Maximum documents coalesced into one ingest batch")
+    ingest_batch_window_ms: float = Field(default=20.0, description="Time window for coalescing concurrent ingests in milliseconds")
     
     # Streaming settings
     enable_streaming: bool = Field(default=True, description="Enable real-time streaming")
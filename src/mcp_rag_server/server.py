@@ -6,9 +6,11 @@ for a complete RAG (Retrieval-Augmented Generation) solution.
 """
 
 import asyncio
+import functools
 import logging
+import time
 from contextlib import asynccontextmanager
-from typing import AsyncIterator
+from typing import AsyncIterator, Optional
 from pathlib import Path
 
 from mcp.server.fastmcp import FastMCP
@@ -34,6 +36,7 @@ from .tools.http_tools import HTTPIntegrationTools
 from .tools.advanced_features import AdvancedFeatures, StreamType
 from .resources.document_resources import DocumentResources
 from .resources.memory_resources import MemoryResources
+from .utils.event_loop import new_event_loop
 from .validation import (
     validate_document_input, validate_search_input, validate_question_input,
     validate_memory_input, create_error_response, create_success_response,
@@ -49,6 +52,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Seconds a failed service initialization is reported to callers before it is retried
+INIT_RETRY_BACKOFF = 30.0
+
 
 class MCPRAGServer:
     """Main MCP RAG Server class."""
@@ -83,12 +89,34 @@ class MCPRAGServer:
         self.document_resources: DocumentResources | None = None
         self.memory_resources: MemoryResources | None = None
         
+        # External services connect on first use so the transport can start immediately
+        self._initialized = False
+        self._init_lock = asyncio.Lock()
+        self._init_error: Exception | None = None
+        self._init_failed_at = 0.0
+        self._initialize_local_services()
+        
         # Register tools and resources
         self._register_tools()
         self._register_resources()
         self._register_prompts()
         self._register_advanced_tools()
     
+    def _lazy_tool(self, **kwargs):
+        """Register an MCP tool that initializes the external services before its first call."""
+        def decorator(fn):
+            @functools.wraps(fn)
+            async def wrapper(*args, **kw):
+                try:
+                    await self.initialize()
+                except Exception as e:
+                    return create_error_response(e, fn.__name__)
+                return await fn(*args, **kw)
+            
+            return self.mcp.tool(**kwargs)(wrapper)
+        
+        return decorator
+    
     def _register_tools(self):
         """Register MCP tools with proper validation and error handling."""
         
@@ -115,7 +143,7 @@ class MCPRAGServer:
                 return create_error_response(e, "health_check")
         
         # Document management tools
-        @self.mcp.tool()
+        @self._lazy_tool()
         async def add_document(content: str, metadata: dict = None, user_id: str = None) -> dict:
             """Add a document to the RAG system."""
             try:
@@ -144,7 +172,7 @@ class MCPRAGServer:
             except Exception as e:
                 return create_error_response(e, "add_document")
         
-        @self.mcp.tool()
+        @self._lazy_tool()
         async def delete_document(document_id: str, user_id: str = None) -> dict:
             """Delete a document from the RAG system."""
             try:
@@ -159,7 +187,7 @@ class MCPRAGServer:
             except Exception as e:
                 return create_error_response(e, "delete_document")
         
-        @self.mcp.tool()
+        @self._lazy_tool()
         async def get_document(document_id: str) -> dict:
             """Get a specific document by ID."""
             try:
@@ -171,7 +199,7 @@ class MCPRAGServer:
             except Exception as e:
                 return create_error_response(e, "get_document")
         
-        @self.mcp.tool()
+        @self._lazy_tool()
         async def list_documents(user_id: str = None, limit: int = 100) -> dict:
             """List documents in the RAG system."""
             try:
@@ -183,7 +211,7 @@ class MCPRAGServer:
             except Exception as e:
                 return create_error_response(e, "list_documents")
         
-        @self.mcp.tool()
+        @self._lazy_tool()
         async def get_document_stats(user_id: str = None) -> dict:
             """Get statistics about documents in the system."""
             try:
@@ -196,7 +224,7 @@ class MCPRAGServer:
                 return create_error_response(e, "get_document_stats")
         
         # Search and query tools
-        @self.mcp.tool()
+        @self._lazy_tool()
         async def search_documents(query: str, limit: int = 5, user_id: str = None, filters: dict = None) -> dict:
             """Search for documents using semantic search."""
             try:
@@ -224,7 +252,7 @@ class MCPRAGServer:
             except Exception as e:
                 return create_error_response(e, "search_documents")
         
-        @self.mcp.tool()
+        @self._lazy_tool()
         async def ask_question(question: str, user_id: str = None, session_id: str = None, use_memory: bool = True) -> dict:
             """Ask a question using RAG with optional memory context."""
             try:
@@ -253,7 +281,7 @@ class MCPRAGServer:
                 return create_error_response(e, "ask_question")
         
         # Memory management tools
-        @self.mcp.tool()
+        @self._lazy_tool()
         async def add_memory(content: str, memory_type: str = "conversation", user_id: str = None, session_id: str = None) -> dict:
             """Add a memory entry for a user."""
             try:
@@ -287,7 +315,7 @@ class MCPRAGServer:
             except Exception as e:
                 return create_error_response(e, "add_memory")
         
-        @self.mcp.tool()
+        @self._lazy_tool()
         async def search_memories(query: str, user_id: str = None, limit: int = 5, memory_type: str = None) -> dict:
             """Search for relevant memories for a user."""
             try:
@@ -305,7 +333,7 @@ class MCPRAGServer:
             except Exception as e:
                 return create_error_response(e, "search_memories")
         
-        @self.mcp.tool()
+        @self._lazy_tool()
         async def get_user_memories(user_id: str = None, limit: int = 50, memory_type: str = None) -> dict:
             """Get all memories for a user."""
             try:
@@ -324,7 +352,7 @@ class MCPRAGServer:
                 return create_error_response(e, "get_user_memories")
         
         # Session management tools
-        @self.mcp.tool()
+        @self._lazy_tool()
         async def create_session(user_id: str = None, session_name: str = None) -> dict:
             """Create a new session for a user."""
             try:
@@ -339,21 +367,21 @@ class MCPRAGServer:
             except Exception as e:
                 return create_error_response(e, "create_session")
         
-        @self.mcp.tool()
+        @self._lazy_tool()
         async def get_session(session_id: str) -> dict:
             """Get session information."""
             try:
                 if not self.session_tools:
                     raise RuntimeError("Session tools not initialized")
                 
-                result = await self.session_tools.get_session(session_id)
+                result = await self.session_tools.get_session_info(session_id)
                 return result
             except Exception as e:
                 return create_error_response(e, "get_session")
         
-        @self.mcp.tool()
-        async def list_sessions(user_id: str = None, limit: int = 10) -> dict:
-            """List sessions for a user."""
+        @self._lazy_tool()
+        async def list_sessions(user_id: str = None, limit: int = 10, cursor: str = None) -> dict:
+            """List sessions for a user, one page at a time (pass next_cursor to get the next page)."""
             try:
                 if not self.session_tools:
                     raise RuntimeError("Session tools not initialized")
@@ -361,12 +389,14 @@ class MCPRAGServer:
                 # Use configured default user_id if none provided
                 effective_user_id = user_id or config.mem0.default_user_id
                 
-                result = await self.session_tools.list_sessions(effective_user_id, limit)
+                result = await self.session_tools.list_user_sessions(
+                    effective_user_id, cursor=cursor, limit=limit
+                )
                 return result
             except Exception as e:
                 return create_error_response(e, "list_sessions")
         
-        @self.mcp.tool()
+        @self._lazy_tool()
         async def delete_session(session_id: str) -> dict:
             """Delete a session."""
             try:
@@ -673,7 +703,7 @@ class MCPRAGServer:
         """Register advanced MCP tools including HTTP integration and streaming."""
         
         # HTTP Integration Tools
-        @self.mcp.tool()
+        @self._lazy_tool()
         async def fetch_web_content(url: str, user_id: str = None, auto_add_to_rag: bool = True) -> dict:
             """Fetch content from URL and optionally add to RAG system."""
             try:
@@ -688,7 +718,7 @@ class MCPRAGServer:
             except Exception as e:
                 return create_error_response(e, "fetch_web_content")
         
-        @self.mcp.tool()
+        @self._lazy_tool()
         async def call_external_api(endpoint: str, method: str = "GET", data: dict = None, headers: dict = None, user_id: str = None) -> dict:
             """Call external API and optionally process response."""
             try:
@@ -703,8 +733,8 @@ class MCPRAGServer:
             except Exception as e:
                 return create_error_response(e, "call_external_api")
         
-        @self.mcp.tool()
-        async def batch_fetch_urls(urls: list, user_id: str = "default", max_concurrent: int = 5) -> dict:
+        @self._lazy_tool()
+        async def batch_fetch_urls(urls: list, user_id: str = "default", max_concurrent: Optional[int] = None) -> dict:
             """Fetch content from multiple URLs in parallel."""
             try:
                 if not self.http_tools:
@@ -716,7 +746,7 @@ class MCPRAGServer:
                 return create_error_response(e, "batch_fetch_urls")
         
         # Advanced Features - Batch Processing
-        @self.mcp.tool()
+        @self._lazy_tool()
         async def batch_add_documents(documents: list, user_id: str = None, batch_size: int = 10, parallel_processing: bool = True) -> dict:
             """Add multiple documents to RAG system in batch."""
             try:
@@ -731,7 +761,7 @@ class MCPRAGServer:
             except Exception as e:
                 return create_error_response(e, "batch_add_documents")
         
-        @self.mcp.tool()
+        @self._lazy_tool()
         async def batch_process_memories(memories: list, user_id: str = "default", batch_size: int = 20, memory_type: str = "conversation") -> dict:
             """Process multiple memories in batch."""
             try:
@@ -744,7 +774,7 @@ class MCPRAGServer:
                 return create_error_response(e, "batch_process_memories")
         
         # Advanced Features - Streaming
-        @self.mcp.tool()
+        @self._lazy_tool()
         async def start_streaming(stream_type: str, user_id: str = "default", session_id: str = None, callback_url: str = None) -> dict:
             """Start real-time streaming for specified type."""
             try:
@@ -762,7 +792,7 @@ class MCPRAGServer:
             except Exception as e:
                 return create_error_response(e, "start_streaming")
         
-        @self.mcp.tool()
+        @self._lazy_tool()
         async def stop_streaming(stream_id: str) -> dict:
             """Stop streaming for specified stream ID."""
             try:
@@ -774,7 +804,7 @@ class MCPRAGServer:
             except Exception as e:
                 return create_error_response(e, "stop_streaming")
         
-        @self.mcp.tool()
+        @self._lazy_tool()
         async def get_stream_status(stream_id: str) -> dict:
             """Get status of streaming for specified stream ID."""
             try:
@@ -786,7 +816,7 @@ class MCPRAGServer:
             except Exception as e:
                 return create_error_response(e, "get_stream_status")
         
-        @self.mcp.tool()
+        @self._lazy_tool()
         async def list_active_streams(user_id: str = None) -> dict:
             """List all active streams."""
             try:
@@ -838,9 +868,6 @@ class MCPRAGServer:
     def _register_prompts(self):
         """Register MCP prompts functionality."""
         try:
-            # Initialize prompts service
-            self.prompts_service = PromptsService()
-            
             # Register prompts using FastMCP @mcp.prompt() decorator
             @self.mcp.prompt()
             def ask_about_topic(topic: str) -> str:
@@ -885,37 +912,88 @@ class MCPRAGServer:
             logger.warning(f"Prompts functionality not available: {e}")
             logger.info("Prompts functionality not supported in current MCP version")
     
+    def _initialize_local_services(self):
+        """Initialize the in-process services, which need no external connections."""
+        self.reasoning_service = AdvancedReasoningEngine(ReasoningConfig())
+        self.context_service = EnhancedContextService(ContextConfig())
+        self.prompts_service = PromptsService()
+        self.code_analysis_service = CodeAnalysisService()
+        
+        self.ai_tools = AdvancedAITools(
+            self.reasoning_service,
+            self.context_service
+        )
+        self.code_analysis_tools = CodeAnalysisTools(self.code_analysis_service)
+    
     async def initialize(self):
-        """Initialize all services."""
-        await self._initialize_services()
+        """Initialize all services once; later calls return immediately.
+        
+        After a failure, calls within INIT_RETRY_BACKOFF seconds fail at once
+        with the same error instead of retrying the external connections.
+        """
+        if self._initialized:
+            return
+        self._check_recent_init_failure()
+        async with self._init_lock:
+            if self._initialized:
+                return
+            self._check_recent_init_failure()
+            try:
+                await self._initialize_services()
+            except Exception as e:
+                self._init_error = e
+                self._init_failed_at = time.monotonic()
+                raise
+            self._init_error = None
+            self._initialized = True
+    
+    def _check_recent_init_failure(self):
+        """Raise if service initialization failed less than INIT_RETRY_BACKOFF seconds ago."""
+        if self._init_error is None:
+            return
+        remaining = INIT_RETRY_BACKOFF - (time.monotonic() - self._init_failed_at)
+        if remaining > 0:
+            raise RuntimeError(
+                f"Services unavailable, retrying in {remaining:.0f}s: {self._init_error}"
+            ) from self._init_error
     
     async def initialize_services(self):
         """Alias for initialize() for backward compatibility."""
         await self.initialize()
     
     async def _initialize_services(self):
-        """Initialize all services."""
+        """Initialize the services backed by external APIs and storage.
+        
+        If any step fails, the services started so far are cleaned up again.
+        """
+        # Services whose initialization completed, in start order
+        started = []
         try:
             logger.info("Initializing MCP RAG Server...")
             
             # Initialize Gemini service
             self.gemini_service = GeminiService(config.gemini)
             await self.gemini_service.initialize()
+            started.append(self.gemini_service)
             logger.info("Gemini service initialized")
             
             # Initialize Qdrant service
             self.qdrant_service = QdrantService(config.qdrant)
+            # Listed before connecting: cleanup also closes the client of a failed attempt
+            started.append(self.qdrant_service)
             await self.qdrant_service.initialize()
             logger.info("Qdrant service initialized")
             
             # Initialize Mem0 service
             self.mem0_service = Mem0Service(config.mem0)
             await self.mem0_service.initialize()
+            started.append(self.mem0_service)
             logger.info("Mem0 service initialized")
             
             # Initialize Session service
             self.session_service = SessionService(config.session)
             await self.session_service.initialize()
+            started.append(self.session_service)
             logger.info("Session service initialized")
             
             # Initialize RAG service
@@ -923,49 +1001,31 @@ class MCPRAGServer:
                 self.gemini_service,
                 self.qdrant_service,
                 self.mem0_service,
-                self.session_service
+                self.session_service,
+                ingest_batch_size=config.advanced_features.ingest_batch_size,
+                ingest_batch_window_ms=config.advanced_features.ingest_batch_window_ms
             )
             await self.rag_service.initialize()
+            started.append(self.rag_service)
             logger.info("RAG service initialized")
             
-            # Initialize Reasoning service
-            reasoning_config = ReasoningConfig()
-            self.reasoning_service = AdvancedReasoningEngine(reasoning_config)
-            logger.info("Reasoning service initialized")
-            
-            # Initialize Context service
-            context_config = ContextConfig()
-            self.context_service = EnhancedContextService(context_config)
-            logger.info("Context service initialized")
-            
-            # Initialize Prompts service
-            self.prompts_service = PromptsService()
-            logger.info("Prompts service initialized")
-            
-            # Initialize Code Analysis service
-            self.code_analysis_service = CodeAnalysisService()
-            logger.info("Code Analysis service initialized")
-            
             # Initialize tool instances
             self.document_tools = DocumentTools(self.rag_service)
             self.search_tools = SearchTools(self.rag_service)
             self.memory_tools = MemoryTools(self.mem0_service, self.rag_service)
             self.session_tools = SessionTools(self.session_service)
-            self.ai_tools = AdvancedAITools(
-                self.reasoning_service,
-                self.context_service
-            )
-            self.code_analysis_tools = CodeAnalysisTools(self.code_analysis_service)
             
             # Initialize advanced tools
             from .services.document_processor import DocumentProcessor
             document_processor = DocumentProcessor()
             self.http_tools = HTTPIntegrationTools(self.rag_service, document_processor)
+            started.append(self.http_tools)
             self.advanced_features = AdvancedFeatures(
                 self.rag_service,
                 self.mem0_service,
                 self.session_service
             )
+            started.append(self.advanced_features)
             
             # Initialize resource instances
             self.document_resources = DocumentResources(self.rag_service)
@@ -975,8 +1035,31 @@ class MCPRAGServer:
             
         except Exception as e:
             logger.error(f"Error initializing MCP RAG Server: {e}")
+            await self._abort_initialization(started)
             raise
     
+    async def _abort_initialization(self, started):
+        """Clean up the services of a failed initialization, newest first, and forget them."""
+        for service in reversed(started):
+            try:
+                await service.cleanup()
+            except Exception as e:
+                logger.error(f"Error cleaning up {type(service).__name__}: {e}")
+        
+        self.gemini_service = None
+        self.qdrant_service = None
+        self.mem0_service = None
+        self.session_service = None
+        self.rag_service = None
+        self.document_tools = None
+        self.search_tools = None
+        self.memory_tools = None
+        self.session_tools = None
+        self.http_tools = None
+        self.advanced_features = None
+        self.document_resources = None
+        self.memory_resources = None
+    
     async def cleanup(self):
         """Cleanup all services."""
         await self._cleanup_services()
@@ -988,6 +1071,16 @@ class MCPRAGServer:
     async def _cleanup_services(self):
         """Cleanup resources."""
         try:
+            # Cleanup advanced tools first, so nothing submits new ingests
+            if self.http_tools:
+                await self.http_tools.cleanup()
+            if self.advanced_features:
+                await self.advanced_features.cleanup()
+            
+            # Then the RAG service, whose ingest batcher flushes into the
+            # clients below, before those clients are closed
+            if self.rag_service:
+                await self.rag_service.cleanup()
             if self.gemini_service:
                 await self.gemini_service.cleanup()
             if self.qdrant_service:
@@ -997,12 +1090,6 @@ class MCPRAGServer:
             if self.session_service:
                 await self.session_service.cleanup()
             
-            # Cleanup advanced tools
-            if self.http_tools:
-                await self.http_tools.cleanup()
-            if self.advanced_features:
-                await self.advanced_features.cleanup()
-            
             logger.info("MCP RAG Server cleanup completed")
             
         except Exception as e:
@@ -1034,4 +1121,5 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    with asyncio.Runner(loop_factory=new_event_loop) as runner:
+        runner.run(main())
\ No newline at end of file
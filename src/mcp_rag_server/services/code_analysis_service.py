@@ -9,7 +9,7 @@ import ast
 import re
 import logging
 from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 import fnmatch
 import os
@@ -19,6 +19,11 @@ from ..config import get_config
 logger = logging.getLogger(__name__)
 
 
+def _summarize_docstring(docstring: Optional[str]) -> str:
+    """Truncate a docstring to the short form shown in analysis summaries."""
+    return f"{docstring[:100]}..." if docstring else ""
+
+
 @dataclass
 class FunctionInfo:
     """Information about a function extracted from code."""
@@ -31,6 +36,10 @@ class FunctionInfo:
     decorators: List[str]
     is_async: bool
     is_method: bool
+    docstring_summary: str = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.docstring_summary = _summarize_docstring(self.docstring)
 
 
 @dataclass
@@ -44,6 +53,10 @@ class ClassInfo:
     docstring: Optional[str]
     inheritance: List[str]
     decorators: List[str]
+    docstring_summary: str = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.docstring_summary = _summarize_docstring(self.docstring)
 
 
 @dataclass
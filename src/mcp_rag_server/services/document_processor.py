@@ -7,15 +7,22 @@ for optimal storage and retrieval in the RAG system.
 
 import logging
 import hashlib
-from typing import List, Dict, Any, Optional
+from itertools import islice
+from typing import List, Dict, Any, Optional, AsyncIterator
 from datetime import datetime
 from pathlib import Path
 
 from ..utils.text_splitter import SimpleTextSplitter
+from ..utils.html_text import extract_html_text
 import tiktoken
 
 logger = logging.getLogger(__name__)
 
+# MIME types handled by process_content_bytes
+HTML_CONTENT_TYPES = frozenset({"text/html", "application/xhtml+xml"})
+BINARY_CONTENT_TYPES = frozenset({"application/octet-stream", "application/pdf", "application/zip"})
+BINARY_CONTENT_PREFIXES = ("image/", "audio/", "video/", "font/")
+
 
 class DocumentProcessor:
     """Service for processing and chunking documents."""
@@ -69,6 +76,92 @@ class DocumentProcessor:
         
         return text.strip()
     
+    async def process_content_bytes(
+        self, 
+        data: bytes, 
+        content_type: str = "",
+        encoding: Optional[str] = None
+    ) -> str:
+        """Decode raw fetched content into text ready for chunking, based on its MIME type."""
+        mime_type = content_type.split(";", 1)[0].strip().lower()
+        if mime_type in BINARY_CONTENT_TYPES or mime_type.startswith(BINARY_CONTENT_PREFIXES):
+            raise ValueError(f"Unsupported content type: {mime_type}")
+        
+        try:
+            text = data.decode(encoding or "utf-8", errors="replace")
+        except LookupError:
+            logger.warning(f"Unknown encoding {encoding}, decoding as utf-8")
+            text = data.decode("utf-8", errors="replace")
+        
+        if mime_type in HTML_CONTENT_TYPES:
+            text = extract_html_text(text)
+        return text
+    
+    async def process_content_stream(
+        self, 
+        data: bytes, 
+        content_type: str = "",
+        encoding: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """Decode raw fetched content and yield its chunks as they are split."""
+        text = await self.process_content_bytes(data, content_type, encoding)
+        chunks = self.text_splitter.iter_split_text(self.preprocess_text(text))
+        
+        for chunk in islice(chunks, self.max_chunks_per_document):
+            if chunk.strip():
+                yield chunk
+        
+        if next(chunks, None) is not None:
+            logger.warning(f"Document has more than {self.max_chunks_per_document} chunks, limiting to {self.max_chunks_per_document}")
+    
+    def split_content(self, content: str) -> List[str]:
+        """Preprocess content and split it into at most max_chunks_per_document chunks."""
+        # Preprocess the content
+        processed_content = self.preprocess_text(content)
+        
+        if not processed_content:
+            logger.warning("Empty content after preprocessing")
+            return []
+        
+        # Split the text into chunks
+        chunks = self.text_splitter.split_text(processed_content)
+        
+        # Limit the number of chunks if needed
+        if len(chunks) > self.max_chunks_per_document:
+            logger.warning(f"Document has {len(chunks)} chunks, limiting to {self.max_chunks_per_document}")
+            chunks = chunks[:self.max_chunks_per_document]
+        
+        return chunks
+    
+    def build_chunk(
+        self, 
+        chunk: str, 
+        index: int,
+        total_chunks: Optional[int],
+        metadata: Optional[Dict[str, Any]] = None,
+        document_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Build a chunk document (total_chunks is None when the total is not known yet)."""
+        # Generate chunk metadata
+        chunk_metadata = metadata.copy() if metadata else {}
+        chunk_metadata.update({
+            "chunk_index": index,
+            "total_chunks": total_chunks,
+            "chunk_size": len(chunk),
+            "token_count": self.count_tokens(chunk),
+            "document_id": document_id,
+            "processed_at": datetime.now().isoformat()
+        })
+        
+        return {
+            "id": self.generate_chunk_id(chunk, index),
+            "content": chunk,
+            "metadata": chunk_metadata,
+            "document_id": document_id,
+            "chunk_index": index,
+            "total_chunks": total_chunks
+        }
+    
     def chunk_document(
         self, 
         content: str, 
@@ -77,48 +170,14 @@ class DocumentProcessor:
     ) -> List[Dict[str, Any]]:
         """Chunk a document into smaller pieces."""
         try:
-            # Preprocess the content
-            processed_content = self.preprocess_text(content)
-            
-            if not processed_content:
-                logger.warning("Empty content after preprocessing")
-                return []
-            
-            # Split the text into chunks
-            chunks = self.text_splitter.split_text(processed_content)
-            
-            # Limit the number of chunks if needed
-            if len(chunks) > self.max_chunks_per_document:
-                logger.warning(f"Document has {len(chunks)} chunks, limiting to {self.max_chunks_per_document}")
-                chunks = chunks[:self.max_chunks_per_document]
+            chunks = self.split_content(content)
             
             # Create chunk documents
-            chunk_documents = []
-            for i, chunk in enumerate(chunks):
-                if not chunk.strip():
-                    continue
-                
-                # Generate chunk metadata
-                chunk_metadata = metadata.copy() if metadata else {}
-                chunk_metadata.update({
-                    "chunk_index": i,
-                    "total_chunks": len(chunks),
-                    "chunk_size": len(chunk),
-                    "token_count": self.count_tokens(chunk),
-                    "document_id": document_id,
-                    "processed_at": datetime.now().isoformat()
-                })
-                
-                chunk_doc = {
-                    "id": self.generate_chunk_id(chunk, i),
-                    "content": chunk,
-                    "metadata": chunk_metadata,
-                    "document_id": document_id,
-                    "chunk_index": i,
-                    "total_chunks": len(chunks)
-                }
-                
-                chunk_documents.append(chunk_doc)
+            chunk_documents = [
+                self.build_chunk(chunk, i, len(chunks), metadata, document_id)
+                for i, chunk in enumerate(chunks)
+                if chunk.strip()
+            ]
             
             logger.info(f"Created {len(chunk_documents)} chunks from document")
             return chunk_documents
@@ -0,0 +1,151 @@
+"""
+Document ingest batching service.
+
+This service coalesces document ingests that arrive concurrently into a single
+batched ingest call, so their chunks share one embedding request.
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# (content, metadata, user_id, future awaiting the ingest result)
+_PendingIngest = Tuple[str, Optional[Dict[str, Any]], str, asyncio.Future]
+
+BatchIngestFn = Callable[
+    [List[str], List[Optional[Dict[str, Any]]], str],
+    Awaitable[List[Union[Dict[str, Any], Exception]]]
+]
+SingleIngestFn = Callable[[str, Optional[Dict[str, Any]], str], Awaitable[Dict[str, Any]]]
+
+
+class IngestBatcher:
+    """Collects ingest requests within a short window and submits them together."""
+
+    def __init__(
+        self,
+        add_documents: BatchIngestFn,
+        add_document: SingleIngestFn,
+        max_batch_size: int = 32,
+        batch_window_ms: float = 20.0
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            add_documents: Batch ingest callable (contents, metadatas, user_id),
+                returning each document's result or the exception it failed with
+            add_document: Single ingest callable used to isolate failures in a batch
+            max_batch_size: Maximum number of documents submitted in one batch
+            batch_window_ms: How long to wait for more documents after the first one
+        """
+        self.add_documents = add_documents
+        self.add_document = add_document
+        self.max_batch_size = max(1, max_batch_size)
+        self.batch_window = max(0.0, batch_window_ms) / 1000
+        self._queue: "asyncio.Queue[_PendingIngest]" = asyncio.Queue()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    async def submit(
+        self,
+        content: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        user_id: str = "default"
+    ) -> Dict[str, Any]:
+        """Queue a document for the next batch and wait for its ingest result."""
+        if self._closed:
+            raise RuntimeError("Ingest batcher closed")
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((content, metadata, user_id, future))
+        return await future
+
+    async def _flush_loop(self):
+        """Drain the queue into batches bounded by size and time window."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_window
+
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                await self._flush(batch)
+            except asyncio.CancelledError:
+                self._fail(batch, RuntimeError("Ingest batcher closed"))
+                raise
+
+    @staticmethod
+    def _fail(entries: List[_PendingIngest], error: Exception):
+        """Fail every unresolved future in ``entries`` with ``error``."""
+        for _, _, _, future in entries:
+            if not future.done():
+                future.set_exception(error)
+
+    async def _flush(self, batch: List[_PendingIngest]):
+        """Ingest one batch, one add_documents call per user."""
+        by_user: Dict[str, List[_PendingIngest]] = defaultdict(list)
+        for entry in batch:
+            by_user[entry[2]].append(entry)
+
+        for user_id, entries in by_user.items():
+            try:
+                results = await self.add_documents(
+                    [content for content, _, _, _ in entries],
+                    [metadata for _, metadata, _, _ in entries],
+                    user_id
+                )
+            except Exception as e:
+                # One bad document fails the whole batch; retry individually so
+                # only that document's caller sees the error.
+                logger.warning(f"Batched ingest of {len(entries)} documents failed, retrying individually: {e}")
+                await self._ingest_individually(entries)
+                continue
+
+            logger.debug(f"Ingested batch of {len(entries)} documents for user {user_id}")
+            for (_, _, _, future), result in zip(entries, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    async def _ingest_individually(self, entries: List[_PendingIngest]):
+        """Ingest entries one at a time, resolving each future separately."""
+        for content, metadata, user_id, future in entries:
+            if future.done():
+                continue
+            try:
+                future.set_result(await self.add_document(content, metadata, user_id))
+            except Exception as e:
+                future.set_exception(e)
+
+    async def close(self):
+        """Stop the flush loop and fail any ingests still waiting in the queue."""
+        self._closed = True
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+
+        pending = []
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        self._fail(pending, RuntimeError("Ingest batcher closed"))
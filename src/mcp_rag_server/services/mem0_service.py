@@ -9,14 +9,26 @@ import logging
 import json
 import os
 import numpy as np
+from collections import Counter
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from pathlib import Path
 
 from ..config import Mem0Config
+from ..utils.cache import LRUCache
 
 logger = logging.getLogger(__name__)
 
+# Advanced search strategies that rank memories by query embedding similarity
+EMBEDDING_SEARCH_STRATEGIES = frozenset({"hierarchical", "semantic", "hybrid"})
+
+# How long a fetched memory list is reused if the user's memories do not change (seconds)
+MEMORY_FETCH_TTL = 5.0
+# How long a user found to have no memories is answered without a lookup (seconds)
+EMPTY_USER_TTL = 30.0
+# How long advanced search results are reused for repeated queries (seconds)
+ADVANCED_SEARCH_TTL = 10.0
+
 
 class Mem0Service:
     """Service for managing conversation memory with mem0."""
@@ -28,6 +40,14 @@ class Mem0Service:
         self._initialized = False
         self.local_storage = {}
         self.storage_path = self._get_storage_path()
+        # Results of get_relevant_memories, dropped whenever a user's memories change
+        self._relevance_cache = LRUCache(max_size=512)
+        # Lists returned by get_user_memories, dropped whenever a user's memories change
+        self._memory_fetch_cache = LRUCache(max_size=256, ttl=MEMORY_FETCH_TTL)
+        # Users recently found to have no memories at all
+        self._empty_users = LRUCache(max_size=1024, ttl=EMPTY_USER_TTL)
+        # Results of search_memories_advanced, keyed by user, normalized query and options
+        self._advanced_search_cache = LRUCache(max_size=512, ttl=ADVANCED_SEARCH_TTL)
     
     def _get_storage_path(self) -> Path:
         """Get storage path with project namespace for isolation."""
@@ -137,6 +157,7 @@ class Mem0Service:
             
             # Save to disk
             await self._save_local_storage()
+            self._invalidate_user_caches(user_id)
             
             logger.debug(f"Added local memory for user {user_id}: {content[:50]}... (with embedding: {embedding is not None})")
             
@@ -205,13 +226,21 @@ class Mem0Service:
         limit: int = 50,
         memory_type: Optional[str] = None
     ) -> List[Dict[str, Any]]:
-        """Get all memories for a user."""
+        """Get all memories for a user (reused until the user's memories change)."""
         if not self._initialized:
             raise RuntimeError("Mem0 service not initialized")
         
+        if self._empty_users.get(user_id):
+            return []
+        cache_key = (user_id, limit, memory_type)
+        cached = self._memory_fetch_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+        
         try:
             # Local storage only (self-hosted mem0)
-            if user_id not in self.local_storage["memories"]:
+            if not self.local_storage["memories"].get(user_id):
+                self._empty_users.set(user_id, True)
                 return []
             
             memories = self.local_storage["memories"][user_id]
@@ -221,15 +250,26 @@ class Mem0Service:
                 memories = [m for m in memories if m.get("memory_type") == memory_type]
             
             # Limit results
-            memories = memories[-limit:] if limit > 0 else memories
+            memories = memories[-limit:] if limit > 0 else list(memories)
             
             logger.debug(f"Local memory list for user {user_id}: {len(memories)} memories")
-            return memories
+            self._memory_fetch_cache.set(cache_key, memories)
+            return list(memories)
             
         except Exception as e:
             logger.error(f"Error getting user memories: {e}")
             return []
     
+    async def count_memories(self, user_id: str, memory_type: Optional[str] = None) -> int:
+        """Count memories for a user without returning them."""
+        if not self._initialized:
+            raise RuntimeError("Mem0 service not initialized")
+        
+        memories = self.local_storage["memories"].get(user_id, [])
+        if memory_type:
+            return sum(1 for m in memories if m.get("memory_type") == memory_type)
+        return len(memories)
+    
     async def get_memories(
         self, 
         user_id: str, 
@@ -246,8 +286,30 @@ class Mem0Service:
         limit: int = 5,
         memory_type: Optional[str] = None
     ) -> List[Dict[str, Any]]:
-        """Get relevant memories for a query (alias for search_memories)."""
-        return await self.search_memories(user_id, query, limit, memory_type)
+        """Get relevant memories for a query (cached alias for search_memories)."""
+        # Keyword scoring ignores case, spacing and word order, so queries that
+        # share the same bag of words always produce the same result.
+        cache_key = (user_id, tuple(sorted(query.lower().split())), limit, memory_type)
+        cached = self._relevance_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+        
+        memories = await self.search_memories(user_id, query, limit, memory_type)
+        self._relevance_cache.set(cache_key, memories)
+        return list(memories)
+    
+    def _invalidate_user_caches(self, user_id: Optional[str] = None) -> None:
+        """Drop cached memory lists and search results for a user (or for all users)."""
+        if user_id is None:
+            self._relevance_cache.clear()
+            self._memory_fetch_cache.clear()
+            self._advanced_search_cache.clear()
+            self._empty_users.clear()
+        else:
+            self._relevance_cache.invalidate(lambda key, _: key[0] == user_id)
+            self._memory_fetch_cache.invalidate(lambda key, _: key[0] == user_id)
+            self._advanced_search_cache.invalidate(lambda key, _: key[0] == user_id)
+            self._empty_users.pop(user_id)
     
     async def clear_memories(
         self, 
@@ -278,6 +340,7 @@ class Mem0Service:
                     await self._save_local_storage()
                     logger.debug(f"Local memory deletion for user {user_id}, memory {memory_id}")
             
+            self._invalidate_user_caches(user_id)
             return True
             
         except Exception as e:
@@ -303,6 +366,7 @@ class Mem0Service:
                     self.local_storage["memories"][user_id] = []
                 
                 await self._save_local_storage()
+                self._invalidate_user_caches(user_id)
                 logger.info(f"Cleared memories for user {user_id}")
             
             return True
@@ -327,11 +391,7 @@ class Mem0Service:
                 }
             
             memories = self.local_storage["memories"][user_id]
-            memory_types = {}
-            
-            for memory in memories:
-                memory_type = memory.get("memory_type", "unknown")
-                memory_types[memory_type] = memory_types.get(memory_type, 0) + 1
+            memory_types = Counter(memory.get("memory_type", "unknown") for memory in memories)
             
             return {
                 "user_id": user_id,
@@ -566,6 +626,7 @@ class Mem0Service:
                     if memory.get("id") == memory_id:
                         memory["embedding"] = embedding
                         await self._save_local_storage()
+                        self._invalidate_user_caches(user_id)
                         logger.debug(f"Updated embedding for memory {memory_id}")
                         return True
             
@@ -777,6 +838,7 @@ class Mem0Service:
             
             if cleaned_count > 0:
                 await self._save_local_storage()
+                self._invalidate_user_caches()
                 logger.info(f"Cleaned up {cleaned_count} memories for session {session_id}")
             
             return cleaned_count
@@ -819,10 +881,7 @@ class Mem0Service:
                 }
             
             # Calculate statistics
-            memory_types = {}
-            for memory in session_memories:
-                mem_type = memory.get("memory_type", "unknown")
-                memory_types[mem_type] = memory_types.get(mem_type, 0) + 1
+            memory_types = Counter(memory.get("memory_type", "unknown") for memory in session_memories)
             
             # Get recent activity
             recent_memories = sorted(
@@ -877,6 +936,12 @@ class Mem0Service:
             if not self._initialized:
                 return []
             
+            # Reuse the results of a recent identical search
+            cache_key = self._advanced_search_key(user_id, query, search_options)
+            cached = self._advanced_search_cache.get(cache_key) if cache_key is not None else None
+            if cached is not None:
+                return list(cached)
+            
             options = search_options or {}
             limit = options.get("limit", 5)
             memory_type = options.get("memory_type")
@@ -896,7 +961,7 @@ class Mem0Service:
             
             # Generate query embedding for semantic search
             query_embedding = None
-            if search_strategy in ["hierarchical", "semantic", "hybrid"]:
+            if search_strategy in EMBEDDING_SEARCH_STRATEGIES:
                 query_embedding = await self.generate_memory_embedding(query)
             
             # Apply search strategy
@@ -940,12 +1005,28 @@ class Mem0Service:
                 
                 processed_results.append(processed_result)
             
-            return processed_results
+            if cache_key is not None:
+                self._advanced_search_cache.set(cache_key, processed_results)
+            return list(processed_results)
             
         except Exception as e:
             logger.error(f"Error in advanced memory search: {e}")
             return []
 
+    @staticmethod
+    def _advanced_search_key(
+        user_id: str,
+        query: str,
+        search_options: Optional[Dict[str, Any]]
+    ) -> Optional[tuple]:
+        """Cache key of an advanced search (None when the options cannot be cached)."""
+        options = tuple(sorted((search_options or {}).items()))
+        try:
+            hash(options)
+        except TypeError:
+            return None
+        return (user_id, query.strip().lower(), options)
+
     async def calculate_advanced_relevance(
         self,
         memory: Dict[str, Any],
@@ -1154,6 +1235,8 @@ class Mem0Service:
         try:
             user_memories = self.local_storage.get("memories", {}).get(user_id, {})
             filtered_memories = []
+            # One clock read for the whole filter pass
+            now = datetime.now()
             
             # Handle both dictionary and list structures
             if isinstance(user_memories, dict):
@@ -1167,7 +1250,7 @@ class Mem0Service:
                         continue
                     
                     if time_range:
-                        if not self._is_memory_in_time_range(memory, time_range):
+                        if not self._is_memory_in_time_range(memory, time_range, now):
                             continue
                     
                     # Add memory_id to memory object
@@ -1184,7 +1267,7 @@ class Mem0Service:
                         continue
                     
                     if time_range:
-                        if not self._is_memory_in_time_range(memory, time_range):
+                        if not self._is_memory_in_time_range(memory, time_range, now):
                             continue
                     
                     # Add memory_id to memory object
@@ -1197,8 +1280,13 @@ class Mem0Service:
             logger.error(f"Error filtering memories: {e}")
             return []
 
-    def _is_memory_in_time_range(self, memory: Dict[str, Any], time_range: str) -> bool:
-        """Check if memory is within specified time range."""
+    def _is_memory_in_time_range(
+        self, 
+        memory: Dict[str, Any], 
+        time_range: str,
+        now: Optional[datetime] = None
+    ) -> bool:
+        """Check if memory is within specified time range (relative to ``now``, default the current time)."""
         try:
             created_at = memory.get("created_at")
             if not created_at:
@@ -1209,7 +1297,8 @@ class Mem0Service:
             else:
                 created_time = created_at
             
-            now = datetime.now()
+            if now is None:
+                now = datetime.now()
             
             if time_range == "hour":
                 return (now - created_time).total_seconds() < 3600
@@ -142,71 +142,16 @@ class QdrantService:
             raise RuntimeError("Qdrant client not initialized")
         
         try:
-            # Build filter if needed
-            query_filter = None
-            if user_id or filters:
-                conditions = []
-                
-                if user_id:
-                    conditions.append(
-                        FieldCondition(
-                            key="user_id",
-                            match=MatchValue(value=user_id)
-                        )
-                    )
-                
-                if filters:
-                    for key, value in filters.items():
-                        conditions.append(
-                            FieldCondition(
-                                key=f"metadata.{key}",
-                                match=MatchValue(value=value)
-                            )
-                        )
-                
-                query_filter = Filter(must=conditions)
-            
             # Perform search using query_points (new API)
             results = self.client.query_points(
                 collection_name=self.collection_name,
                 query=query_embedding,
                 limit=limit,
                 with_payload=True,
-                query_filter=query_filter
+                query_filter=self._build_filter(user_id, filters)
             )
             
-            # Format results
-            formatted_results = []
-            for result in results:
-                # Handle different result formats
-                if hasattr(result, 'id'):
-                    # ScoredPoint format
-                    formatted_results.append({
-                        "id": result.id,
-                        "score": result.score,
-                        "content": result.payload.get("content", ""),
-                        "metadata": result.payload.get("metadata", {}),
-                        "document_id": result.payload.get("document_id"),
-                        "created_at": result.payload.get("created_at"),
-                        "user_id": result.payload.get("user_id")
-                    })
-                elif isinstance(result, tuple) and len(result) >= 2:
-                    # Tuple format (id, score, payload)
-                    point_id, score, payload = result[0], result[1], result[2] if len(result) > 2 else {}
-                    formatted_results.append({
-                        "id": point_id,
-                        "score": score,
-                        "content": payload.get("content", ""),
-                        "metadata": payload.get("metadata", {}),
-                        "document_id": payload.get("document_id"),
-                        "created_at": payload.get("created_at"),
-                        "user_id": payload.get("user_id")
-                    })
-                else:
-                    # Fallback format
-                    logger.warning(f"Unexpected result format: {type(result)}")
-                    continue
-            
+            formatted_results = self._format_results(results)
             logger.debug(f"Found {len(formatted_results)} similar documents")
             return formatted_results
             
@@ -214,6 +159,121 @@ class QdrantService:
             logger.error(f"Error searching documents in Qdrant: {e}")
             raise
     
+    async def search_documents_batch(
+        self,
+        query_embeddings: List[List[float]],
+        limit: int = 5,
+        user_id: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """Search for documents similar to each query embedding in a single request."""
+        if not self.client:
+            raise RuntimeError("Qdrant client not initialized")
+        
+        try:
+            query_filter = self._build_filter(user_id, filters)
+            if hasattr(self.client, "query_batch_points"):
+                # QueryRequest/query_batch_points arrived in qdrant-client 1.10
+                from qdrant_client.models import QueryRequest
+                responses = self.client.query_batch_points(
+                    collection_name=self.collection_name,
+                    requests=[
+                        QueryRequest(
+                            query=query_embedding,
+                            filter=query_filter,
+                            limit=limit,
+                            with_payload=True
+                        )
+                        for query_embedding in query_embeddings
+                    ]
+                )
+            else:
+                # Older clients: fall back to one search per query
+                responses = [
+                    self.client.search(
+                        collection_name=self.collection_name,
+                        query_vector=query_embedding,
+                        limit=limit,
+                        with_payload=True,
+                        query_filter=query_filter
+                    )
+                    for query_embedding in query_embeddings
+                ]
+            
+            batch_results = [self._format_results(response) for response in responses]
+            logger.debug(f"Searched {len(batch_results)} queries in one batch")
+            return batch_results
+            
+        except Exception as e:
+            logger.error(f"Error batch searching documents in Qdrant: {e}")
+            raise
+    
+    @staticmethod
+    def _build_filter(
+        user_id: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Optional[Filter]:
+        """Build the payload filter for a search, or None when unfiltered."""
+        if not user_id and not filters:
+            return None
+        
+        conditions = []
+        
+        if user_id:
+            conditions.append(
+                FieldCondition(
+                    key="user_id",
+                    match=MatchValue(value=user_id)
+                )
+            )
+        
+        if filters:
+            for key, value in filters.items():
+                conditions.append(
+                    FieldCondition(
+                        key=f"metadata.{key}",
+                        match=MatchValue(value=value)
+                    )
+                )
+        
+        return Filter(must=conditions)
+    
+    @staticmethod
+    def _format_results(results: Any) -> List[Dict[str, Any]]:
+        """Format the scored points of a query response as result dicts."""
+        formatted_results = []
+        # query_points responses wrap the scored points
+        for result in getattr(results, "points", results):
+            # Handle different result formats
+            if hasattr(result, 'id'):
+                # ScoredPoint format
+                formatted_results.append({
+                    "id": result.id,
+                    "score": result.score,
+                    "content": result.payload.get("content", ""),
+                    "metadata": result.payload.get("metadata", {}),
+                    "document_id": result.payload.get("document_id"),
+                    "created_at": result.payload.get("created_at"),
+                    "user_id": result.payload.get("user_id")
+                })
+            elif isinstance(result, tuple) and len(result) >= 2:
+                # Tuple format (id, score, payload)
+                point_id, score, payload = result[0], result[1], result[2] if len(result) > 2 else {}
+                formatted_results.append({
+                    "id": point_id,
+                    "score": score,
+                    "content": payload.get("content", ""),
+                    "metadata": payload.get("metadata", {}),
+                    "document_id": payload.get("document_id"),
+                    "created_at": payload.get("created_at"),
+                    "user_id": payload.get("user_id")
+                })
+            else:
+                # Fallback format
+                logger.warning(f"Unexpected result format: {type(result)}")
+                continue
+        return formatted_results
+    
     async def delete_document(self, document_id: str) -> bool:
         """Delete a document from the vector database."""
         if not self.client:
@@ -232,6 +292,24 @@ class QdrantService:
             logger.error(f"Error deleting document {document_id}: {e}")
             return False
     
+    async def delete_points(self, point_ids: List[str]) -> bool:
+        """Delete stored chunks by their point IDs."""
+        if not self.client:
+            raise RuntimeError("Qdrant client not initialized")
+        
+        try:
+            self.client.delete(
+                collection_name=self.collection_name,
+                points_selector=point_ids
+            )
+            
+            logger.info(f"Deleted {len(point_ids)} points")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error deleting {len(point_ids)} points: {e}")
+            return False
+    
     async def get_document(self, document_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific document by ID."""
         if not self.client:
@@ -5,8 +5,11 @@ This service orchestrates the entire RAG pipeline including document ingestion,
 embedding generation, vector storage, retrieval, and response generation.
 """
 
+import copy
+import hashlib
+import json
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterable, Union
 from datetime import datetime
 import uuid
 
@@ -15,9 +18,22 @@ from .qdrant_service import QdrantService
 from .mem0_service import Mem0Service
 from .session_service import SessionService
 from .document_processor import DocumentProcessor
+from .ingest_batcher import IngestBatcher
+from ..utils.cache import LRUCache
 
 logger = logging.getLogger(__name__)
 
+# Seconds a search result is reused for a repeated query
+SEARCH_CACHE_TTL = 300.0
+# Metadata stamped at ingest time by the tools or this service, left out of the
+# ingest cache key so a repeated ingest of the same document still hits
+VOLATILE_METADATA_KEYS = frozenset({
+    "added_at", "created_at", "document_id",
+    "fetch_timestamp", "response_timestamp", "processing_timestamp"
+})
+# Most chunk texts sent in one embedding request (the provider's per-request input limit)
+EMBEDDING_BATCH_SIZE = 100
+
 
 class RAGService:
     """Main RAG service that orchestrates all components."""
@@ -28,7 +44,9 @@ class RAGService:
         qdrant_service: QdrantService,
         mem0_service: Optional[Mem0Service] = None,
         session_service: Optional[SessionService] = None,
-        document_processor: Optional[DocumentProcessor] = None
+        document_processor: Optional[DocumentProcessor] = None,
+        ingest_batch_size: int = 32,
+        ingest_batch_window_ms: float = 20.0
     ):
         """Initialize the RAG service."""
         self.gemini_service = gemini_service
@@ -37,6 +55,21 @@ class RAGService:
         self.session_service = session_service
         self.document_processor = document_processor or DocumentProcessor()
         self._initialized = False
+        # Content-addressed record of completed ingests, so re-adding identical
+        # content skips chunking, embedding and storage entirely.
+        self._ingest_cache = LRUCache(max_size=1024)
+        # Grouped results of recent searches, cleared whenever documents change
+        self._search_cache = LRUCache(max_size=1000, ttl=SEARCH_CACHE_TTL)
+        # Bumped on every invalidation, so searches that started before a write
+        # do not cache their (possibly stale) results afterwards
+        self._search_generation = 0
+        # Coalesces concurrently submitted documents into one add_documents call
+        self._ingest_batcher = IngestBatcher(
+            self._add_documents,
+            self.add_document,
+            max_batch_size=ingest_batch_size,
+            batch_window_ms=ingest_batch_window_ms
+        )
     
     async def initialize(self):
         """Initialize the RAG service."""
@@ -54,6 +87,36 @@ class RAGService:
             logger.error(f"Error initializing RAG service: {e}")
             raise
     
+    @staticmethod
+    def _ingest_key(content: str, metadata: Optional[Dict[str, Any]], user_id: str) -> bytes:
+        """Content address of a document ingest (content and stable metadata) for a given user."""
+        digest = hashlib.blake2b(digest_size=32)
+        digest.update(user_id.encode("utf-8"))
+        digest.update(b"|")
+        stable_metadata = {
+            key: value for key, value in (metadata or {}).items()
+            if key not in VOLATILE_METADATA_KEYS
+        }
+        digest.update(json.dumps(stable_metadata, sort_keys=True, default=str).encode("utf-8"))
+        digest.update(b"|")
+        digest.update(content.strip().encode("utf-8"))
+        return digest.digest()
+    
+    @staticmethod
+    def _search_key(
+        query: str,
+        limit: int,
+        user_id: Optional[str],
+        filters: Optional[Dict[str, Any]]
+    ) -> Optional[Tuple]:
+        """Cache key of a search, or None when the filters are not hashable."""
+        try:
+            key = (query, limit, user_id, frozenset(filters.items()) if filters else None)
+            hash(key)
+        except TypeError:
+            return None
+        return key
+    
     async def add_document(
         self, 
         content: str, 
@@ -63,48 +126,293 @@ class RAGService:
         """Add a document to the RAG system (with chunking and batch embedding)."""
         if not self._initialized:
             raise RuntimeError("RAG service not initialized")
+        
+        ingest_key = self._ingest_key(content, metadata, user_id)
+        cached = self._ingest_cache.get(ingest_key)
+        if cached is not None:
+            logger.info(f"Document content already ingested as {cached['id']}, skipping re-embedding")
+            return copy.deepcopy(cached)
+        
         try:
-            document_id = str(uuid.uuid4())
-            doc_metadata = metadata or {}
-            doc_metadata.update({
-                "user_id": user_id,
-                "created_at": datetime.now().isoformat(),
-                "document_id": document_id
-            })
-            # Chunk document
-            chunks = self.document_processor.chunk_document(content, doc_metadata, document_id)
-            if not chunks:
-                raise ValueError("No valid chunks produced from document")
-            # Batch embedding
-            chunk_texts = [chunk["content"] for chunk in chunks]
-            embeddings = await self.gemini_service.generate_embeddings(chunk_texts)
-            # Prepare chunk docs for Qdrant
-            chunk_documents = []
-            for chunk, embedding in zip(chunks, embeddings):
-                chunk_doc = {
-                    "content": chunk["content"],
-                    "embedding": embedding,
-                    "metadata": chunk["metadata"],
-                    "document_id": document_id,
-                    "created_at": chunk["metadata"].get("processed_at"),
-                    "user_id": user_id,
-                    "chunk_index": chunk["chunk_index"],
-                    "total_chunks": chunk["total_chunks"]
+            document_id, doc_metadata, chunks = self._prepare_document(content, metadata, user_id)
+            # Batch embedding and storage of all chunks in Qdrant
+            await self._embed_and_store(chunks, user_id)
+            logger.info(f"Added document {document_id} as {len(chunks)} chunks to RAG system")
+            result = {
+                "id": document_id,
+                "success": True,
+                "metadata": doc_metadata,
+                "chunks": len(chunks)
+            }
+            # The cache keeps its own copy: the metadata is the caller's dict
+            self._ingest_cache.set(ingest_key, copy.deepcopy(result))
+            return result
+        except Exception as e:
+            logger.error(f"Error adding document: {e}")
+            raise
+    
+    async def add_documents(
+        self, 
+        contents: List[str], 
+        metadatas: Optional[List[Optional[Dict[str, Any]]]] = None,
+        user_id: str = "default"
+    ) -> List[Dict[str, Any]]:
+        """Add several documents, embedding all of their chunks together.
+        
+        Returns one result per document, in order. A document that produces no
+        chunks or fails to embed gets ``{"success": False, "error": ...}`` and
+        does not fail the rest of the batch.
+        """
+        results = await self._add_documents(contents, metadatas, user_id)
+        return [
+            self._failed_result(result) if isinstance(result, Exception) else result
+            for result in results
+        ]
+    
+    async def _add_documents(
+        self, 
+        contents: List[str], 
+        metadatas: Optional[List[Optional[Dict[str, Any]]]] = None,
+        user_id: str = "default"
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """Add several documents, returning the exception of each document that failed."""
+        if not self._initialized:
+            raise RuntimeError("RAG service not initialized")
+        
+        if metadatas is None:
+            metadatas = [None] * len(contents)
+        if len(metadatas) != len(contents):
+            raise ValueError("contents and metadatas must have the same length")
+        
+        try:
+            results: List[Union[Dict[str, Any], Exception, None]] = [None] * len(contents)
+            # (index, ingest key, document id, metadata, chunks)
+            pending: List[Tuple[int, bytes, str, Dict[str, Any], List[Dict[str, Any]]]] = []
+            # Index of the first document with each content in this batch, and
+            # (index, first index) of documents repeating it
+            first_index: Dict[bytes, int] = {}
+            repeats: List[Tuple[int, int]] = []
+            
+            for index, (content, metadata) in enumerate(zip(contents, metadatas)):
+                ingest_key = self._ingest_key(content, metadata, user_id)
+                cached = self._ingest_cache.get(ingest_key)
+                if cached is not None:
+                    results[index] = copy.deepcopy(cached)
+                    continue
+                if ingest_key in first_index:
+                    repeats.append((index, first_index[ingest_key]))
+                    continue
+                first_index[ingest_key] = index
+                
+                try:
+                    document_id, doc_metadata, chunks = self._prepare_document(content, metadata, user_id)
+                except Exception as e:
+                    logger.warning(f"Skipping document {index} of batch: {e}")
+                    results[index] = e
+                    continue
+                pending.append((index, ingest_key, document_id, doc_metadata, chunks))
+            
+            failed = await self._embed_and_store_documents(
+                [(index, chunks) for index, _, _, _, chunks in pending], user_id
+            )
+            
+            chunk_count = 0
+            for index, ingest_key, document_id, doc_metadata, chunks in pending:
+                if index in failed:
+                    results[index] = failed[index]
+                    continue
+                result = {
+                    "id": document_id,
+                    "success": True,
+                    "metadata": doc_metadata,
+                    "chunks": len(chunks)
                 }
-                chunk_documents.append(chunk_doc)
-            # Store all chunks in Qdrant
-            chunk_ids = await self.qdrant_service.add_documents(chunk_documents)
-            logger.info(f"Added document {document_id} as {len(chunk_documents)} chunks to RAG system")
+                self._ingest_cache.set(ingest_key, copy.deepcopy(result))
+                results[index] = result
+                chunk_count += len(chunks)
+            
+            for index, original_index in repeats:
+                original = results[original_index]
+                results[index] = original if isinstance(original, Exception) else copy.deepcopy(original)
+            
+            logger.info(f"Added {len(pending) - len(failed)} documents as {chunk_count} chunks to RAG system")
+            return results
+        except Exception as e:
+            logger.error(f"Error adding documents: {e}")
+            raise
+    
+    async def _embed_and_store_documents(
+        self,
+        documents: List[Tuple[int, List[Dict[str, Any]]]],
+        user_id: str
+    ) -> Dict[int, Exception]:
+        """Embed and store the chunks of several documents, isolating per-document failures.
+        
+        Returns:
+            The error of each document (by index) that could not be stored
+        """
+        all_chunks = [chunk for _, chunks in documents for chunk in chunks]
+        if not all_chunks:
+            return {}
+        
+        try:
+            await self._embed_and_store(all_chunks, user_id)
+            return {}
+        except Exception as e:
+            # One bad document fails the whole call; retry individually so
+            # only that document fails.
+            logger.warning(f"Batched embedding of {len(documents)} documents failed, retrying individually: {e}")
+        
+        failed: Dict[int, Exception] = {}
+        for index, chunks in documents:
+            try:
+                await self._embed_and_store(chunks, user_id)
+            except Exception as e:
+                failed[index] = e
+        return failed
+    
+    @staticmethod
+    def _failed_result(error: Exception) -> Dict[str, Any]:
+        """Result of a document in a batch that could not be added."""
+        return {
+            "success": False,
+            "error": str(error),
+            "error_type": type(error).__name__
+        }
+    
+    async def submit_document(
+        self, 
+        content: str, 
+        metadata: Optional[Dict[str, Any]] = None,
+        user_id: str = "default"
+    ) -> Dict[str, Any]:
+        """Add a document, batching its embedding with other concurrent submissions."""
+        if not self._initialized:
+            raise RuntimeError("RAG service not initialized")
+        
+        return await self._ingest_batcher.submit(content, metadata, user_id)
+    
+    async def add_document_stream(
+        self, 
+        chunks: AsyncIterable[str], 
+        metadata: Optional[Dict[str, Any]] = None,
+        user_id: str = "default",
+        batch_size: int = 32
+    ) -> Dict[str, Any]:
+        """Add a document from a stream of chunk texts, embedding and storing them in batches.
+        
+        Only ``batch_size`` chunks are held in memory at a time. Since the total is
+        not known while streaming, stored chunks carry ``total_chunks`` of None, and
+        the content-addressed ingest cache is not consulted. If the stream or a
+        batch fails, the chunks already stored are deleted again.
+        """
+        if not self._initialized:
+            raise RuntimeError("RAG service not initialized")
+        
+        batch_size = max(1, batch_size)
+        document_id, doc_metadata = self._new_document(metadata, user_id)
+        batch: List[Dict[str, Any]] = []
+        chunk_count = 0
+        stored_ids: List[str] = []
+        
+        try:
+            async for text in chunks:
+                batch.append(
+                    self.document_processor.build_chunk(text, chunk_count, None, doc_metadata, document_id)
+                )
+                chunk_count += 1
+                if len(batch) >= batch_size:
+                    stored_ids.extend(await self._embed_and_store(batch, user_id))
+                    batch = []
+            
+            if batch:
+                stored_ids.extend(await self._embed_and_store(batch, user_id))
+            if not chunk_count:
+                raise ValueError("No valid chunks produced from document")
+            
+            logger.info(f"Streamed document {document_id} as {chunk_count} chunks into RAG system")
             return {
                 "id": document_id,
                 "success": True,
                 "metadata": doc_metadata,
-                "chunks": len(chunk_documents)
+                "chunks": chunk_count
             }
         except Exception as e:
-            logger.error(f"Error adding document: {e}")
+            logger.error(f"Error streaming document {document_id}: {e}")
+            if stored_ids:
+                # Do not leave a partially ingested document behind
+                await self.qdrant_service.delete_points(stored_ids)
+                self._invalidate_search_cache()
             raise
     
+    async def _embed_and_store(self, chunks: List[Dict[str, Any]], user_id: str) -> List[str]:
+        """Embed chunks in bounded embedding calls and store them in Qdrant."""
+        texts = [chunk["content"] for chunk in chunks]
+        embeddings: List[List[float]] = []
+        for start in range(0, len(texts), EMBEDDING_BATCH_SIZE):
+            embeddings.extend(
+                await self.gemini_service.generate_embeddings(texts[start:start + EMBEDDING_BATCH_SIZE])
+            )
+        chunk_documents = self._build_chunk_documents(chunks, embeddings, user_id)
+        document_ids = await self.qdrant_service.add_documents(chunk_documents)
+        # New chunks can change the results of any cached search
+        self._invalidate_search_cache()
+        return document_ids
+    
+    def _invalidate_search_cache(self) -> None:
+        """Drop cached search results and the results of searches still in flight."""
+        self._search_generation += 1
+        self._search_cache.clear()
+    
+    @staticmethod
+    def _new_document(
+        metadata: Optional[Dict[str, Any]],
+        user_id: str
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Assign a new document id and ingest metadata to a document."""
+        document_id = str(uuid.uuid4())
+        doc_metadata = metadata or {}
+        doc_metadata.update({
+            "user_id": user_id,
+            "created_at": datetime.now().isoformat(),
+            "document_id": document_id
+        })
+        return document_id, doc_metadata
+    
+    def _prepare_document(
+        self, 
+        content: str, 
+        metadata: Optional[Dict[str, Any]],
+        user_id: str
+    ) -> Tuple[str, Dict[str, Any], List[Dict[str, Any]]]:
+        """Assign a document id and metadata to a document and chunk it."""
+        document_id, doc_metadata = self._new_document(metadata, user_id)
+        chunks = self.document_processor.chunk_document(content, doc_metadata, document_id)
+        if not chunks:
+            raise ValueError("No valid chunks produced from document")
+        return document_id, doc_metadata, chunks
+    
+    @staticmethod
+    def _build_chunk_documents(
+        chunks: List[Dict[str, Any]], 
+        embeddings: List[List[float]],
+        user_id: str
+    ) -> List[Dict[str, Any]]:
+        """Pair chunks with their embeddings in the shape stored in Qdrant."""
+        return [
+            {
+                "content": chunk["content"],
+                "embedding": embedding,
+                "metadata": chunk["metadata"],
+                "document_id": chunk["document_id"],
+                "created_at": chunk["metadata"].get("processed_at"),
+                "user_id": user_id,
+                "chunk_index": chunk["chunk_index"],
+                "total_chunks": chunk["total_chunks"]
+            }
+            for chunk, embedding in zip(chunks, embeddings)
+        ]
+    
     async def search_documents(
         self, 
         query: str, 
@@ -115,6 +423,13 @@ class RAGService:
         """Search for documents using semantic search (returns top chunks grouped by document_id)."""
         if not self._initialized:
             raise RuntimeError("RAG service not initialized")
+        
+        search_key = self._search_key(query, limit, user_id, filters)
+        cached = self._search_cache.get(search_key) if search_key is not None else None
+        if cached is not None:
+            return list(cached)
+        
+        generation = self._search_generation
         try:
             query_embeddings = await self.gemini_service.generate_embeddings([query])
             query_embedding = query_embeddings[0]
@@ -124,28 +439,77 @@ class RAGService:
                 user_id=user_id,
                 filters=filters
             )
-            # Group by document_id
-            doc_groups = {}
-            for chunk in results:
-                doc_id = chunk.get("metadata", {}).get("document_id") or chunk.get("document_id")
-                if doc_id not in doc_groups:
-                    doc_groups[doc_id] = {
-                        "document_id": doc_id,
-                        "chunks": [],
-                        "score": chunk["score"],
-                        "metadata": chunk.get("metadata", {})
-                    }
-                doc_groups[doc_id]["chunks"].append(chunk)
-                # Use best score for doc
-                if chunk["score"] > doc_groups[doc_id]["score"]:
-                    doc_groups[doc_id]["score"] = chunk["score"]
-            # Sort by score
-            grouped_results = sorted(doc_groups.values(), key=lambda x: x["score"], reverse=True)
-            return grouped_results[:limit]
+            grouped_results = self._group_by_document(results, limit)
+            if search_key is not None and generation == self._search_generation:
+                self._search_cache.set(search_key, grouped_results)
+            return list(grouped_results)
         except Exception as e:
             logger.error(f"Error searching documents: {e}")
             raise
     
+    async def search_documents_batch(
+        self,
+        queries: List[str],
+        limit: int = 5,
+        user_id: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """Search for documents for several queries with one embedding call and one vector search."""
+        if not self._initialized:
+            raise RuntimeError("RAG service not initialized")
+        
+        # Serve repeated queries from the cache and search only the rest
+        search_keys = [self._search_key(query, limit, user_id, filters) for query in queries]
+        batch_results = [
+            self._search_cache.get(search_key) if search_key is not None else None
+            for search_key in search_keys
+        ]
+        missing = [index for index, results in enumerate(batch_results) if results is None]
+        if not missing:
+            return [list(results) for results in batch_results]
+        
+        generation = self._search_generation
+        try:
+            query_embeddings = await self.gemini_service.generate_embeddings(
+                [queries[index] for index in missing]
+            )
+            searched = await self.qdrant_service.search_documents_batch(
+                query_embeddings=query_embeddings,
+                limit=limit,
+                user_id=user_id,
+                filters=filters
+            )
+            for index, results in zip(missing, searched):
+                grouped_results = self._group_by_document(results, limit)
+                batch_results[index] = grouped_results
+                if search_keys[index] is not None and generation == self._search_generation:
+                    self._search_cache.set(search_keys[index], grouped_results)
+            return [list(results) for results in batch_results]
+        except Exception as e:
+            logger.error(f"Error batch searching documents: {e}")
+            raise
+    
+    @staticmethod
+    def _group_by_document(results: List[Dict[str, Any]], limit: int) -> List[Dict[str, Any]]:
+        """Group search result chunks by document_id, best scoring documents first."""
+        doc_groups = {}
+        for chunk in results:
+            doc_id = chunk.get("metadata", {}).get("document_id") or chunk.get("document_id")
+            if doc_id not in doc_groups:
+                doc_groups[doc_id] = {
+                    "document_id": doc_id,
+                    "chunks": [],
+                    "score": chunk["score"],
+                    "metadata": chunk.get("metadata", {})
+                }
+            doc_groups[doc_id]["chunks"].append(chunk)
+            # Use best score for doc
+            if chunk["score"] > doc_groups[doc_id]["score"]:
+                doc_groups[doc_id]["score"] = chunk["score"]
+        # Sort by score
+        grouped_results = sorted(doc_groups.values(), key=lambda x: x["score"], reverse=True)
+        return grouped_results[:limit]
+    
     async def ask_question(
         self, 
         question: str, 
@@ -264,6 +628,8 @@ class RAGService:
         try:
             success = await self.qdrant_service.delete_document(document_id)
             if success:
+                self._ingest_cache.invalidate(lambda _, result: result["id"] == document_id)
+                self._invalidate_search_cache()
                 logger.info(f"Deleted document {document_id} from RAG system")
             return success
             
@@ -304,6 +670,7 @@ class RAGService:
             stats = {
                 "total_documents": 0,
                 "memory_stats": None,
+                "search_cache": self._search_cache.get_stats(),
                 "user_id": user_id
             }
             
@@ -325,5 +692,4 @@ class RAGService:
     async def cleanup(self):
         """Cleanup resources."""
         logger.info("Cleaning up RAG service")
-        # No specific cleanup needed for RAG service
-        pass
\ No newline at end of file
+        await self._ingest_batcher.close()
\ No newline at end of file
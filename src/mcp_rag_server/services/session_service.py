@@ -5,10 +5,12 @@ This service handles user session creation, tracking, expiration,
 and session-based memory organization.
 """
 
+import base64
+import heapq
 import logging
 import json
 import uuid
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from pathlib import Path
 import asyncio
@@ -319,6 +321,73 @@ class SessionService:
             logger.error(f"Error getting user sessions: {e}")
             return []
     
+    async def get_user_sessions_page(
+        self, 
+        user_id: str, 
+        include_expired: bool = False,
+        cursor: Optional[str] = None,
+        limit: int = 50
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Get one page of a user's sessions, newest first.
+        
+        Sessions are ordered by (created_at, id), which never changes for a
+        session, so pages stay stable while sessions are being used.
+        
+        Args:
+            user_id: Owner of the sessions
+            include_expired: Whether to include expired sessions
+            cursor: Cursor returned with the previous page (None for the first page)
+            limit: Maximum number of sessions in the page
+            
+        Returns:
+            The page of sessions and the cursor of the next page (None on the last page)
+        """
+        if not self._initialized:
+            raise RuntimeError("Session service not initialized")
+        
+        after = self._decode_cursor(cursor) if cursor else None
+        
+        try:
+            sessions = (
+                session
+                for session in map(self.sessions.get, self.user_sessions.get(user_id, []))
+                if session
+                and (include_expired or session["status"] == "active")
+                and (after is None or self._page_key(session) < after)
+            )
+            # Only the page (and one extra session telling whether there is a
+            # next page) is selected, without sorting every session
+            page = heapq.nlargest(limit + 1, sessions, key=self._page_key)
+            if len(page) <= limit:
+                return page, None
+            
+            page = page[:limit]
+            return page, self._encode_cursor(self._page_key(page[-1]))
+            
+        except Exception as e:
+            logger.error(f"Error getting user sessions page: {e}")
+            return [], None
+    
+    @staticmethod
+    def _page_key(session: Dict[str, Any]) -> Tuple[str, str]:
+        """Keyset pagination key of a session."""
+        return session["created_at"], session["id"]
+    
+    @staticmethod
+    def _encode_cursor(key: Tuple[str, str]) -> str:
+        """Encode a pagination key as an opaque cursor."""
+        return base64.urlsafe_b64encode(json.dumps(key).encode("utf-8")).decode("ascii")
+    
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[str, str]:
+        """Decode a cursor returned by get_user_sessions_page."""
+        try:
+            created_at, session_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+            return str(created_at), str(session_id)
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Invalid cursor: {cursor}") from e
+    
     async def get_session_stats(self, session_id: str) -> Optional[Dict[str, Any]]:
         """Get statistics for a session."""
         if not self._initialized:
@@ -6,7 +6,7 @@ and calculating code metrics.
 """
 
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple, Callable
 from pathlib import Path
 
 from mcp import StdioServerParameters
@@ -28,7 +28,7 @@ from mcp.types import (
     ListResourcesResult,
 )
 
-from ..services.code_analysis_service import CodeAnalysisService
+from ..services.code_analysis_service import CodeAnalysisService, CodeMetrics
 
 logger = logging.getLogger(__name__)
 
@@ -178,45 +178,39 @@ class CodeAnalysisTools:
             )
         ]
     
-    async def handle_analyze_source_code(self, arguments: Dict[str, Any]) -> CallToolResult:
-        """Handle analyze_source_code tool call."""
+    async def _run_and_format(
+        self,
+        arguments: Dict[str, Any],
+        formatter: Callable[[Dict[str, Any]], str],
+        tool_name: str,
+        error_label: str
+    ) -> CallToolResult:
+        """Analyze the requested file and render the result with ``formatter``.
+        
+        Shared by every tool that takes ``file_path``/``language`` arguments so
+        each handler is a single awaited call.
+        """
         try:
-            file_path = arguments["file_path"]
-            language = arguments.get("language", "auto")
-            
-            result = await self.code_analysis_service.analyze_source_code(file_path, language)
+            result = await self.code_analysis_service.analyze_source_code(
+                arguments["file_path"], arguments.get("language", "auto")
+            )
             
             if "error" in result:
-                return CallToolResult(
-                    content=[
-                        TextContent(
-                            type="text",
-                            text=f"Error analyzing source code: {result['error']}"
-                        )
-                    ]
-                )
-            
-            # Format the result for display
-            formatted_result = self._format_analysis_result(result)
-            
-            return CallToolResult(
-                content=[
-                    TextContent(
-                        type="text",
-                        text=formatted_result
-                    )
-                ]
-            )
+                text = f"Error {error_label}: {result['error']}"
+            else:
+                text = formatter(result)
         except Exception as e:
-            logger.error(f"Error in analyze_source_code tool: {e}")
-            return CallToolResult(
-                content=[
-                    TextContent(
-                        type="text",
-                        text=f"Error analyzing source code: {str(e)}"
-                    )
-                ]
-            )
+            logger.error(f"Error in {tool_name} tool: {e}")
+            text = f"Error {error_label}: {str(e)}"
+        
+        return CallToolResult(content=[TextContent(type="text", text=text)])
+    
+    async def handle_analyze_source_code(self, arguments: Dict[str, Any]) -> CallToolResult:
+        """Handle analyze_source_code tool call."""
+        return await self._run_and_format(
+            arguments, self._format_analysis_result,
+            "analyze_source_code", "analyzing source code"
+        )
     
     async def handle_analyze_code_string(self, arguments: Dict[str, Any]) -> CallToolResult:
         """Handle analyze_code_string tool call."""
@@ -263,204 +257,39 @@ class CodeAnalysisTools:
     
     async def handle_calculate_code_metrics(self, arguments: Dict[str, Any]) -> CallToolResult:
         """Handle calculate_code_metrics tool call."""
-        try:
-            file_path = arguments["file_path"]
-            language = arguments.get("language", "auto")
-            
-            result = await self.code_analysis_service.analyze_source_code(file_path, language)
-            
-            if "error" in result:
-                return CallToolResult(
-                    content=[
-                        TextContent(
-                            type="text",
-                            text=f"Error calculating metrics: {result['error']}"
-                        )
-                    ]
-                )
-            
-            metrics = result.get("metrics", {})
-            formatted_metrics = self._format_metrics(metrics)
-            
-            return CallToolResult(
-                content=[
-                    TextContent(
-                        type="text",
-                        text=formatted_metrics
-                    )
-                ]
-            )
-        except Exception as e:
-            logger.error(f"Error in calculate_code_metrics tool: {e}")
-            return CallToolResult(
-                content=[
-                    TextContent(
-                        type="text",
-                        text=f"Error calculating metrics: {str(e)}"
-                    )
-                ]
-            )
+        return await self._run_and_format(
+            arguments, lambda result: self._format_metrics(result.get("metrics")),
+            "calculate_code_metrics", "calculating metrics"
+        )
     
     async def handle_extract_functions(self, arguments: Dict[str, Any]) -> CallToolResult:
         """Handle extract_functions tool call."""
-        try:
-            file_path = arguments["file_path"]
-            language = arguments.get("language", "auto")
-            
-            result = await self.code_analysis_service.analyze_source_code(file_path, language)
-            
-            if "error" in result:
-                return CallToolResult(
-                    content=[
-                        TextContent(
-                            type="text",
-                            text=f"Error extracting functions: {result['error']}"
-                        )
-                    ]
-                )
-            
-            functions = result.get("functions", [])
-            formatted_functions = self._format_functions(functions)
-            
-            return CallToolResult(
-                content=[
-                    TextContent(
-                        type="text",
-                        text=formatted_functions
-                    )
-                ]
-            )
-        except Exception as e:
-            logger.error(f"Error in extract_functions tool: {e}")
-            return CallToolResult(
-                content=[
-                    TextContent(
-                        type="text",
-                        text=f"Error extracting functions: {str(e)}"
-                    )
-                ]
-            )
+        return await self._run_and_format(
+            arguments, lambda result: self._format_functions(result.get("functions", [])),
+            "extract_functions", "extracting functions"
+        )
     
     async def handle_extract_classes(self, arguments: Dict[str, Any]) -> CallToolResult:
         """Handle extract_classes tool call."""
-        try:
-            file_path = arguments["file_path"]
-            language = arguments.get("language", "auto")
-            
-            result = await self.code_analysis_service.analyze_source_code(file_path, language)
-            
-            if "error" in result:
-                return CallToolResult(
-                    content=[
-                        TextContent(
-                            type="text",
-                            text=f"Error extracting classes: {result['error']}"
-                        )
-                    ]
-                )
-            
-            classes = result.get("classes", [])
-            formatted_classes = self._format_classes(classes)
-            
-            return CallToolResult(
-                content=[
-                    TextContent(
-                        type="text",
-                        text=formatted_classes
-                    )
-                ]
-            )
-        except Exception as e:
-            logger.error(f"Error in extract_classes tool: {e}")
-            return CallToolResult(
-                content=[
-                    TextContent(
-                        type="text",
-                        text=f"Error extracting classes: {str(e)}"
-                    )
-                ]
-            )
+        return await self._run_and_format(
+            arguments, lambda result: self._format_classes(result.get("classes", [])),
+            "extract_classes", "extracting classes"
+        )
     
     async def handle_analyze_dependencies(self, arguments: Dict[str, Any]) -> CallToolResult:
         """Handle analyze_dependencies tool call."""
-        try:
-            file_path = arguments["file_path"]
-            language = arguments.get("language", "auto")
-            
-            result = await self.code_analysis_service.analyze_source_code(file_path, language)
-            
-            if "error" in result:
-                return CallToolResult(
-                    content=[
-                        TextContent(
-                            type="text",
-                            text=f"Error analyzing dependencies: {result['error']}"
-                        )
-                    ]
-                )
-            
-            imports = result.get("imports", [])
-            formatted_imports = self._format_imports(imports)
-            
-            return CallToolResult(
-                content=[
-                    TextContent(
-                        type="text",
-                        text=formatted_imports
-                    )
-                ]
-            )
-        except Exception as e:
-            logger.error(f"Error in analyze_dependencies tool: {e}")
-            return CallToolResult(
-                content=[
-                    TextContent(
-                        type="text",
-                        text=f"Error analyzing dependencies: {str(e)}"
-                    )
-                ]
-            )
+        return await self._run_and_format(
+            arguments, lambda result: self._format_imports(result.get("imports", [])),
+            "analyze_dependencies", "analyzing dependencies"
+        )
     
     async def handle_detect_code_patterns(self, arguments: Dict[str, Any]) -> CallToolResult:
         """Handle detect_code_patterns tool call."""
-        try:
-            file_path = arguments["file_path"]
-            language = arguments.get("language", "auto")
-            
-            result = await self.code_analysis_service.analyze_source_code(file_path, language)
-            
-            if "error" in result:
-                return CallToolResult(
-                    content=[
-                        TextContent(
-                            type="text",
-                            text=f"Error detecting patterns: {result['error']}"
-                        )
-                    ]
-                )
-            
-            # Basic pattern detection based on metrics
-            patterns = self._detect_patterns(result)
-            formatted_patterns = self._format_patterns(patterns)
-            
-            return CallToolResult(
-                content=[
-                    TextContent(
-                        type="text",
-                        text=formatted_patterns
-                    )
-                ]
-            )
-        except Exception as e:
-            logger.error(f"Error in detect_code_patterns tool: {e}")
-            return CallToolResult(
-                content=[
-                    TextContent(
-                        type="text",
-                        text=f"Error detecting patterns: {str(e)}"
-                    )
-                ]
-            )
+        # Basic pattern detection based on metrics
+        return await self._run_and_format(
+            arguments, lambda result: self._format_patterns(*self._detect_patterns(result)),
+            "detect_code_patterns", "detecting patterns"
+        )
     
     def _format_analysis_result(self, result: Dict[str, Any]) -> str:
         """Format analysis result for display."""
@@ -468,19 +297,28 @@ class CodeAnalysisTools:
         functions = result.get("functions", [])
         classes = result.get("classes", [])
         imports = result.get("imports", [])
-        metrics = result.get("metrics", {})
+        metrics: Optional[CodeMetrics] = result.get("metrics")
         
         output = f"# Code Analysis Results ({language.upper()})\n\n"
         
         # Metrics summary
         if metrics:
-            output += f"## Metrics Summary\n"
-            output += f"- Lines of Code: {metrics.lines_of_code}\n"
-            output += f"- Logical Lines: {metrics.logical_lines}\n"
-            output += f"- Functions: {metrics.function_count}\n"
-            output += f"- Classes: {metrics.class_count}\n"
-            output += f"- Cyclomatic Complexity: {metrics.cyclomatic_complexity}\n"
-            output += f"- Maintainability Index: {metrics.maintainability_index:.1f}\n\n"
+            loc, logical, func_count, class_count, complexity, mi = (
+                metrics.lines_of_code,
+                metrics.logical_lines,
+                metrics.function_count,
+                metrics.class_count,
+                metrics.cyclomatic_complexity,
+                metrics.maintainability_index,
+            )
+            section = ["## Metrics Summary\n"]
+            section.append(f"- Lines of Code: {loc}\n")
+            section.append(f"- Logical Lines: {logical}\n")
+            section.append(f"- Functions: {func_count}\n")
+            section.append(f"- Classes: {class_count}\n")
+            section.append(f"- Cyclomatic Complexity: {complexity}\n")
+            section.append(f"- Maintainability Index: {mi:.1f}\n\n")
+            output += "".join(section)
         
         # Functions
         if functions:
@@ -493,8 +331,8 @@ class CodeAnalysisTools:
                     output += f"  - Return Type: {func.return_type}\n"
                 if func.complexity > 1:
                     output += f"  - Complexity: {func.complexity}\n"
-                if func.docstring:
-                    output += f"  - Docstring: {func.docstring[:100]}...\n"
+                if func.docstring_summary:
+                    output += f"  - Docstring: {func.docstring_summary}\n"
                 output += "\n"
         
         # Classes
@@ -508,8 +346,8 @@ class CodeAnalysisTools:
                     output += f"  - Attributes: {', '.join(cls.attributes)}\n"
                 if cls.methods:
                     output += f"  - Methods: {len(cls.methods)}\n"
-                if cls.docstring:
-                    output += f"  - Docstring: {cls.docstring[:100]}...\n"
+                if cls.docstring_summary:
+                    output += f"  - Docstring: {cls.docstring_summary}\n"
                 output += "\n"
         
         # Imports
@@ -526,7 +364,7 @@ class CodeAnalysisTools:
         
         return output
     
-    def _format_metrics(self, metrics: Dict[str, Any]) -> str:
+    def _format_metrics(self, metrics: Optional[CodeMetrics]) -> str:
         """Format metrics for display."""
         if not metrics:
             return "No metrics available."
@@ -641,8 +479,12 @@ class CodeAnalysisTools:
         
         return output
     
-    def _detect_patterns(self, result: Dict[str, Any]) -> Dict[str, Any]:
-        """Detect patterns in code analysis result."""
+    def _detect_patterns(self, result: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+        """Detect patterns in code analysis result.
+        
+        Returns the pattern groups together with the total number of entries
+        across all groups.
+        """
         patterns = {
             "anti_patterns": [],
             "good_patterns": [],
@@ -661,15 +503,13 @@ class CodeAnalysisTools:
             patterns["anti_patterns"].append("High average function complexity")
         
         # Function patterns
-        long_functions = [f for f in functions if f.complexity > 5]
-        if long_functions:
-            patterns["anti_patterns"].append(f"Found {len(long_functions)} complex functions")
+        complex_function_count = sum(1 for f in functions if f.complexity > 5)
+        if complex_function_count:
+            patterns["anti_patterns"].append(f"Found {complex_function_count} complex functions")
         
         # Class patterns
-        if classes:
-            large_classes = [c for c in classes if len(c.methods) > 10]
-            if large_classes:
-                patterns["anti_patterns"].append("Large classes detected - consider splitting")
+        if any(len(c.methods) > 10 for c in classes):
+            patterns["anti_patterns"].append("Large classes detected - consider splitting")
         
         # Good patterns
         if metrics.maintainability_index >= 80:
@@ -685,12 +525,20 @@ class CodeAnalysisTools:
         if not any(f.docstring for f in functions):
             patterns["suggestions"].append("Consider adding docstrings to functions")
         
-        return patterns
+        pattern_count = (
+            len(patterns["anti_patterns"])
+            + len(patterns["good_patterns"])
+            + len(patterns["suggestions"])
+        )
+        return patterns, pattern_count
     
-    def _format_patterns(self, patterns: Dict[str, Any]) -> str:
+    def _format_patterns(self, patterns: Dict[str, Any], pattern_count: int) -> str:
         """Format patterns for display."""
         output = "# Code Pattern Analysis\n\n"
         
+        if pattern_count == 0:
+            return output + "No specific patterns detected.\n"
+        
         if patterns["anti_patterns"]:
             output += "## Anti-Patterns Detected\n"
             for pattern in patterns["anti_patterns"]:
@@ -709,7 +557,4 @@ class CodeAnalysisTools:
                 output += f"- 💡 {suggestion}\n"
             output += "\n"
         
-        if not any(patterns.values()):
-            output += "No specific patterns detected.\n"
-        
         return output 
\ No newline at end of file
@@ -6,7 +6,8 @@ This module provides tools for document ingestion, management, and retrieval.
 
 import logging
 from typing import Dict, Any, Optional, List
-from datetime import datetime
+
+from ..utils.timestamps import now_iso
 
 logger = logging.getLogger(__name__)
 
@@ -36,11 +37,11 @@ class DocumentTools:
             # Add timestamp to metadata
             doc_metadata = metadata or {}
             doc_metadata.update({
-                "added_at": datetime.now().isoformat(),
+                "added_at": now_iso(),
                 "user_id": user_id
             })
             
-            result = await self.rag_service.add_document(content, doc_metadata, user_id)
+            result = await self.rag_service.submit_document(content, doc_metadata, user_id)
             return {
                 "success": True, 
                 "document_id": result["id"],
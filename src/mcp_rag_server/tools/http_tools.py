@@ -9,18 +9,96 @@ This module provides MCP tools for HTTP integration including:
 """
 
 import asyncio
+import json
 import logging
-from typing import Dict, Any, Optional, List
-from datetime import datetime
+import re
+import uuid
+from typing import Dict, Any, Optional, List, Tuple, AsyncIterator
 import httpx
-from urllib.parse import urlparse
-import json
+from functools import lru_cache
+from urllib.parse import urlparse, ParseResult
+import orjson
 
 from ..services.rag_service import RAGService
 from ..services.document_processor import DocumentProcessor
+from ..utils.buffer_pool import BufferPool
+from ..utils.html_text import extract_html_text
+from ..utils.timestamps import now_iso
 
 logger = logging.getLogger(__name__)
 
+# Limity puli połączeń współdzielonej przez wszystkie żądania
+HTTP_LIMITS = httpx.Limits(max_connections=256, max_keepalive_connections=128)
+HTTP_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+
+# Obsługiwane metody call_external_api: metoda klienta httpx i czy wysyła ciało JSON
+HTTP_METHODS = {
+    "GET": ("get", False),
+    "POST": ("post", True),
+    "PUT": ("put", True),
+    "DELETE": ("delete", False)
+}
+
+# Limity równoczesności batch_fetch_urls: łącznie dla wszystkich wywołań
+# i domyślnie na jeden host w ramach wywołania
+MAX_CONCURRENT_FETCHES = 64
+MAX_CONCURRENT_PER_HOST = 4
+
+# Maksymalny rozmiar pobieranej treści; dłuższe odpowiedzi są obcinane
+MAX_CONTENT_BYTES = 10 * 1024 * 1024
+STREAM_CHUNK_SIZE = 64 * 1024
+# Rozmiar bufora odczytu z puli; dłuższe treści są przenoszone do rosnącego bufora
+READ_BUFFER_SIZE = 256 * 1024
+# Łączny rozmiar buforów odczytu przechowywanych do ponownego użycia
+READ_BUFFER_POOL_BYTES = 2 * 1024 * 1024
+# Od tego rozmiaru treść jest dodawana do RAG strumieniowo, partiami chunków
+STREAM_INGEST_THRESHOLD = 1024 * 1024
+# Ciąg 20+ cyfr może być liczbą całkowitą spoza 64 bitów
+BIG_INT_PATTERN = re.compile(rb"\d{20,}")
+
+
+@lru_cache(maxsize=4096)
+def _cached_urlparse(url: str) -> ParseResult:
+    """Sparsuj URL z pamięcią podręczną (ParseResult jest niemutowalny)."""
+    return urlparse(url)
+
+
+def parse_json(content: bytes) -> Any:
+    """Sparsuj treść JSON (orjson, a dla liczb spoza 64 bitów moduł json)."""
+    # orjson zamienia liczby całkowite spoza 64 bitów na float (starsze wersje)
+    # albo je odrzuca; json zachowuje je dokładnie
+    if BIG_INT_PATTERN.search(content):
+        return json.loads(content)
+    try:
+        return orjson.loads(content)
+    except orjson.JSONDecodeError:
+        return json.loads(content)
+
+
+def json_to_text(data: Any) -> str:
+    """Zserializuj dane JSON do czytelnego tekstu (wcięcie 2 spacje)."""
+    try:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+    except (orjson.JSONEncodeError, TypeError):
+        # np. liczby całkowite spoza 64 bitów
+        return json.dumps(data, indent=2)
+
+
+class _RateLimiter:
+    """Ogranicznik liczby żądań na sekundę (wiadro tokenów o pojemności 1)."""
+    
+    def __init__(self, requests_per_second: float):
+        self.interval = 1.0 / requests_per_second
+        self._next_slot = 0.0
+    
+    async def wait(self):
+        """Poczekaj na następny wolny slot."""
+        now = asyncio.get_running_loop().time()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
 
 class HTTPIntegrationTools:
     """HTTP integration tools for MCP RAG Server."""
@@ -28,8 +106,10 @@ class HTTPIntegrationTools:
     def __init__(self, rag_service: RAGService, document_processor: DocumentProcessor):
         self.rag_service = rag_service
         self.document_processor = document_processor
-        self.client = httpx.AsyncClient(timeout=30.0)
+        self.client = httpx.AsyncClient(http2=True, timeout=HTTP_TIMEOUT, limits=HTTP_LIMITS)
         self._active_streams = {}
+        self._buffer_pool = BufferPool(READ_BUFFER_SIZE, READ_BUFFER_POOL_BYTES)
+        self._fetch_semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
     
     async def fetch_web_content(
         self, 
@@ -39,9 +119,23 @@ class HTTPIntegrationTools:
         extract_metadata: bool = True
     ) -> Dict[str, Any]:
         """Pobierz zawartość z URL i opcjonalnie dodaj do RAG systemu."""
+        fetched = await self._fetch_only(url, extract_metadata)
+        if not fetched["success"]:
+            return fetched
+        
+        rag_integration = {"added_to_rag": False}
+        
+        # Automatyczne dodanie do RAG
+        if auto_add_to_rag and self.rag_service:
+            rag_integration = await self._add_fetched_to_rag(fetched, user_id)
+        
+        return self._fetch_result(fetched, rag_integration)
+    
+    async def _fetch_only(self, url: str, extract_metadata: bool = True) -> Dict[str, Any]:
+        """Pobierz zawartość z URL bez dodawania jej do RAG."""
         try:
             # Walidacja URL
-            parsed_url = urlparse(url)
+            parsed_url = _cached_urlparse(url)
             if not parsed_url.scheme or not parsed_url.netloc:
                 return {
                     "success": False,
@@ -49,12 +143,18 @@ class HTTPIntegrationTools:
                     "url": url
                 }
             
-            # Pobierz zawartość
-            response = await self.client.get(url)
-            response.raise_for_status()
+            # Pobierz zawartość strumieniowo, z limitem rozmiaru
+            async with self.client.stream("GET", url) as response:
+                if response.is_error:
+                    await response.aread()
+                response.raise_for_status()
+                
+                content_type = response.headers.get("content-type", "")
+                encoding = response.charset_encoding
+                content, truncated = await self._read_body(response)
             
-            content = response.text
-            content_type = response.headers.get("content-type", "")
+            if truncated:
+                logger.warning(f"Content from {url} exceeded {MAX_CONTENT_BYTES} bytes and was truncated")
             
             # Ekstrakcja metadanych
             metadata = {}
@@ -63,62 +163,21 @@ class HTTPIntegrationTools:
                     "source_url": url,
                     "content_type": content_type,
                     "content_length": len(content),
-                    "fetch_timestamp": datetime.now().isoformat(),
+                    "fetch_timestamp": now_iso(),
                     "domain": parsed_url.netloc,
-                    "path": parsed_url.path
+                    "path": parsed_url.path,
+                    "truncated": truncated
                 }
             
-            # Automatyczne dodanie do RAG
-            if auto_add_to_rag and self.rag_service:
-                try:
-                    # Przetwórz zawartość przez document processor
-                    processed_content = await self.document_processor.process_content(
-                        content, metadata
-                    )
-                    
-                    # Dodaj do RAG systemu
-                    rag_result = await self.rag_service.add_document(
-                        processed_content,
-                        metadata,
-                        user_id
-                    )
-                    
-                    return {
-                        "success": True,
-                        "url": url,
-                        "content_length": len(content),
-                        "content_type": content_type,
-                        "rag_integration": {
-                            "added_to_rag": True,
-                            "document_id": rag_result.get("document_id"),
-                            "chunks_created": rag_result.get("chunks_created", 0)
-                        },
-                        "metadata": metadata
-                    }
-                except Exception as rag_error:
-                    logger.warning(f"Failed to add content to RAG: {rag_error}")
-                    return {
-                        "success": True,
-                        "url": url,
-                        "content_length": len(content),
-                        "content_type": content_type,
-                        "rag_integration": {
-                            "added_to_rag": False,
-                            "error": str(rag_error)
-                        },
-                        "metadata": metadata
-                    }
-            else:
-                return {
-                    "success": True,
-                    "url": url,
-                    "content_length": len(content),
-                    "content_type": content_type,
-                    "rag_integration": {
-                        "added_to_rag": False
-                    },
-                    "metadata": metadata
-                }
+            return {
+                "success": True,
+                "url": url,
+                "content": content,
+                "content_type": content_type,
+                "encoding": encoding,
+                "truncated": truncated,
+                "metadata": metadata
+            }
                 
         except httpx.HTTPStatusError as e:
             return {
@@ -140,6 +199,86 @@ class HTTPIntegrationTools:
                 "url": url
             }
     
+    async def _read_body(self, response: httpx.Response) -> Tuple[bytes, bool]:
+        """Odczytaj treść odpowiedzi do bufora z puli (maks. MAX_CONTENT_BYTES)."""
+        buffer = self._buffer_pool.rent()
+        try:
+            spill = None
+            size = 0
+            truncated = False
+            with memoryview(buffer) as view:
+                async for chunk in response.aiter_bytes(STREAM_CHUNK_SIZE):
+                    room = MAX_CONTENT_BYTES - size
+                    if len(chunk) > room:
+                        chunk = chunk[:room]
+                        truncated = True
+                    
+                    if spill is None and size + len(chunk) <= len(buffer):
+                        view[size:size + len(chunk)] = chunk
+                    else:
+                        if spill is None:
+                            # Treść nie mieści się w buforze z puli; dalej w rosnącym buforze
+                            spill = bytearray(view[:size])
+                        spill += chunk
+                    size += len(chunk)
+                    
+                    if truncated:
+                        break
+                
+                content = bytes(spill) if spill is not None else view[:size].tobytes()
+            return content, truncated
+        finally:
+            self._buffer_pool.release(buffer)
+    
+    async def _add_fetched_to_rag(
+        self, 
+        fetched: Dict[str, Any], 
+        user_id: str,
+        batched: bool = False
+    ) -> Dict[str, Any]:
+        """Przetwórz pobraną zawartość i dodaj ją do RAG (opcjonalnie przez batcher)."""
+        try:
+            if not batched and len(fetched["content"]) >= STREAM_INGEST_THRESHOLD:
+                # Duże strony: chunki trafiają do embeddingu partiami zamiast całego dokumentu naraz
+                chunks = self.document_processor.process_content_stream(
+                    fetched["content"], fetched["content_type"], fetched["encoding"]
+                )
+                rag_result = await self.rag_service.add_document_stream(chunks, fetched["metadata"], user_id)
+            else:
+                # Przetwórz zawartość przez document processor
+                processed_content = await self.document_processor.process_content_bytes(
+                    fetched["content"], fetched["content_type"], fetched["encoding"]
+                )
+                
+                # Dodaj do RAG systemu
+                add_document = self.rag_service.submit_document if batched else self.rag_service.add_document
+                rag_result = await add_document(processed_content, fetched["metadata"], user_id)
+            
+            return {
+                "added_to_rag": True,
+                "document_id": rag_result.get("id"),
+                "chunks_created": rag_result.get("chunks", 0)
+            }
+        except Exception as rag_error:
+            logger.warning(f"Failed to add content from {fetched['url']} to RAG: {rag_error}")
+            return {
+                "added_to_rag": False,
+                "error": str(rag_error)
+            }
+    
+    @staticmethod
+    def _fetch_result(fetched: Dict[str, Any], rag_integration: Dict[str, Any]) -> Dict[str, Any]:
+        """Zbuduj wynik pobrania URL dla pobranej zawartości."""
+        return {
+            "success": True,
+            "url": fetched["url"],
+            "content_length": len(fetched["content"]),
+            "content_type": fetched["content_type"],
+            "truncated": fetched.get("truncated", False),
+            "rag_integration": rag_integration,
+            "metadata": fetched["metadata"]
+        }
+    
     async def call_external_api(
         self, 
         endpoint: str, 
@@ -160,25 +299,26 @@ class HTTPIntegrationTools:
                 request_headers.update(headers)
             
             # Wykonaj żądanie
-            if method.upper() == "GET":
-                response = await self.client.get(endpoint, headers=request_headers)
-            elif method.upper() == "POST":
-                response = await self.client.post(endpoint, json=data, headers=request_headers)
-            elif method.upper() == "PUT":
-                response = await self.client.put(endpoint, json=data, headers=request_headers)
-            elif method.upper() == "DELETE":
-                response = await self.client.delete(endpoint, headers=request_headers)
-            else:
+            dispatch = HTTP_METHODS.get(method.upper())
+            if dispatch is None:
                 return {
                     "success": False,
                     "error": f"Unsupported HTTP method: {method}",
                     "endpoint": endpoint
                 }
+            client_method, sends_body = dispatch
+            if sends_body:
+                response = await getattr(self.client, client_method)(endpoint, json=data, headers=request_headers)
+            else:
+                response = await getattr(self.client, client_method)(endpoint, headers=request_headers)
             
             response.raise_for_status()
             
-            # Przetwórz odpowiedź
-            response_data = response.json() if response.headers.get("content-type", "").startswith("application/json") else response.text
+            # Przetwórz odpowiedź - typ treści rozpoznajemy tylko raz
+            content_type = response.headers.get("content-type", "")
+            is_json = content_type.startswith("application/json")
+            # orjson parsuje bajty odpowiedzi bezpośrednio, bez dekodowania do str
+            response_data = parse_json(response.content) if is_json else response.text
             
             # Automatyczne dodanie odpowiedzi do RAG
             if auto_add_response_to_rag and self.rag_service:
@@ -186,19 +326,16 @@ class HTTPIntegrationTools:
                     metadata = {
                         "api_endpoint": endpoint,
                         "method": method,
-                        "response_timestamp": datetime.now().isoformat(),
+                        "response_timestamp": now_iso(),
                         "status_code": response.status_code,
-                        "content_type": response.headers.get("content-type", "")
+                        "content_type": content_type
                     }
                     
                     # Konwertuj odpowiedź na tekst jeśli to JSON
-                    if isinstance(response_data, dict):
-                        content = json.dumps(response_data, indent=2)
-                    else:
-                        content = str(response_data)
+                    content = json_to_text(response_data) if is_json else response_data
                     
                     # Dodaj do RAG
-                    rag_result = await self.rag_service.add_document(
+                    rag_result = await self.rag_service.submit_document(
                         content,
                         metadata,
                         user_id
@@ -212,7 +349,7 @@ class HTTPIntegrationTools:
                         "response_data": response_data,
                         "rag_integration": {
                             "added_to_rag": True,
-                            "document_id": rag_result.get("document_id")
+                            "document_id": rag_result.get("id")
                         }
                     }
                 except Exception as rag_error:
@@ -264,37 +401,26 @@ class HTTPIntegrationTools:
         self, 
         urls: List[str], 
         user_id: str = "default",
-        max_concurrent: int = 5,
-        auto_add_to_rag: bool = True
+        max_concurrent: Optional[int] = None,
+        auto_add_to_rag: bool = True,
+        max_per_host: int = MAX_CONCURRENT_PER_HOST,
+        requests_per_second: Optional[float] = None
     ) -> Dict[str, Any]:
         """Pobierz zawartość z wielu URL-i równolegle."""
         try:
-            # Ogranicz liczbę równoczesnych żądań
-            semaphore = asyncio.Semaphore(max_concurrent)
-            
-            async def fetch_single_url(url: str) -> Dict[str, Any]:
-                async with semaphore:
-                    return await self.fetch_web_content(url, user_id, auto_add_to_rag)
-            
-            # Wykonaj wszystkie żądania równolegle
-            tasks = [fetch_single_url(url) for url in urls]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Przetwórz wyniki
             successful = []
             failed = []
             
-            for i, result in enumerate(results):
-                if isinstance(result, Exception):
-                    failed.append({
-                        "url": urls[i],
-                        "error": str(result)
-                    })
-                elif result.get("success"):
+            async for result in self.batch_fetch_urls_stream(
+                urls, user_id, max_concurrent, auto_add_to_rag,
+                max_per_host=max_per_host,
+                requests_per_second=requests_per_second
+            ):
+                if result.get("success"):
                     successful.append(result)
                 else:
                     failed.append({
-                        "url": urls[i],
+                        "url": result.get("url"),
                         "error": result.get("error", "Unknown error")
                     })
             
@@ -316,6 +442,68 @@ class HTTPIntegrationTools:
                 "total_urls": len(urls)
             }
     
+    async def batch_fetch_urls_stream(
+        self, 
+        urls: List[str], 
+        user_id: str = "default",
+        max_concurrent: Optional[int] = None,
+        auto_add_to_rag: bool = True,
+        stream_id: Optional[str] = None,
+        max_per_host: int = MAX_CONCURRENT_PER_HOST,
+        requests_per_second: Optional[float] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Pobieraj URL-e równolegle i zwracaj wyniki w kolejności ukończenia."""
+        # Ogranicz liczbę równoczesnych żądań - per host (żeby jeden wolny
+        # serwer nie blokował pozostałych), per wywołanie i globalnie
+        if not max_concurrent:
+            max_concurrent = min(MAX_CONCURRENT_FETCHES, max(1, len(urls)))
+        semaphore = asyncio.Semaphore(max_concurrent)
+        host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        host_rate_limiters: Dict[str, _RateLimiter] = {}
+        
+        async def fetch_single_url(url: str) -> Dict[str, Any]:
+            try:
+                host = _cached_urlparse(url).netloc
+                host_semaphore = host_semaphores.get(host)
+                if host_semaphore is None:
+                    host_semaphore = host_semaphores[host] = asyncio.Semaphore(max_per_host)
+                async with host_semaphore, semaphore, self._fetch_semaphore:
+                    if requests_per_second:
+                        rate_limiter = host_rate_limiters.get(host)
+                        if rate_limiter is None:
+                            rate_limiter = host_rate_limiters[host] = _RateLimiter(requests_per_second)
+                        await rate_limiter.wait()
+                    fetched = await self._fetch_only(url)
+                if not fetched["success"]:
+                    return fetched
+                
+                # Strony trafiają do batchera od razu po pobraniu, więc
+                # strony kończące się razem współdzielą jedno wywołanie osadzania
+                rag_integration = {"added_to_rag": False}
+                if auto_add_to_rag and self.rag_service:
+                    rag_integration = await self._add_fetched_to_rag(fetched, user_id, batched=True)
+                return self._fetch_result(fetched, rag_integration)
+            except Exception as e:
+                return {
+                    "success": False,
+                    "error": str(e),
+                    "url": url
+                }
+        
+        stream_id = stream_id or uuid.uuid4().hex
+        progress = {"type": "batch_fetch_urls", "total": len(urls), "completed": 0}
+        self._active_streams[stream_id] = progress
+        tasks = [asyncio.ensure_future(fetch_single_url(url)) for url in urls]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                result = await next_result
+                progress["completed"] += 1
+                yield result
+        finally:
+            for task in tasks:
+                task.cancel()
+            self._active_streams.pop(stream_id, None)
+    
     async def process_http_response(
         self, 
         response_data: Any, 
@@ -327,16 +515,13 @@ class HTTPIntegrationTools:
             if processing_type == "extract_text":
                 # Ekstrakcja tekstu z HTML
                 if isinstance(response_data, str):
-                    # Prosta ekstrakcja tekstu (można rozszerzyć o BeautifulSoup)
-                    import re
-                    text_content = re.sub(r'<[^>]+>', '', response_data)
-                    text_content = re.sub(r'\s+', ' ', text_content).strip()
+                    text_content = extract_html_text(response_data)
                     
                     metadata = {
                         "processing_type": "extract_text",
                         "original_length": len(response_data),
                         "extracted_length": len(text_content),
-                        "processing_timestamp": datetime.now().isoformat()
+                        "processing_timestamp": now_iso()
                     }
                     
                     # Dodaj do RAG
@@ -353,19 +538,19 @@ class HTTPIntegrationTools:
                             "extracted_text_length": len(text_content),
                             "rag_integration": {
                                 "added_to_rag": True,
-                                "document_id": rag_result.get("document_id")
+                                "document_id": rag_result.get("id")
                             }
                         }
             
             elif processing_type == "json_to_text":
                 # Konwersja JSON na tekst
                 if isinstance(response_data, dict):
-                    text_content = json.dumps(response_data, indent=2)
+                    text_content = json_to_text(response_data)
                     
                     metadata = {
                         "processing_type": "json_to_text",
                         "original_keys": list(response_data.keys()),
-                        "processing_timestamp": datetime.now().isoformat()
+                        "processing_timestamp": now_iso()
                     }
                     
                     # Dodaj do RAG
@@ -382,7 +567,7 @@ class HTTPIntegrationTools:
                             "converted_text_length": len(text_content),
                             "rag_integration": {
                                 "added_to_rag": True,
-                                "document_id": rag_result.get("document_id")
+                                "document_id": rag_result.get("id")
                             }
                         }
             
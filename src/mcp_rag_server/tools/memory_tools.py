@@ -4,12 +4,201 @@ Memory management tools for MCP RAG Server.
 This module provides tools for managing conversation memory and user sessions.
 """
 
+import asyncio
 import logging
-from typing import Dict, Any, Optional, List
-from datetime import datetime
+import operator
+import re
+from bisect import bisect_right
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import cached_property
+from itertools import groupby
+from typing import Dict, Any, Optional, List, NamedTuple, Set
+from datetime import datetime, timedelta
+
+from ..utils.timestamps import now_iso
 
 logger = logging.getLogger(__name__)
 
+# Time span covered by each analysis time_range
+TIME_RANGE_DELTAS = {
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(days=7),
+    "month": timedelta(days=30)
+}
+
+# Default number of per-user or per-query calls the batch tools run at once
+MAX_CONCURRENT_BATCH_CALLS = 16
+
+# Simple keyword-based topic analysis
+TOPIC_KEYWORDS = {
+    "questions": ["what", "how", "why", "when", "where", "who", "?"],
+    "instructions": ["help", "show", "explain", "tell", "guide"],
+    "preferences": ["like", "prefer", "favorite", "best", "want"],
+    "facts": ["is", "are", "was", "were", "has", "have"],
+    "conversation": ["said", "talked", "discussed", "mentioned"]
+}
+
+# Topic keywords split into whole words, looked up in each memory's word set,
+# and symbols, matched as substrings of the lower-cased content
+TOPIC_WORDS = {
+    topic: frozenset(keyword for keyword in keywords if keyword.isalnum())
+    for topic, keywords in TOPIC_KEYWORDS.items()
+}
+TOPIC_SYMBOLS = {
+    topic: tuple(keyword for keyword in keywords if not keyword.isalnum())
+    for topic, keywords in TOPIC_KEYWORDS.items()
+}
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def _parse_created_at(memory: Dict[str, Any]) -> Optional[datetime]:
+    """Parse a memory's created_at into a naive local datetime (None if missing or invalid)."""
+    created_at = memory.get("created_at")
+    if not created_at:
+        return None
+    
+    if isinstance(created_at, str):
+        try:
+            created_time = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
+        except ValueError as e:
+            logger.error(f"Error parsing memory timestamp: {e}")
+            return None
+    else:
+        created_time = created_at
+    
+    # Compare offset-aware timestamps against the naive local clock used elsewhere
+    if created_time.tzinfo is not None:
+        created_time = created_time.astimezone().replace(tzinfo=None)
+    return created_time
+
+
+class ParsedMemory(NamedTuple):
+    """A memory with the fields read by the analytics helpers extracted once."""
+    raw: Dict[str, Any]
+    created: Optional[datetime]
+    mem_type: str
+    session_id: str
+    content_len: int
+
+
+@dataclass(slots=True)
+class SessionAgg:
+    """Running per-session statistics gathered by the analytics pass."""
+    memory_count: int = 0
+    memory_types: Counter = field(default_factory=Counter)
+    first_memory: Optional[datetime] = None
+    last_memory: Optional[datetime] = None
+
+
+class _Preprocessed:
+    """
+    Memories prepared for analysis.
+    
+    Each derived view is computed on first use and at most once, so an analysis
+    only pays for the views its helpers actually read.
+    """
+    
+    def __init__(self, memories: List[Dict[str, Any]]):
+        self.memories = memories
+    
+    def __len__(self) -> int:
+        return len(self.memories)
+    
+    @cached_property
+    def contents(self) -> List[str]:
+        """Memory contents, read once for every view that needs them."""
+        return [memory.get("memory", "") for memory in self.memories]
+    
+    @cached_property
+    def parsed(self) -> List[ParsedMemory]:
+        """Memories with their timestamp parsed and analytics fields extracted."""
+        return [
+            ParsedMemory(
+                raw=memory,
+                created=_parse_created_at(memory),
+                mem_type=memory.get("memory_type", "unknown"),
+                session_id=memory.get("session_id", "unknown"),
+                content_len=len(content)
+            )
+            for memory, content in zip(self.memories, self.contents)
+        ]
+    
+    @cached_property
+    def lower_contents(self) -> List[str]:
+        """Lower-cased memory contents."""
+        return [content.lower() for content in self.contents]
+    
+    @cached_property
+    def words(self) -> List[Set[str]]:
+        """Distinct words of each lower-cased memory, tokenized once for all topics."""
+        return [set(_WORD_RE.findall(content)) for content in self.lower_contents]
+    
+    @cached_property
+    def aggregates(self) -> Dict[str, Any]:
+        """Counters and per-session statistics gathered in one pass over the parsed memories."""
+        memory_types = Counter()
+        # Keyed by hour number and date; labels are formatted once per key when reported
+        hours, dates = Counter(), Counter()
+        sessions: Dict[str, SessionAgg] = {}
+        content_total = 0
+        content_min = content_max = None
+        
+        for memory in self.parsed:
+            mem_type = memory.mem_type
+            memory_types[mem_type] += 1
+            
+            content_len = memory.content_len
+            content_total += content_len
+            if content_min is None or content_len < content_min:
+                content_min = content_len
+            if content_max is None or content_len > content_max:
+                content_max = content_len
+            
+            session = sessions.get(memory.session_id)
+            if session is None:
+                session = sessions[memory.session_id] = SessionAgg()
+            session.memory_count += 1
+            session.memory_types[mem_type] += 1
+            
+            created_time = memory.created
+            if created_time is None:
+                continue
+            
+            hours[created_time.hour] += 1
+            dates[created_time.date()] += 1
+            
+            first_memory = session.first_memory
+            if first_memory is None or created_time < first_memory:
+                session.first_memory = created_time
+            last_memory = session.last_memory
+            if last_memory is None or created_time > last_memory:
+                session.last_memory = created_time
+        
+        return {
+            "memory_types": memory_types,
+            "hours": hours,
+            "dates": dates,
+            "sessions": sessions,
+            "content_total": content_total,
+            "content_min": content_min,
+            "content_max": content_max
+        }
+    
+    def created_after(self, cutoff: datetime) -> "_Preprocessed":
+        """Memories created after ``cutoff``, reusing the already parsed records."""
+        created = [memory.created for memory in self.parsed]
+        if None not in created and all(map(operator.le, created, created[1:])):
+            # Chronological order (as mem0 stores memories): the kept memories are a suffix
+            kept = self.parsed[bisect_right(created, cutoff):]
+        else:
+            kept = [memory for memory in self.parsed if memory.created is not None and memory.created > cutoff]
+        filtered = _Preprocessed([memory.raw for memory in kept])
+        filtered.parsed = kept
+        return filtered
+
 
 class MemoryTools:
     """Memory management tools for MCP RAG Server."""
@@ -38,7 +227,7 @@ class MemoryTools:
             # Add timestamp to metadata
             mem_metadata = metadata or {}
             mem_metadata.update({
-                "added_at": datetime.now().isoformat(),
+                "added_at": now_iso(),
                 "memory_type": memory_type
             })
             
@@ -178,44 +367,47 @@ class MemoryTools:
             return {"success": False, "error": "Mem0 service not initialized"}
         
         try:
-            # Get user memories to analyze session patterns
-            memories = await self.mem0_service.get_user_memories(user_id, limit=100)
-            
-            # Group by session
-            sessions = {}
-            for memory in memories:
-                session_id = memory.get("session_id", "unknown")
-                if session_id not in sessions:
-                    sessions[session_id] = {
-                        "session_id": session_id,
-                        "memories": [],
-                        "memory_types": {},
-                        "created_at": memory.get("created_at"),
-                        "last_activity": memory.get("created_at")
-                    }
-                
-                sessions[session_id]["memories"].append(memory)
-                mem_type = memory.get("memory_type", "unknown")
-                sessions[session_id]["memory_types"][mem_type] = sessions[session_id]["memory_types"].get(mem_type, 0) + 1
-                
-                # Update last activity
-                if memory.get("created_at") > sessions[session_id]["last_activity"]:
-                    sessions[session_id]["last_activity"] = memory.get("created_at")
-            
-            # Calculate session statistics
+            # Count all memories and fetch recent ones to analyze session patterns
+            memory_count, memories = await asyncio.gather(
+                self.mem0_service.count_memories(user_id),
+                self.mem0_service.get_user_memories(user_id, limit=100),
+                return_exceptions=True
+            )
+            if isinstance(memories, Exception):
+                raise memories
+            if isinstance(memory_count, Exception):
+                # The total is informational; report the sessions without it
+                logger.warning(f"Error counting memories for user {user_id}: {memory_count}")
+                memory_count = None
+            
+            # Group by session: sorted by session and time, each group's first and
+            # last memories are its creation and last activity
+            ordered = sorted(
+                memories,
+                key=lambda memory: (memory.get("session_id", "unknown"), memory.get("created_at") or "")
+            )
             session_list = []
-            for session_data in sessions.values():
+            for session_id, group in groupby(ordered, key=lambda memory: memory.get("session_id", "unknown")):
+                # Count the group while walking it instead of keeping its memories
+                first = last = next(group)
+                session_memory_count = 1
+                memory_types = Counter([first.get("memory_type", "unknown")])
+                for last in group:
+                    session_memory_count += 1
+                    memory_types[last.get("memory_type", "unknown")] += 1
+                
                 session_list.append({
-                    "session_id": session_data["session_id"],
-                    "memory_count": len(session_data["memories"]),
-                    "memory_types": session_data["memory_types"],
-                    "created_at": session_data["created_at"],
-                    "last_activity": session_data["last_activity"]
+                    "session_id": session_id,
+                    "memory_count": session_memory_count,
+                    "memory_types": memory_types,
+                    "created_at": first.get("created_at"),
+                    "last_activity": last.get("created_at")
                 })
             
             return {
                 "success": True,
                 "user_id": user_id,
+                "total_memories": memory_count,
                 "total_sessions": len(session_list),
                 "sessions": session_list
             }
@@ -289,6 +481,8 @@ class MemoryTools:
                 - include_relevance: Include relevance scores
                 - group_by_topic: Group related memories
                 - min_confidence: Minimum confidence threshold
+                - attach_memories: Include the top 5 memories in the response (default: False)
+                - project_fields: Only include these fields of attached memories
         """
         if not self.mem0_service:
             return {"success": False, "error": "Mem0 service not initialized"}
@@ -304,6 +498,8 @@ class MemoryTools:
             include_relevance = options.get("include_relevance", True)
             group_by_topic = options.get("group_by_topic", True)
             min_confidence = options.get("min_confidence", 0.1)
+            attach_memories = options.get("attach_memories", False)
+            project_fields = options.get("project_fields")
             
             # Get relevant memories using advanced search
             search_options = {
@@ -338,6 +534,16 @@ class MemoryTools:
                 memories, query, max_length=500, summary_options=summary_options
             )
             
+            # Top memories for reference are attached only when asked for
+            attached_memories = []
+            if attach_memories:
+                attached_memories = memories[:5]
+                if project_fields:
+                    attached_memories = [
+                        {field: memory[field] for field in project_fields if field in memory}
+                        for memory in attached_memories
+                    ]
+            
             return {
                 "success": True,
                 "user_id": user_id,
@@ -345,7 +551,7 @@ class MemoryTools:
                 "context": context_summary,
                 "memory_count": len(memories),
                 "summary_type": summary_type,
-                "memories": memories[:5] if include_relevance else [],  # Include top 5 for reference
+                "memories": attached_memories,
                 "context_options": context_options or {}
             }
         except Exception as e:
@@ -387,35 +593,32 @@ class MemoryTools:
                     }
                 }
             
-            # Filter by time range if specified
-            if time_range and time_range != "all":
-                filtered_memories = []
-                for memory in memories:
-                    if self._is_memory_in_time_range(memory, time_range):
-                        filtered_memories.append(memory)
-                memories = filtered_memories
+            # Parse each memory once for all of the analyses below
+            prepared = self._preprocess(memories)
+            
+            # Filter by time range if specified, against a cutoff computed once
+            cutoff = self._time_range_cutoff(time_range)
+            if cutoff is not None:
+                prepared = prepared.created_after(cutoff)
             
             # Analyze memory types
-            memory_types = {}
-            for memory in memories:
-                mem_type = memory.get("memory_type", "unknown")
-                memory_types[mem_type] = memory_types.get(mem_type, 0) + 1
+            memory_types = prepared.aggregates["memory_types"]
             
             # Analyze temporal distribution
-            temporal_distribution = self._analyze_temporal_distribution(memories)
+            temporal_distribution = self._analyze_temporal_distribution(prepared)
             
             # Analyze session patterns
-            session_analysis = self._analyze_session_patterns(memories)
+            session_analysis = self._analyze_session_patterns(prepared)
             
             # Calculate engagement metrics
-            engagement_metrics = self._calculate_engagement_metrics(memories)
+            engagement_metrics = self._calculate_engagement_metrics(prepared)
             
             return {
                 "success": True,
                 "user_id": user_id,
                 "time_range": time_range or "all",
                 "patterns": {
-                    "total_memories": len(memories),
+                    "total_memories": len(prepared),
                     "memory_types": memory_types,
                     "temporal_distribution": temporal_distribution,
                     "session_analysis": session_analysis,
@@ -511,19 +714,21 @@ class MemoryTools:
                 }
             
             insights = {}
+            # Views shared by the helpers are computed lazily, only for the requested insights
+            prepared = self._preprocess(memories)
             
             if insight_type in ["comprehensive", "engagement"]:
-                insights["engagement"] = self._calculate_engagement_metrics(memories)
+                insights["engagement"] = self._calculate_engagement_metrics(prepared)
             
             if insight_type in ["comprehensive", "topics"]:
-                insights["topics"] = self._analyze_topic_distribution(memories)
+                insights["topics"] = self._analyze_topic_distribution(prepared)
             
             if insight_type in ["comprehensive", "sessions"]:
-                insights["sessions"] = self._analyze_session_patterns(memories)
+                insights["sessions"] = self._analyze_session_patterns(prepared)
             
             if insight_type == "comprehensive":
-                insights["temporal"] = self._analyze_temporal_distribution(memories)
-                insights["patterns"] = self._identify_memory_patterns(memories)
+                insights["temporal"] = self._analyze_temporal_distribution(prepared)
+                insights["patterns"] = self._identify_memory_patterns(prepared)
             
             return {
                 "success": True,
@@ -536,129 +741,160 @@ class MemoryTools:
             logger.error(f"Error getting memory insights: {e}")
             return {"success": False, "error": str(e)}
 
+    async def batch_get_memory_insights(
+        self,
+        user_ids: List[str],
+        insight_type: str = "comprehensive",
+        max_concurrent: int = MAX_CONCURRENT_BATCH_CALLS
+    ) -> Dict[str, Any]:
+        """
+        Get memory insights for several users concurrently.
+        
+        Args:
+            user_ids: User identifiers
+            insight_type: Type of insights ('comprehensive', 'engagement', 'topics', 'sessions')
+            max_concurrent: Maximum number of users analyzed at the same time
+        """
+        if not self.mem0_service:
+            return {"success": False, "error": "Mem0 service not initialized"}
+        
+        semaphore = asyncio.Semaphore(max(1, max_concurrent))
+        
+        async def insights_for(user_id: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.get_memory_insights(user_id, insight_type)
+        
+        results = await asyncio.gather(*(insights_for(user_id) for user_id in user_ids))
+        return {
+            "success": True,
+            "insight_type": insight_type,
+            "results": results,
+            "count": len(results)
+        }
+
+    async def batch_search_memories_advanced(
+        self,
+        user_id: str,
+        queries: List[str],
+        search_options: Optional[Dict[str, Any]] = None,
+        max_concurrent: int = MAX_CONCURRENT_BATCH_CALLS
+    ) -> Dict[str, Any]:
+        """
+        Run several advanced memory searches for a user concurrently.
+        
+        Args:
+            user_id: User identifier
+            queries: Search queries
+            search_options: Advanced search options shared by all queries
+            max_concurrent: Maximum number of searches run at the same time
+        """
+        if not self.mem0_service:
+            return {"success": False, "error": "Mem0 service not initialized"}
+        
+        semaphore = asyncio.Semaphore(max(1, max_concurrent))
+        
+        async def search(query: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.search_memories_advanced(user_id, query, search_options)
+        
+        results = await asyncio.gather(*(search(query) for query in queries))
+        return {
+            "success": True,
+            "user_id": user_id,
+            "results": results,
+            "count": len(results)
+        }
+
     # Helper methods for advanced analysis
 
-    def _is_memory_in_time_range(self, memory: Dict[str, Any], time_range: str) -> bool:
-        """Check if memory is within specified time range."""
-        try:
-            created_at = memory.get("created_at")
-            if not created_at:
-                return False
-            
-            if isinstance(created_at, str):
-                created_time = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-            else:
-                created_time = created_at
-            
-            now = datetime.now()
-            
-            if time_range == "hour":
-                return (now - created_time).total_seconds() < 3600
-            elif time_range == "day":
-                return (now - created_time).days < 1
-            elif time_range == "week":
-                return (now - created_time).days < 7
-            elif time_range == "month":
-                return (now - created_time).days < 30
-            else:
-                return True
-                
-        except Exception as e:
-            logger.error(f"Error checking time range: {e}")
+    @staticmethod
+    def _time_range_cutoff(time_range: Optional[str], now: Optional[datetime] = None) -> Optional[datetime]:
+        """Oldest creation time within a time range (None when the range is unbounded)."""
+        delta = TIME_RANGE_DELTAS.get(time_range)
+        if delta is None:
+            return None
+        return (now or datetime.now()) - delta
+
+    @staticmethod
+    def _preprocess(memories: List[Dict[str, Any]]) -> "_Preprocessed":
+        """Wrap memories for analysis."""
+        return _Preprocessed(memories)
+
+    def _is_memory_in_time_range(
+        self, 
+        memory: Dict[str, Any], 
+        time_range: str,
+        now: Optional[datetime] = None
+    ) -> bool:
+        """Check if memory is within specified time range (relative to ``now``, default the current time)."""
+        created_time = _parse_created_at(memory)
+        if created_time is None:
             return False
+        
+        cutoff = self._time_range_cutoff(time_range, now)
+        return cutoff is None or created_time > cutoff
 
-    def _analyze_temporal_distribution(self, memories: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _analyze_temporal_distribution(self, memories: _Preprocessed) -> Dict[str, Any]:
         """Analyze temporal distribution of memories."""
         try:
+            aggregates = memories.aggregates
             distribution = {
-                "hour": {},
-                "day": {},
-                "week": {},
-                "month": {}
+                "hour": Counter(),
+                "day": Counter(),
+                "week": Counter(),
+                "month": Counter()
             }
             
-            for memory in memories:
-                created_at = memory.get("created_at")
-                if not created_at:
-                    continue
-                
-                if isinstance(created_at, str):
-                    created_time = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-                else:
-                    created_time = created_at
-                
-                # Hour distribution
-                hour = created_time.strftime("%H")
-                distribution["hour"][hour] = distribution["hour"].get(hour, 0) + 1
-                
-                # Day distribution
-                day = created_time.strftime("%A")
-                distribution["day"][day] = distribution["day"].get(day, 0) + 1
-                
-                # Week distribution (week number)
-                week = created_time.strftime("%U")
-                distribution["week"][week] = distribution["week"].get(week, 0) + 1
-                
-                # Month distribution
-                month = created_time.strftime("%B")
-                distribution["month"][month] = distribution["month"].get(month, 0) + 1
+            for hour, count in aggregates["hours"].items():
+                distribution["hour"][f"{hour:02d}"] = count
+            
+            # Day, week number and month are formatted once per distinct date
+            for date, count in aggregates["dates"].items():
+                distribution["day"][date.strftime("%A")] += count
+                distribution["week"][date.strftime("%U")] += count
+                distribution["month"][date.strftime("%B")] += count
             
             return distribution
         except Exception as e:
             logger.error(f"Error analyzing temporal distribution: {e}")
             return {}
 
-    def _analyze_session_patterns(self, memories: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _analyze_session_patterns(self, memories: _Preprocessed) -> Dict[str, Any]:
         """Analyze session patterns in memories."""
         try:
             sessions = {}
+            total_duration = 0
             
-            for memory in memories:
-                session_id = memory.get("session_id", "unknown")
-                if session_id not in sessions:
-                    sessions[session_id] = {
-                        "memory_count": 0,
-                        "memory_types": {},
-                        "duration": None,
-                        "first_memory": None,
-                        "last_memory": None
-                    }
-                
-                sessions[session_id]["memory_count"] += 1
+            for session_id, session in memories.aggregates["sessions"].items():
+                first_memory = session.first_memory
+                last_memory = session.last_memory
                 
-                mem_type = memory.get("memory_type", "unknown")
-                sessions[session_id]["memory_types"][mem_type] = sessions[session_id]["memory_types"].get(mem_type, 0) + 1
+                # Session duration in minutes
+                duration = None
+                if first_memory and last_memory:
+                    duration = (last_memory - first_memory).total_seconds() / 60
+                    total_duration += duration
                 
-                created_at = memory.get("created_at")
-                if created_at:
-                    if isinstance(created_at, str):
-                        created_time = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-                    else:
-                        created_time = created_at
-                    
-                    if sessions[session_id]["first_memory"] is None or created_time < sessions[session_id]["first_memory"]:
-                        sessions[session_id]["first_memory"] = created_time
-                    
-                    if sessions[session_id]["last_memory"] is None or created_time > sessions[session_id]["last_memory"]:
-                        sessions[session_id]["last_memory"] = created_time
-            
-            # Calculate session durations
-            for session_data in sessions.values():
-                if session_data["first_memory"] and session_data["last_memory"]:
-                    duration = session_data["last_memory"] - session_data["first_memory"]
-                    session_data["duration"] = duration.total_seconds() / 60  # in minutes
+                sessions[session_id] = {
+                    "memory_count": session.memory_count,
+                    "memory_types": session.memory_types,
+                    "duration": duration,
+                    "first_memory": first_memory,
+                    "last_memory": last_memory
+                }
             
+            # Every memory belongs to exactly one session
             return {
                 "total_sessions": len(sessions),
-                "avg_memories_per_session": sum(s["memory_count"] for s in sessions.values()) / len(sessions) if sessions else 0,
-                "avg_session_duration": sum(s["duration"] or 0 for s in sessions.values()) / len(sessions) if sessions else 0,
+                "avg_memories_per_session": len(memories) / len(sessions) if sessions else 0,
+                "avg_session_duration": total_duration / len(sessions) if sessions else 0,
                 "session_details": sessions
             }
         except Exception as e:
             logger.error(f"Error analyzing session patterns: {e}")
             return {}
 
-    def _calculate_engagement_metrics(self, memories: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _calculate_engagement_metrics(self, memories: _Preprocessed) -> Dict[str, Any]:
         """Calculate engagement metrics for memories."""
         try:
             if not memories:
@@ -671,26 +907,16 @@ class MemoryTools:
                 }
             
             # Memory type distribution
-            memory_types = {}
-            for memory in memories:
-                mem_type = memory.get("memory_type", "unknown")
-                memory_types[mem_type] = memory_types.get(mem_type, 0) + 1
-            
-            # Calculate daily activity
-            daily_activity = {}
-            for memory in memories:
-                created_at = memory.get("created_at")
-                if created_at:
-                    if isinstance(created_at, str):
-                        created_time = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-                    else:
-                        created_time = created_at
-                    
-                    date = created_time.strftime("%Y-%m-%d")
-                    daily_activity[date] = daily_activity.get(date, 0) + 1
+            memory_types = memories.aggregates["memory_types"]
+            
+            # Daily activity, counted by the analytics pass
+            daily_activity = memories.aggregates["dates"]
             
             # Find most active day
-            most_active_day = max(daily_activity.items(), key=lambda x: x[1]) if daily_activity else None
+            most_active_day = None
+            if daily_activity:
+                date, count = daily_activity.most_common(1)[0]
+                most_active_day = (date.isoformat(), count)
             
             # Calculate engagement score
             total_days = len(daily_activity)
@@ -712,40 +938,26 @@ class MemoryTools:
             logger.error(f"Error calculating engagement metrics: {e}")
             return {}
 
-    def _analyze_topic_distribution(self, memories: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _analyze_topic_distribution(self, memories: _Preprocessed) -> Dict[str, Any]:
         """Analyze topic distribution in memories."""
         try:
-            # Simple keyword-based topic analysis
-            topic_keywords = {
-                "questions": ["what", "how", "why", "when", "where", "who", "?"],
-                "instructions": ["help", "show", "explain", "tell", "guide"],
-                "preferences": ["like", "prefer", "favorite", "best", "want"],
-                "facts": ["is", "are", "was", "were", "has", "have"],
-                "conversation": ["said", "talked", "discussed", "mentioned"]
-            }
+            topic_counts = Counter({topic: 0 for topic in TOPIC_KEYWORDS})
             
-            topic_counts = {topic: 0 for topic in topic_keywords}
-            
-            for memory in memories:
-                content = memory.get("memory", "").lower()
-                
-                for topic, keywords in topic_keywords.items():
-                    if any(keyword in content for keyword in keywords):
+            for content, words in zip(memories.lower_contents, memories.words):
+                for topic, keywords in TOPIC_WORDS.items():
+                    if not keywords.isdisjoint(words) or any(symbol in content for symbol in TOPIC_SYMBOLS[topic]):
                         topic_counts[topic] += 1
             
-            # Find dominant topics
-            dominant_topics = sorted(topic_counts.items(), key=lambda x: x[1], reverse=True)
-            
             return {
                 "topic_distribution": topic_counts,
-                "dominant_topics": dominant_topics[:3],
+                "dominant_topics": topic_counts.most_common(3),
                 "total_topics_identified": sum(topic_counts.values())
             }
         except Exception as e:
             logger.error(f"Error analyzing topic distribution: {e}")
             return {}
 
-    def _identify_memory_patterns(self, memories: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _identify_memory_patterns(self, memories: _Preprocessed) -> Dict[str, Any]:
         """Identify patterns in memory creation and usage."""
         try:
             patterns = {
@@ -754,45 +966,28 @@ class MemoryTools:
                 "session_patterns": {}
             }
             
+            aggregates = memories.aggregates
+            
             # Analyze creation patterns
-            creation_times = []
-            for memory in memories:
-                created_at = memory.get("created_at")
-                if created_at:
-                    if isinstance(created_at, str):
-                        created_time = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-                    else:
-                        created_time = created_at
-                    creation_times.append(created_time.hour)
-            
-            if creation_times:
+            if aggregates["hours"]:
                 # Find peak activity hours
-                hour_counts = {}
-                for hour in creation_times:
-                    hour_counts[hour] = hour_counts.get(hour, 0) + 1
-                
-                peak_hours = sorted(hour_counts.items(), key=lambda x: x[1], reverse=True)[:3]
-                patterns["creation_patterns"]["peak_hours"] = peak_hours
+                patterns["creation_patterns"]["peak_hours"] = aggregates["hours"].most_common(3)
             
             # Analyze content patterns
-            content_lengths = [len(memory.get("memory", "")) for memory in memories]
-            if content_lengths:
+            if memories:
                 patterns["content_patterns"] = {
-                    "avg_length": sum(content_lengths) / len(content_lengths),
-                    "min_length": min(content_lengths),
-                    "max_length": max(content_lengths)
+                    "avg_length": aggregates["content_total"] / len(memories),
+                    "min_length": aggregates["content_min"],
+                    "max_length": aggregates["content_max"]
                 }
             
             # Analyze session patterns
-            session_memory_counts = {}
-            for memory in memories:
-                session_id = memory.get("session_id", "unknown")
-                session_memory_counts[session_id] = session_memory_counts.get(session_id, 0) + 1
+            session_count = len(aggregates["sessions"])
             
-            if session_memory_counts:
+            if session_count:
                 patterns["session_patterns"] = {
-                    "avg_memories_per_session": sum(session_memory_counts.values()) / len(session_memory_counts),
-                    "session_count": len(session_memory_counts)
+                    "avg_memories_per_session": len(memories) / session_count,
+                    "session_count": session_count
                 }
             
             return patterns
@@ -4,11 +4,27 @@ Search and query tools for MCP RAG Server.
 This module provides tools for searching documents and asking questions using RAG.
 """
 
+import asyncio
 import logging
-from typing import Dict, Any, Optional, List
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Templates of the suggestions offered for a partial query
+SUGGESTION_TEMPLATES = (
+    "{} documents",
+    "{} information",
+    "find {}",
+    "search {}",
+)
+
+
+@lru_cache(maxsize=10000)
+def _search_suggestions(partial_query: str) -> Tuple[str, ...]:
+    """Build the suggestions for a partial query (cached, since typed prefixes repeat)."""
+    return tuple(template.format(partial_query) for template in SUGGESTION_TEMPLATES)
+
 
 class SearchTools:
     """Search and query tools for MCP RAG Server."""
@@ -28,14 +44,14 @@ class SearchTools:
         if not self.rag_service:
             raise RuntimeError("RAG service not initialized")
         
+        # Validate input
+        if not query or not query.strip():
+            return {"success": False, "error": "Search query cannot be empty"}
+        
+        if limit <= 0 or limit > 100:
+            return {"success": False, "error": "Limit must be between 1 and 100"}
+        
         try:
-            # Validate input
-            if not query or not query.strip():
-                return {"success": False, "error": "Search query cannot be empty"}
-            
-            if limit <= 0 or limit > 100:
-                return {"success": False, "error": "Limit must be between 1 and 100"}
-            
             results = await self.rag_service.search_documents(query, limit, user_id, filters)
             return {
                 "success": True, 
@@ -59,14 +75,14 @@ class SearchTools:
         if not self.rag_service:
             raise RuntimeError("RAG service not initialized")
         
+        # Validate input
+        if not question or not question.strip():
+            return {"success": False, "error": "Question cannot be empty"}
+        
+        if max_context_docs <= 0 or max_context_docs > 10:
+            return {"success": False, "error": "max_context_docs must be between 1 and 10"}
+        
         try:
-            # Validate input
-            if not question or not question.strip():
-                return {"success": False, "error": "Question cannot be empty"}
-            
-            if max_context_docs <= 0 or max_context_docs > 10:
-                return {"success": False, "error": "max_context_docs must be between 1 and 10"}
-            
             response = await self.rag_service.ask_question(
                 question, 
                 user_id, 
@@ -94,24 +110,42 @@ class SearchTools:
         if not self.rag_service:
             raise RuntimeError("RAG service not initialized")
         
+        # Validate input
+        if not queries:
+            return {"success": False, "error": "Queries list cannot be empty"}
+        
+        if len(queries) > 10:
+            return {"success": False, "error": "Maximum 10 queries allowed per batch"}
+        
+        valid_queries = [query for query in queries if query and query.strip()]
+        # Search each distinct query once; repeated queries share its results
+        unique_queries = list(dict.fromkeys(query.strip() for query in valid_queries))
+        
         try:
-            # Validate input
-            if not queries:
-                return {"success": False, "error": "Queries list cannot be empty"}
+            try:
+                # One embedding call and one vector search for the whole batch
+                search_results = await self.rag_service.search_documents_batch(unique_queries, limit, user_id)
+            except Exception as e:
+                # Retry the queries individually (and concurrently) so only the
+                # failing ones are left out of the results
+                logger.warning(f"Batched search of {len(unique_queries)} queries failed, retrying individually: {e}")
+                search_results = await asyncio.gather(
+                    *(self.rag_service.search_documents(query, limit, user_id) for query in unique_queries),
+                    return_exceptions=True
+                )
             
-            if len(queries) > 10:
-                return {"success": False, "error": "Maximum 10 queries allowed per batch"}
+            results_by_query = {}
+            for query, search_result in zip(unique_queries, search_results):
+                if isinstance(search_result, Exception):
+                    logger.warning(f"Batch search failed for query '{query}': {search_result}")
+                    continue
+                results_by_query[query] = search_result
             
-            results = []
-            for query in queries:
-                if query and query.strip():
-                    search_result = await self.rag_service.search_documents(
-                        query, limit, user_id
-                    )
-                    results.append({
-                        "query": query,
-                        "results": search_result
-                    })
+            results = [
+                {"query": query, "results": results_by_query[query.strip()]}
+                for query in valid_queries
+                if query.strip() in results_by_query
+            ]
             
             return {
                 "success": True,
@@ -131,16 +165,11 @@ class SearchTools:
         try:
             # This is a placeholder for future implementation
             # Could be implemented using document titles, common queries, etc.
-            suggestions = [
-                f"{partial_query} documents",
-                f"{partial_query} information",
-                f"find {partial_query}",
-                f"search {partial_query}"
-            ]
+            suggestions = _search_suggestions(partial_query)
             
             return {
                 "success": True,
-                "suggestions": suggestions,
+                "suggestions": list(suggestions),
                 "partial_query": partial_query
             }
         except Exception as e:
@@ -5,16 +5,29 @@ This module provides FastMCP tools for creating, managing, and monitoring
 user sessions in the RAG system.
 """
 
+import asyncio
 import logging
 import json
 from typing import Dict, List, Any, Optional
 
+from pydantic import ValidationError
+
 from ..validation import validate_session_creation, validate_session_id, validate_user_id
 from ..services.session_service import SessionService
 
 logger = logging.getLogger(__name__)
 
 
+def _invalid_input(message: str, error: ValidationError) -> Dict[str, Any]:
+    """Build the failure response for parameters rejected by validation."""
+    logger.warning(f"{message}: {error}")
+    return {
+        "success": False,
+        "error": str(error),
+        "message": f"{message}: {str(error)}"
+    }
+
+
 class SessionTools:
     """Session management tools for MCP RAG Server."""
     
@@ -29,14 +42,17 @@ class SessionTools:
         metadata: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """Create a new session for a user."""
+        # Validate input
         try:
-            # Validate input
             validated_params = validate_session_creation({
                 "user_id": user_id,
                 "session_name": session_name,
                 "metadata": metadata or {}
             })
-            
+        except ValidationError as e:
+            return _invalid_input("Failed to create session", e)
+        
+        try:
             # Create session
             session_id = await self.session_service.create_session(
                 user_id=validated_params.user_id,
@@ -60,12 +76,18 @@ class SessionTools:
     
     async def get_session_info(self, session_id: str) -> Dict[str, Any]:
         """Get information about a specific session."""
+        # Validate input
         try:
-            # Validate input
             validated_params = validate_session_id({"session_id": session_id})
-            
-            # Get session info
-            session = await self.session_service.get_session(validated_params.session_id)
+        except ValidationError as e:
+            return _invalid_input("Failed to get session info", e)
+        
+        try:
+            # Get session info and stats concurrently
+            session, stats = await asyncio.gather(
+                self.session_service.get_session(validated_params.session_id),
+                self.session_service.get_session_stats(validated_params.session_id)
+            )
             if not session:
                 return {
                     "success": False,
@@ -73,9 +95,6 @@ class SessionTools:
                     "message": f"Session {session_id} not found or expired"
                 }
             
-            # Get session stats
-            stats = await self.session_service.get_session_stats(validated_params.session_id)
-            
             return {
                 "success": True,
                 "session": session,
@@ -94,23 +113,38 @@ class SessionTools:
     async def list_user_sessions(
         self, 
         user_id: str, 
-        include_expired: bool = False
+        include_expired: bool = False,
+        cursor: Optional[str] = None,
+        limit: int = 50
     ) -> Dict[str, Any]:
-        """List all sessions for a user."""
+        """List a user's sessions one page at a time, newest first."""
+        # Validate input
         try:
-            # Validate input
             validated_params = validate_user_id({"user_id": user_id})
-            
-            # Get user sessions
-            sessions = await self.session_service.get_user_sessions(
+        except ValidationError as e:
+            return _invalid_input("Failed to list user sessions", e)
+        
+        if limit <= 0 or limit > 100:
+            return {
+                "success": False,
+                "error": "Limit must be between 1 and 100",
+                "message": "Failed to list user sessions: limit must be between 1 and 100"
+            }
+        
+        try:
+            # Get one page of user sessions
+            sessions, next_cursor = await self.session_service.get_user_sessions_page(
                 user_id=validated_params.user_id,
-                include_expired=include_expired
+                include_expired=include_expired,
+                cursor=cursor,
+                limit=limit
             )
             
             return {
                 "success": True,
                 "sessions": sessions,
                 "count": len(sessions),
+                "next_cursor": next_cursor,
                 "message": f"Found {len(sessions)} sessions for user {user_id}"
             }
             
@@ -124,10 +158,13 @@ class SessionTools:
     
     async def expire_session(self, session_id: str) -> Dict[str, Any]:
         """Manually expire a session."""
+        # Validate input
         try:
-            # Validate input
             validated_params = validate_session_id({"session_id": session_id})
-            
+        except ValidationError as e:
+            return _invalid_input("Failed to expire session", e)
+        
+        try:
             # Expire session
             success = await self.session_service.expire_session(validated_params.session_id)
             
@@ -153,10 +190,13 @@ class SessionTools:
     
     async def get_session_stats(self, session_id: str) -> Dict[str, Any]:
         """Get session statistics."""
+        # Validate input
         try:
-            # Validate input
             validated_params = validate_session_id({"session_id": session_id})
-            
+        except ValidationError as e:
+            return _invalid_input("Failed to get session stats", e)
+        
+        try:
             # Get session stats
             stats = await self.session_service.get_session_stats(validated_params.session_id)
             
@@ -5,5 +5,17 @@ This module contains utility functions and classes used across the application.
 """
 
 from .text_splitter import SimpleTextSplitter
+from .cache import LRUCache
+from .buffer_pool import BufferPool
+from .html_text import extract_html_text
+from .timestamps import now_iso
+from .event_loop import new_event_loop
 
-__all__ = ["SimpleTextSplitter"] 
\ No newline at end of file
+__all__ = [
+    "SimpleTextSplitter",
+    "LRUCache",
+    "BufferPool",
+    "extract_html_text",
+    "now_iso",
+    "new_event_loop"
+] 
\ No newline at end of file
@@ -0,0 +1,52 @@
+"""
+Reusable byte buffer pool.
+
+This module provides a small free list of fixed-size bytearray slabs so that
+streaming reads can reuse buffers instead of allocating a new one for every
+request. Bodies larger than a slab are expected to spill into a growing
+buffer owned by the caller.
+"""
+
+from typing import List
+
+
+class BufferPool:
+    """
+    A free list of fixed-size bytearrays with a cap on retained memory.
+
+    Buffers are created lazily on first use and kept for reuse once released,
+    as long as the pool holds at most ``max_bytes`` in total. Renting never
+    blocks: when every pooled buffer is in use a fresh one is allocated and
+    simply dropped on release once the pool is full.
+    """
+
+    def __init__(self, buffer_size: int, max_bytes: int):
+        """
+        Initialize the pool.
+
+        Args:
+            buffer_size: Size of every buffer in bytes
+            max_bytes: Maximum total size of released buffers kept for reuse
+        """
+        self.buffer_size = buffer_size
+        self.max_buffers = max(0, max_bytes // buffer_size)
+        self._free: List[bytearray] = []
+
+    def rent(self) -> bytearray:
+        """Take a buffer from the pool, allocating one if none is free."""
+        if self._free:
+            return self._free.pop()
+        return bytearray(self.buffer_size)
+
+    def release(self, buffer: bytearray) -> None:
+        """Return a rented buffer to the pool, dropping it if the pool is full."""
+        if len(self._free) < self.max_buffers and len(buffer) == self.buffer_size:
+            self._free.append(buffer)
+
+    @property
+    def retained_bytes(self) -> int:
+        """Total size of the buffers currently kept for reuse."""
+        return len(self._free) * self.buffer_size
+
+    def __len__(self) -> int:
+        return len(self._free)
@@ -0,0 +1,54 @@
+"""
+Event loop setup.
+
+This module creates event loops backed by uvloop when it is available,
+falling back to the default asyncio loop otherwise. Entry points pass
+``new_event_loop`` as the loop factory of an ``asyncio.Runner`` (or create
+their loop with it directly) instead of installing a global event loop
+policy, which ``uvloop.install()`` relies on and Python 3.12+ deprecates.
+"""
+
+import asyncio
+import logging
+import sys
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _uvloop_factory() -> Optional[Callable[[], asyncio.AbstractEventLoop]]:
+    """
+    Get uvloop's event loop constructor.
+
+    uvloop is optional and not supported on Windows.
+
+    Returns:
+        ``uvloop.new_event_loop``, or None if uvloop cannot be used
+    """
+    if sys.platform == "win32":
+        return None
+
+    try:
+        import uvloop
+    except ImportError:
+        return None
+
+    return uvloop.new_event_loop
+
+
+def new_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Create a new event loop, using uvloop when it is available.
+
+    Usable as ``asyncio.Runner(loop_factory=new_event_loop)``.
+
+    Returns:
+        A new uvloop loop, or a default asyncio loop without uvloop
+    """
+    factory = _uvloop_factory()
+    if factory is None:
+        logger.debug("uvloop not installed, using the default asyncio event loop")
+        return asyncio.new_event_loop()
+
+    logger.info("Using uvloop event loop")
+    return factory()
@@ -0,0 +1,32 @@
+"""
+HTML text extraction utilities.
+
+This module turns HTML markup into plain text, using selectolax's C parser
+when it is installed and a regex-based fallback otherwise.
+"""
+
+import re
+
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:  # selectolax is optional
+    HTMLParser = None
+
+# Patterns for the fallback extractor used without selectolax
+_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\s+')
+
+
+def extract_html_text(html: str) -> str:
+    """
+    Extract the visible text from an HTML document.
+
+    Args:
+        html: HTML markup
+
+    Returns:
+        Text content with whitespace collapsed
+    """
+    if HTMLParser is not None:
+        return HTMLParser(html).text(separator=' ', strip=True)
+    return _WS_RE.sub(' ', _TAG_RE.sub('', html)).strip()
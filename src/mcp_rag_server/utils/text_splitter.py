@@ -5,8 +5,17 @@ This module provides a lightweight text splitting functionality to replace
 the langchain dependency for document chunking.
 """
 
+import hashlib
+import logging
 import re
-from typing import List, Callable
+from typing import List, Callable, Iterable, Iterator, Tuple
+
+from .cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# Number of split documents remembered by each splitter
+CHUNK_CACHE_SIZE = 128
 
 
 class SimpleTextSplitter:
@@ -28,14 +37,33 @@ class SimpleTextSplitter:
         
         Args:
             chunk_size: Maximum size of each chunk
-            chunk_overlap: Number of characters to overlap between chunks
+            chunk_overlap: Number of characters to overlap between chunks (at
+                most half of chunk_size; larger values are clamped with a warning)
             separators: List of separators to use for splitting (in order of preference)
             length_function: Function to calculate text length (defaults to len)
         """
+        # An overlap close to chunk_size would advance each chunk by only a few
+        # characters and multiply the number of chunks to embed
+        max_overlap = chunk_size // 2
+        if chunk_overlap > max_overlap:
+            logger.warning(
+                f"chunk_overlap {chunk_overlap} exceeds half of chunk_size {chunk_size}, using {max_overlap}"
+            )
+            chunk_overlap = max_overlap
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
         self.separators = separators or ["\n\n", "\n", " ", ""]
         self.length_function = length_function or len
+        # With plain len the length of any span is just its offset difference
+        self._fast_len = self.length_function is len
+        # Compiled non-empty separators in order of preference; an empty
+        # separator means falling back to splitting by character count
+        self._separator_patterns = [
+            (separator, re.compile(re.escape(separator)))
+            for separator in self.separators if separator
+        ]
+        # Chunks of recently split documents, keyed by content hash and settings
+        self._chunk_cache = LRUCache(max_size=CHUNK_CACHE_SIZE)
     
     def split_text(self, text: str) -> List[str]:
         """
@@ -47,69 +75,137 @@ class SimpleTextSplitter:
         Returns:
             List of text chunks
         """
+        return list(self.iter_split_text(text))
+    
+    def iter_split_text(self, text: str) -> Iterator[str]:
+        """
+        Split text into chunks lazily.
+        
+        Yields the same chunks as split_text, each as soon as it is complete,
+        so callers can consume the first chunks before the rest are built.
+        
+        Args:
+            text: The text to split
+            
+        Yields:
+            Text chunks, in order
+        """
         if not text:
-            return []
+            return
+        
+        length_function = self.length_function
+        fast_len = self._fast_len
+        chunk_size = self.chunk_size
+        chunk_overlap = self.chunk_overlap
+        text_length = len(text)
         
         # If text is already smaller than chunk size, return it as is
-        if self.length_function(text) <= self.chunk_size:
-            return [text]
+        if (text_length if fast_len else length_function(text)) <= chunk_size:
+            yield text
+            return
         
-        chunks = []
-        current_chunk = ""
+        # Split by the first separator that appears in the text
+        pattern = next(
+            (pattern for separator, pattern in self._separator_patterns if separator in text),
+            None
+        )
         
-        # Split by the first separator that works
-        for separator in self.separators:
-            if separator in text:
-                # Split the text by this separator
-                parts = text.split(separator)
-                
-                for part in parts:
-                    part_with_sep = part + separator if separator else part
-                    
-                    # If adding this part would exceed chunk size
-                    if (self.length_function(current_chunk) + 
-                        self.length_function(part_with_sep)) > self.chunk_size:
-                        
-                        # If we have a current chunk, add it to chunks
-                        if current_chunk:
-                            chunks.append(current_chunk.strip())
-                            
-                            # Start new chunk with overlap
-                            if self.chunk_overlap > 0 and chunks:
-                                # Get the end of the previous chunk for overlap
-                                overlap_text = chunks[-1][-self.chunk_overlap:]
-                                current_chunk = overlap_text + part_with_sep
-                            else:
-                                current_chunk = part_with_sep
-                        else:
-                            # If no current chunk, start with this part
-                            current_chunk = part_with_sep
-                    else:
-                        # Add to current chunk
-                        current_chunk += part_with_sep
-                
-                # Add the last chunk if it exists
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
+        if pattern is None:
+            # If no separator worked, split by character count (every window fits chunk size)
+            yield from self._split_by_char_count(text)
+            return
+        
+        # Chunks are tracked as offsets into the text, with whether their packed
+        # length exceeds chunk size, and sliced out once complete
+        chunk_start = 0
+        current_length = 0
+        
+        for start, end in self._split_spans(text, pattern):
+            part_length = end - start if fast_len else length_function(text[start:end])
+            
+            # If adding this part to a non-empty chunk would exceed chunk size
+            if current_length + part_length > chunk_size and start > chunk_start:
+                chunk_start, chunk_end = self._strip_span(text, chunk_start, start)
+                yield from self._finish_chunk(text, chunk_start, chunk_end, current_length > chunk_size)
                 
-                break
-        else:
-            # If no separator worked, split by character count
-            chunks = self._split_by_char_count(text)
-        
-        # Filter out empty chunks and ensure no chunk exceeds max size
-        final_chunks = []
-        for chunk in chunks:
-            chunk = chunk.strip()
-            if chunk:
-                # If chunk is still too large, split it further
-                if self.length_function(chunk) > self.chunk_size:
-                    sub_chunks = self._split_by_char_count(chunk)
-                    final_chunks.extend(sub_chunks)
+                # Start new chunk with overlap from the end of the previous one
+                if chunk_overlap > 0:
+                    chunk_start = max(chunk_end - chunk_overlap, chunk_start)
+                    overlap_length = start - chunk_start if fast_len else length_function(text[chunk_start:start])
+                    current_length = overlap_length + part_length
                 else:
-                    final_chunks.append(chunk)
+                    chunk_start = start
+                    current_length = part_length
+            else:
+                # Add to current chunk
+                current_length += part_length
+        
+        # Add the last chunk if it exists
+        chunk_start, chunk_end = self._strip_span(text, chunk_start, text_length)
+        yield from self._finish_chunk(text, chunk_start, chunk_end, current_length > chunk_size)
+    
+    def _finish_chunk(self, text: str, start: int, end: int, oversized: bool) -> List[str]:
+        """
+        Slice a completed chunk out of the text.
+        
+        Empty chunks are dropped; only chunks packed past chunk size (an
+        oversized part) need measuring again and splitting further.
+        
+        Args:
+            text: The text the chunk points into
+            start: Chunk start offset
+            end: Chunk end offset
+            oversized: Whether the packed length of the chunk exceeds chunk size
+            
+        Returns:
+            The chunk, split by character count if it is still too long
+        """
+        if start == end:
+            return []
+        chunk = text[start:end]
+        if oversized and (end - start if self._fast_len else self.length_function(chunk)) > self.chunk_size:
+            return self._split_by_char_count(chunk)
+        return [chunk]
+    
+    @staticmethod
+    def _split_spans(text: str, pattern: "re.Pattern[str]") -> Iterator[Tuple[int, int]]:
+        """
+        Find the parts of text between separators.
+        
+        Args:
+            text: The text to split
+            pattern: Compiled separator to split on
+            
+        Yields:
+            (start, end) offsets, each part including its trailing separator
+        """
+        start = 0
+        
+        for match in pattern.finditer(text):
+            yield start, match.end()
+            start = match.end()
+        
+        if start < len(text):
+            yield start, len(text)
+    
+    @staticmethod
+    def _strip_span(text: str, start: int, end: int) -> Tuple[int, int]:
+        """
+        Narrow a span of text to exclude leading and trailing whitespace.
         
-        return final_chunks
+        Args:
+            text: The text the span points into
+            start: Span start offset
+            end: Span end offset
+            
+        Returns:
+            The (start, end) offsets of the stripped span
+        """
+        while start < end and text[start].isspace():
+            start += 1
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        return start, end
     
     def _split_by_char_count(self, text: str) -> List[str]:
         """
@@ -121,31 +217,19 @@ class SimpleTextSplitter:
         Returns:
             List of text chunks
         """
-        chunks = []
-        start = 0
+        chunk_size = self.chunk_size
         
-        while start < len(text):
-            end = start + self.chunk_size
-            
-            # If this is not the first chunk and we have overlap
-            if start > 0 and self.chunk_overlap > 0:
-                start = start - self.chunk_overlap
-            
-            # Ensure we don't go beyond text length
-            if end > len(text):
-                end = len(text)
-            
-            chunk = text[start:end].strip()
-            if chunk:
-                chunks.append(chunk)
-            
-            start = end
-            
-            # If we're at the end, break
-            if start >= len(text):
-                break
+        # Consecutive windows share chunk_overlap characters but never exceed chunk_size
+        step = chunk_size - self.chunk_overlap if self.chunk_overlap > 0 else chunk_size
         
-        return chunks
+        # The last window is the first one that reaches the end of the text
+        last_start = max(0, -(-(len(text) - chunk_size) // step)) * step
+        
+        return [
+            chunk
+            for start in range(0, last_start + 1, step)
+            if (chunk := text[start:start + chunk_size].strip())
+        ]
     
     def split_documents(self, documents: List[dict]) -> List[dict]:
         """
@@ -157,27 +241,57 @@ class SimpleTextSplitter:
         Returns:
             List of document chunks
         """
-        all_chunks = []
+        return list(self.iter_split_documents(documents))
+    
+    def iter_split_documents(self, documents: Iterable[dict]) -> Iterator[dict]:
+        """
+        Split documents into chunks lazily, one document at a time.
+        
+        Unlike split_documents, only the chunks of the current document are
+        held in memory, so callers can process the first chunks before the
+        rest of the documents are split.
         
+        Args:
+            documents: Documents with 'content' and optional 'metadata' keys
+            
+        Yields:
+            Document chunks, in order
+        """
         for doc in documents:
             content = doc.get('content', '')
-            metadata = doc.get('metadata', {})
-            
             if not content:
                 continue
             
-            # Split the content
-            text_chunks = self.split_text(content)
+            cache_key = self._cache_key(content)
+            text_chunks = self._chunk_cache.get(cache_key)
+            if text_chunks is None:
+                text_chunks = self.split_text(content)
+                self._chunk_cache.set(cache_key, text_chunks)
             
-            # Create chunk documents
-            for i, chunk in enumerate(text_chunks):
-                chunk_metadata = metadata.copy()
-                chunk_metadata['chunk_index'] = i
-                chunk_metadata['total_chunks'] = len(text_chunks)
-                
-                all_chunks.append({
-                    'content': chunk,
-                    'metadata': chunk_metadata
-                })
+            yield from self._chunk_documents(doc, text_chunks)
+    
+    @staticmethod
+    def _chunk_documents(doc: dict, text_chunks: List[str]) -> Iterator[dict]:
+        """
+        Build the chunk documents of one split document.
+        
+        Each chunk gets its own plain dict of metadata (JSON-serializable, and
+        safe to modify without touching the document's metadata).
+        """
+        metadata = doc.get('metadata', {})
+        total_chunks = len(text_chunks)
         
-        return all_chunks 
\ No newline at end of file
+        for i, chunk in enumerate(text_chunks):
+            yield {
+                'content': chunk,
+                'metadata': {**metadata, 'chunk_index': i, 'total_chunks': total_chunks}
+            }
+    
+    def _cache_key(self, content: str) -> Tuple:
+        """Chunk cache key of content split with the current settings."""
+        return (
+            hashlib.sha256(content.encode("utf-8")).digest(),
+            self.chunk_size,
+            self.chunk_overlap,
+            tuple(self.separators)
+        )
@@ -0,0 +1,25 @@
+"""
+Timestamp helpers.
+
+This module provides a cheap ISO-8601 timestamp for metadata fields that are
+written on every request and only need second precision.
+"""
+
+import time
+from datetime import datetime
+from typing import Tuple
+
+_cached_second: Tuple[int, str] = (-1, "")
+
+
+def now_iso() -> str:
+    """
+    Get the current local time as an ISO-8601 string with second precision.
+
+    The formatted string is cached and only rebuilt when the second changes.
+    """
+    global _cached_second
+    second = int(time.time())
+    if second != _cached_second[0]:
+        _cached_second = (second, datetime.fromtimestamp(second).isoformat())
+    return _cached_second[1]
@@ -5,147 +5,185 @@ This module contains Pydantic schemas for request/response validation
 and data structure definitions.
 """
 
-from typing import Optional, Dict, Any, List
-from pydantic import BaseModel, Field, validator
-from datetime import datetime
+from typing import Optional, Dict, Any, List, Literal, Annotated
+from pydantic import BaseModel, ConfigDict, Field, InstanceOf, StringConstraints
+# Raised by the validate_* helpers with pydantic's structured error details;
+# re-exported so callers can catch it from this module
+from pydantic import ValidationError
 
 from .config import config
+from .utils.timestamps import now_iso
+
+# Constrained string types shared by the request schemas
+UserId = Annotated[str, StringConstraints(min_length=1, max_length=100)]
+SessionId = Annotated[str, StringConstraints(min_length=1, max_length=100)]
+Query = Annotated[str, StringConstraints(min_length=1, max_length=1000)]
+# Metadata is forwarded as is, so it is only checked to be a dict rather
+# than copied and validated key by key
+Metadata = InstanceOf[dict]
+
+# Allowed values of enum-like request fields; pydantic-core checks Literal
+# values with a hashed lookup instead of Python-level membership tests
+TimeRange = Literal["hour", "day", "week", "month", "all"]
+InsightType = Literal["comprehensive", "engagement", "topics", "sessions"]
+SearchStrategy = Literal["hierarchical", "semantic", "hybrid", "fuzzy"]
+SummaryType = Literal["key_points", "narrative", "structured"]
+ClusterType = Literal["topic", "temporal", "semantic"]
+
+class SearchOptions(BaseModel):
+    """Schema for advanced memory search options."""
+    
+    limit: int = Field(default=5, ge=1, le=100, description="Maximum number of results")
+    memory_type: Optional[str] = Field(default=None, min_length=1, max_length=50, description="Filter by memory type")
+    time_range: Optional[TimeRange] = Field(default=None, description="Filter by time range")
+    session_id: Optional[str] = Field(default=None, max_length=100, description="Filter by session")
+    min_confidence: float = Field(default=0.1, ge=0.0, le=1.0, description="Minimum confidence threshold")
+    search_strategy: SearchStrategy = Field(default="hierarchical", description="Search strategy")
+    include_metadata: bool = Field(default=True, description="Include metadata in results")
+    
+    model_config = ConfigDict(extra="ignore", str_strip_whitespace=True, frozen=True)
+
+
+class ContextOptions(BaseModel):
+    """Schema for enhanced memory context options."""
+    
+    limit: int = Field(default=10, ge=1, le=100, description="Maximum number of memories to consider")
+    summary_type: SummaryType = Field(default="key_points", description="Type of summary")
+    include_relevance: bool = Field(default=True, description="Include relevance scores")
+    group_by_topic: bool = Field(default=True, description="Group related memories")
+    min_confidence: float = Field(default=0.1, ge=0.0, le=1.0, description="Minimum confidence threshold")
+    attach_memories: bool = Field(default=False, description="Include the top memories in the response")
+    project_fields: Optional[List[str]] = Field(default=None, description="Only include these fields of attached memories")
+    
+    model_config = ConfigDict(extra="ignore", str_strip_whitespace=True, frozen=True)
+
+
+class ClusterOptions(BaseModel):
+    """Schema for memory clustering options."""
+    
+    cluster_type: ClusterType = Field(default="topic", description="Clustering method")
+    max_clusters: int = Field(default=5, ge=1, le=50, description="Maximum number of clusters")
+    similarity_threshold: float = Field(default=0.7, ge=0.0, le=1.0, description="Minimum similarity for clustering")
+    
+    model_config = ConfigDict(extra="ignore", str_strip_whitespace=True, frozen=True)
 
 
 class DocumentRequest(BaseModel):
     """Schema for document addition requests."""
     
     content: str = Field(..., min_length=1, max_length=100000, description="Document content")
-    metadata: Optional[Dict[str, Any]] = Field(default=None, description="Document metadata")
-    user_id: str = Field(default=config.mem0.default_user_id, min_length=1, max_length=100, description="User ID for document ownership")
+    metadata: Optional[Metadata] = Field(default=None, description="Document metadata")
+    user_id: UserId = Field(default=config.mem0.default_user_id, description="User ID for document ownership")
     
-    class Config:
-        extra = "ignore"
+    model_config = ConfigDict(extra="ignore", str_strip_whitespace=True, frozen=True)
 
 
 class SearchRequest(BaseModel):
     """Schema for search requests."""
     
-    query: str = Field(..., min_length=1, max_length=1000, description="Search query")
+    query: Query = Field(..., description="Search query")
     limit: int = Field(default=5, ge=1, le=100, description="Maximum number of results")
     user_id: Optional[str] = Field(default=None, max_length=100, description="User ID for filtering results")
     filters: Optional[Dict[str, Any]] = Field(default=None, description="Additional search filters")
     
-    class Config:
-        extra = "ignore"
+    model_config = ConfigDict(extra="ignore", str_strip_whitespace=True, frozen=True)
 
 
 class MemoryRequest(BaseModel):
     """Schema for memory management requests."""
     
     content: str = Field(..., min_length=1, max_length=10000, description="Memory content")
-    memory_type: str = Field(default="conversation", description="Type of memory")
-    metadata: Optional[Dict[str, Any]] = Field(default=None, description="Memory metadata")
-    user_id: str = Field(default=config.mem0.default_user_id, min_length=1, max_length=100, description="User ID for memory ownership")
+    memory_type: str = Field(default="conversation", min_length=1, max_length=50, description="Type of memory")
+    metadata: Optional[Metadata] = Field(default=None, description="Memory metadata")
+    user_id: UserId = Field(default=config.mem0.default_user_id, description="User ID for memory ownership")
     session_id: Optional[str] = Field(default=None, max_length=100, description="Session ID for memory association")
     
-    class Config:
-        extra = "ignore"
+    model_config = ConfigDict(extra="ignore", str_strip_whitespace=True, frozen=True)
 
 
 class SessionCreationRequest(BaseModel):
     """Schema for session creation requests."""
     
-    user_id: str = Field(..., min_length=1, max_length=100, description="User ID for session")
+    user_id: UserId = Field(..., description="User ID for session")
     session_name: Optional[str] = Field(default=None, max_length=200, description="Optional session name")
-    metadata: Optional[Dict[str, Any]] = Field(default=None, description="Session metadata")
+    metadata: Optional[Metadata] = Field(default=None, description="Session metadata")
     
-    class Config:
-        extra = "ignore"
+    model_config = ConfigDict(extra="ignore", str_strip_whitespace=True, frozen=True)
 
 
 class SessionIdRequest(BaseModel):
     """Schema for session ID validation."""
     
-    session_id: str = Field(..., min_length=1, max_length=100, description="Session ID")
+    session_id: SessionId = Field(..., description="Session ID")
     
-    class Config:
-        extra = "ignore"
+    model_config = ConfigDict(extra="ignore", str_strip_whitespace=True, frozen=True)
 
 
 class UserIdRequest(BaseModel):
     """Schema for user ID validation."""
     
-    user_id: str = Field(..., min_length=1, max_length=100, description="User ID")
+    user_id: UserId = Field(..., description="User ID")
     
-    class Config:
-        extra = "ignore"
+    model_config = ConfigDict(extra="ignore", str_strip_whitespace=True, frozen=True)
 
 
 class QuestionRequest(BaseModel):
     """Schema for question asking requests."""
     
     question: str = Field(..., min_length=1, max_length=5000, description="Question to ask")
-    user_id: str = Field(default=config.mem0.default_user_id, min_length=1, max_length=100, description="User ID")
+    user_id: UserId = Field(default=config.mem0.default_user_id, description="User ID")
     session_id: Optional[str] = Field(default=None, max_length=100, description="Session ID")
     use_memory: bool = Field(default=True, description="Whether to use memory context")
     max_context_docs: int = Field(default=3, ge=1, le=20, description="Maximum context documents")
     
-    class Config:
-        extra = "ignore"
+    model_config = ConfigDict(extra="ignore", str_strip_whitespace=True, frozen=True)
 
 
 class AdvancedSearchRequest(BaseModel):
     """Schema for advanced search requests."""
     
-    query: str = Field(..., min_length=1, max_length=1000, description="Search query")
-    search_options: Optional[Dict[str, Any]] = Field(default=None, description="Advanced search options")
-    user_id: str = Field(default=config.mem0.default_user_id, min_length=1, max_length=100, description="User ID")
+    query: Query = Field(..., description="Search query")
+    search_options: Optional[SearchOptions] = Field(default=None, description="Advanced search options")
+    user_id: UserId = Field(default=config.mem0.default_user_id, description="User ID")
     
-    class Config:
-        extra = "ignore"
+    model_config = ConfigDict(extra="ignore", str_strip_whitespace=True, frozen=True)
 
 
 class EnhancedContextRequest(BaseModel):
     """Schema for enhanced context requests."""
     
-    query: str = Field(..., min_length=1, max_length=1000, description="Query for context")
-    context_options: Optional[Dict[str, Any]] = Field(default=None, description="Context options")
-    user_id: str = Field(default=config.mem0.default_user_id, min_length=1, max_length=100, description="User ID")
+    query: Query = Field(..., description="Query for context")
+    context_options: Optional[ContextOptions] = Field(default=None, description="Context options")
+    user_id: UserId = Field(default=config.mem0.default_user_id, description="User ID")
     
-    class Config:
-        extra = "ignore"
+    model_config = ConfigDict(extra="ignore", str_strip_whitespace=True, frozen=True)
 
 
 class MemoryPatternAnalysisRequest(BaseModel):
     """Schema for memory pattern analysis requests."""
     
-    user_id: str = Field(..., min_length=1, max_length=100, description="User ID")
-    time_range: Optional[str] = Field(default=None, max_length=100, description="Time range for analysis")
+    user_id: UserId = Field(..., description="User ID")
+    time_range: Optional[TimeRange] = Field(default=None, description="Time range for analysis")
     
-    class Config:
-        extra = "ignore"
+    model_config = ConfigDict(extra="ignore", str_strip_whitespace=True, frozen=True)
 
 
 class MemoryClusteringRequest(BaseModel):
     """Schema for memory clustering requests."""
     
-    user_id: str = Field(..., min_length=1, max_length=100, description="User ID")
-    cluster_options: Optional[Dict[str, Any]] = Field(default=None, description="Clustering options")
+    user_id: UserId = Field(..., description="User ID")
+    cluster_options: Optional[ClusterOptions] = Field(default=None, description="Clustering options")
     
-    class Config:
-        extra = "ignore"
+    model_config = ConfigDict(extra="ignore", str_strip_whitespace=True, frozen=True)
 
 
 class MemoryInsightsRequest(BaseModel):
     """Schema for memory insights requests."""
     
-    user_id: str = Field(..., min_length=1, max_length=100, description="User ID")
-    insight_type: str = Field(default="comprehensive", description="Type of insights to generate")
+    user_id: UserId = Field(..., description="User ID")
+    insight_type: InsightType = Field(default="comprehensive", description="Type of insights to generate")
     
-    class Config:
-        extra = "ignore"
-
-
-# Custom exception for validation errors
-class ValidationError(Exception):
-    """Custom validation error."""
-    pass
+    model_config = ConfigDict(extra="ignore", str_strip_whitespace=True, frozen=True)
 
 
 # Response helper functions
@@ -155,7 +193,7 @@ def create_success_response(data: Any, operation: str) -> Dict[str, Any]:
         "success": True,
         "data": data,
         "operation": operation,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": now_iso()
     }
 
 
@@ -166,66 +204,66 @@ def create_error_response(error: Exception, operation: str) -> Dict[str, Any]:
         "error": str(error),
         "error_type": type(error).__name__,
         "operation": operation,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": now_iso()
     }
 
 
 # Validation functions
 def validate_document_input(data: Dict[str, Any]) -> DocumentRequest:
     """Validate document input data."""
-    return DocumentRequest(**data)
+    return DocumentRequest.model_validate(data)
 
 
 def validate_search_input(data: Dict[str, Any]) -> SearchRequest:
     """Validate search input data."""
-    return SearchRequest(**data)
+    return SearchRequest.model_validate(data)
 
 
 def validate_question_input(data: Dict[str, Any]) -> QuestionRequest:
     """Validate question input data."""
-    return QuestionRequest(**data)
+    return QuestionRequest.model_validate(data)
 
 
 def validate_memory_input(data: Dict[str, Any]) -> MemoryRequest:
     """Validate memory input data."""
-    return MemoryRequest(**data)
+    return MemoryRequest.model_validate(data)
 
 
 def validate_session_creation(data: Dict[str, Any]) -> SessionCreationRequest:
     """Validate session creation data."""
-    return SessionCreationRequest(**data)
+    return SessionCreationRequest.model_validate(data)
 
 
 def validate_session_id(data: Dict[str, Any]) -> SessionIdRequest:
     """Validate session ID data."""
-    return SessionIdRequest(**data)
+    return SessionIdRequest.model_validate(data)
 
 
 def validate_user_id(data: Dict[str, Any]) -> UserIdRequest:
     """Validate user ID data."""
-    return UserIdRequest(**data)
+    return UserIdRequest.model_validate(data)
 
 
 def validate_advanced_search_input(data: Dict[str, Any]) -> AdvancedSearchRequest:
     """Validate advanced search input data."""
-    return AdvancedSearchRequest(**data)
+    return AdvancedSearchRequest.model_validate(data)
 
 
 def validate_enhanced_context_input(data: Dict[str, Any]) -> EnhancedContextRequest:
     """Validate enhanced context input data."""
-    return EnhancedContextRequest(**data)
+    return EnhancedContextRequest.model_validate(data)
 
 
 def validate_memory_pattern_analysis_input(data: Dict[str, Any]) -> MemoryPatternAnalysisRequest:
     """Validate memory pattern analysis input data."""
-    return MemoryPatternAnalysisRequest(**data)
+    return MemoryPatternAnalysisRequest.model_validate(data)
 
 
 def validate_memory_clustering_input(data: Dict[str, Any]) -> MemoryClusteringRequest:
     """Validate memory clustering input data."""
-    return MemoryClusteringRequest(**data)
+    return MemoryClusteringRequest.model_validate(data)
 
 
 def validate_memory_insights_input(data: Dict[str, Any]) -> MemoryInsightsRequest:
     """Validate memory insights input data."""
-    return MemoryInsightsRequest(**data) 
\ No newline at end of file
+    return MemoryInsightsRequest.model_validate(data) 
\ No newline at end of file
@@ -4,62 +4,64 @@ STDIO server script to run the MCP RAG Server.
 """
 
 import sys
-import os
 import signal
 import asyncio
 import logging
 
-# Add the src directory to the path
-# When run_server.py is in /app/, src is in /app/src/
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
-
 from mcp_rag_server.server import MCPRAGServer
-from mcp_rag_server.config import config
+from mcp_rag_server.utils.event_loop import new_event_loop
 
-# Configure logging
-logging.basicConfig(
-    level=getattr(logging, config.server.log_level.upper()),
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
+# Logging is configured by mcp_rag_server.server when it is imported
 logger = logging.getLogger(__name__)
 
-# Global variable to track server instance
-server_instance = None
+def _install_signal_handlers(loop: asyncio.AbstractEventLoop, serve_task: asyncio.Task) -> None:
+    """Stop serving on SIGINT/SIGTERM so cleanup runs on the server's own loop."""
+    def shutdown(signum):
+        logger.info(f"Received signal {signum}, shutting down gracefully...")
+        serve_task.cancel()
+    
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, shutdown, signum)
+        except NotImplementedError:
+            # Event loops on Windows do not support add_signal_handler
+            signal.signal(signum, lambda sig, frame: loop.call_soon_threadsafe(shutdown, sig))
 
-def signal_handler(signum, frame):
-    """Handle shutdown signals gracefully."""
-    logger.info(f"Received signal {signum}, shutting down gracefully...")
-    if server_instance:
-        asyncio.create_task(server_instance.cleanup())
-    sys.exit(0)
+async def serve(server: MCPRAGServer):
+    """Serve requests over STDIO; services are initialized by the first tool call that needs them."""
+    logger.info("Starting MCP RAG Server on STDIO...")
+    await server.mcp.run_stdio_async()
 
 def main():
     """Main entry point for the MCP RAG Server."""
-    global server_instance
-    
-    # Set up signal handlers for graceful shutdown
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
+    # Services are initialized, used and cleaned up on this one loop, a
+    # uvloop loop when available for a faster STDIO transport and tool calls
+    loop = new_event_loop()
+    asyncio.set_event_loop(loop)
+    server = None
+    exit_code = 0
     
     try:
         server = MCPRAGServer()
-        server_instance = server
+        serve_task = loop.create_task(serve(server))
         
-        # Initialize services
-        asyncio.run(server.initialize())
+        # Set up signal handlers for graceful shutdown
+        _install_signal_handlers(loop, serve_task)
         
-        # Run the server using stdio transport
-        logger.info("Starting MCP RAG Server on STDIO...")
-        server.mcp.run(transport="stdio")
+        loop.run_until_complete(serve_task)
         
-    except KeyboardInterrupt:
-        logger.info("Received keyboard interrupt, shutting down...")
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        logger.info("Shutting down...")
     except Exception as e:
         logger.error(f"Error running server: {e}")
-        sys.exit(1)
+        exit_code = 1
     finally:
-        if server_instance:
-            asyncio.run(server_instance.cleanup())
+        if server:
+            loop.run_until_complete(server.cleanup())
+        loop.close()
+    
+    if exit_code:
+        sys.exit(exit_code)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
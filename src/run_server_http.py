@@ -4,22 +4,14 @@ HTTP server script to run the MCP RAG Server.
 """
 
 import sys
-import os
 import signal
 import asyncio
 import logging
 
-# Add the src directory to the path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
-
 from mcp_rag_server.server import MCPRAGServer
-from mcp_rag_server.config import config
+from mcp_rag_server.utils.event_loop import new_event_loop
 
-# Configure logging
-logging.basicConfig(
-    level=getattr(logging, config.server.log_level.upper()),
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
+# Logging is configured by mcp_rag_server.server when it is imported
 logger = logging.getLogger(__name__)
 
 # Global variable to track server instance
@@ -40,16 +32,20 @@ def main():
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
     
+    # One loop for initialization, serving and cleanup, a uvloop loop when
+    # available for a faster HTTP transport and outbound HTTP fan-out
+    runner = asyncio.Runner(loop_factory=new_event_loop)
+    
     try:
         server = MCPRAGServer()
         server_instance = server
         
         # Initialize services
-        asyncio.run(server.initialize())
+        runner.run(server.initialize())
         
         # Run the server using HTTP transport
         logger.info("Starting MCP RAG Server on HTTP...")
-        server.mcp.run(transport="streamable-http")
+        runner.run(server.mcp.run_streamable_http_async())
         
     except KeyboardInterrupt:
         logger.info("Received keyboard interrupt, shutting down...")
@@ -58,7 +54,8 @@ def main():
         sys.exit(1)
     finally:
         if server_instance:
-            asyncio.run(server_instance.cleanup())
+            runner.run(server_instance.cleanup())
+        runner.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -7,16 +7,23 @@ AI services and expose their functionality as MCP tools.
 
 import pytest
 import asyncio
-from unittest.mock import AsyncMock, MagicMock
 from src.mcp_rag_server.tools.ai_tools import AdvancedAITools
 from src.mcp_rag_server.services.reasoning_service import AdvancedReasoningEngine, ReasoningConfig
 from src.mcp_rag_server.services.context_service import EnhancedContextService, ContextConfig
 
 
+async def _prime_history(ai_tools):
+    """Run one reasoning and one context analysis so both histories have entries."""
+    await asyncio.gather(
+        ai_tools.advanced_reasoning("Test query", {"test": "context"}),
+        ai_tools.analyze_context("Test query", {"test": "context"})
+    )
+
+
 class TestAdvancedAIToolsIntegration:
     """Test AdvancedAITools integration with underlying AI services."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def reasoning_config(self):
         """Create reasoning configuration for testing."""
         return ReasoningConfig(
@@ -26,7 +33,7 @@ class TestAdvancedAIToolsIntegration:
             enable_planning=True
         )
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def context_config(self):
         """Create context configuration for testing."""
         return ContextConfig(
@@ -38,21 +45,26 @@ class TestAdvancedAIToolsIntegration:
             context_timeout=30
         )
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def reasoning_engine(self, reasoning_config):
         """Create reasoning engine for testing."""
         return AdvancedReasoningEngine(reasoning_config)
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def context_service(self, context_config):
         """Create context service for testing."""
         return EnhancedContextService(context_config)
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def ai_tools(self, reasoning_engine, context_service):
         """Create AdvancedAITools instance for testing."""
         return AdvancedAITools(reasoning_engine, context_service)
 
+    @pytest.fixture(autouse=True)
+    async def clear_history(self, ai_tools):
+        """Start each test with empty reasoning and context history."""
+        await ai_tools.clear_ai_history()
+
     @pytest.mark.asyncio
     async def test_advanced_reasoning_tool(self, ai_tools):
         """Test advanced reasoning tool integration."""
@@ -238,8 +250,7 @@ class TestAdvancedAIToolsIntegration:
     async def test_clear_ai_history_tool(self, ai_tools):
         """Test AI history clearing tool integration."""
         # First, perform some operations to generate history
-        await ai_tools.advanced_reasoning("Test query", {"test": "context"})
-        await ai_tools.analyze_context("Test query", {"test": "context"})
+        await _prime_history(ai_tools)
         
         # Clear history
         result = await ai_tools.clear_ai_history()
@@ -289,10 +300,12 @@ class TestAdvancedAIToolsIntegration:
             ("advanced_query_understanding", "Test query", {"test": "context"})
         ]
 
-        for tool_name, query, context in tools_to_test:
-            tool_method = getattr(ai_tools, tool_name)
-            result = await tool_method(query, context)
-            
+        results = await asyncio.gather(*(
+            getattr(ai_tools, tool_name)(query, context)
+            for tool_name, query, context in tools_to_test
+        ))
+        
+        for result in results:
             # All tools should return a dict with at least success and some data
             assert isinstance(result, dict)
             assert "success" in result
@@ -443,6 +443,34 @@ class TestFunctionInfo:
         assert func_info.is_async is False
         assert func_info.is_method is False
 
+    def test_function_info_docstring_summary(self):
+        """Test FunctionInfo precomputes a truncated docstring summary."""
+        func_info = FunctionInfo(
+            name="documented",
+            args=[],
+            lineno=1,
+            complexity=1,
+            docstring="x" * 150,
+            return_type=None,
+            decorators=[],
+            is_async=False,
+            is_method=False
+        )
+        undocumented = FunctionInfo(
+            name="undocumented",
+            args=[],
+            lineno=2,
+            complexity=1,
+            docstring=None,
+            return_type=None,
+            decorators=[],
+            is_async=False,
+            is_method=False
+        )
+        
+        assert func_info.docstring_summary == "x" * 100 + "..."
+        assert undocumented.docstring_summary == ""
+
 
 class TestClassInfo:
     """Test the ClassInfo dataclass."""
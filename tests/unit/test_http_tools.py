@@ -4,10 +4,13 @@ Unit tests for HTTP Integration tools.
 
 import pytest
 import asyncio
+import httpx
 from unittest.mock import Mock, AsyncMock, patch
 from typing import Dict, Any
 
 from src.mcp_rag_server.tools.http_tools import HTTPIntegrationTools
+from src.mcp_rag_server.utils.buffer_pool import BufferPool
+from src.mcp_rag_server.utils.html_text import extract_html_text
 
 
 class TestHTTPIntegrationTools:
@@ -18,8 +21,16 @@ class TestHTTPIntegrationTools:
         """Mock RAG service."""
         service = Mock()
         service.add_document = AsyncMock(return_value={
-            "document_id": "test_doc_123",
-            "chunks_created": 3
+            "id": "test_doc_123",
+            "chunks": 3
+        })
+        service.submit_document = AsyncMock(side_effect=[
+            {"id": "test_doc_1", "chunks": 2},
+            {"id": "test_doc_2", "chunks": 1}
+        ])
+        service.add_document_stream = AsyncMock(return_value={
+            "id": "test_doc_stream",
+            "chunks": 4
         })
         return service
     
@@ -27,7 +38,7 @@ class TestHTTPIntegrationTools:
     def mock_document_processor(self):
         """Mock document processor."""
         processor = Mock()
-        processor.process_content = AsyncMock(return_value="processed content")
+        processor.process_content_bytes = AsyncMock(return_value="processed content")
         return processor
     
     @pytest.fixture
@@ -35,27 +46,98 @@ class TestHTTPIntegrationTools:
         """HTTP tools instance with mocked dependencies."""
         return HTTPIntegrationTools(mock_rag_service, mock_document_processor)
     
+    @staticmethod
+    def _mock_transport(http_tools, handler):
+        """Route the tools' HTTP client through an in-memory transport."""
+        http_tools.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    
     @pytest.mark.asyncio
     async def test_fetch_web_content_success(self, http_tools):
         """Test successful web content fetching."""
-        with patch('httpx.AsyncClient.get') as mock_get:
-            # Mock successful response
-            mock_response = Mock()
-            mock_response.text = "<html><body>Test content</body></html>"
-            mock_response.headers = {"content-type": "text/html"}
-            mock_response.raise_for_status = Mock()
-            mock_get.return_value = mock_response
-            
+        self._mock_transport(http_tools, lambda request: httpx.Response(
+            200,
+            text="<html><body>Test content</body></html>",
+            headers={"content-type": "text/html"}
+        ))
+        
+        result = await http_tools.fetch_web_content(
+            "https://example.com",
+            user_id="test_user",
+            auto_add_to_rag=True
+        )
+        
+        assert result["success"] is True
+        assert result["url"] == "https://example.com"
+        assert result["content_length"] > 0
+        assert result["truncated"] is False
+        assert result["rag_integration"]["added_to_rag"] is True
+        assert result["rag_integration"]["document_id"] == "test_doc_123"
+        http_tools.document_processor.process_content_bytes.assert_called_once_with(
+            b"<html><body>Test content</body></html>", "text/html", None
+        )
+        # The read buffer went back to the pool for reuse
+        assert len(http_tools._buffer_pool) == 1
+    
+    @pytest.mark.asyncio
+    async def test_fetch_web_content_truncates_large_body(self, http_tools):
+        """Test that bodies over the size cap are truncated."""
+        self._mock_transport(http_tools, lambda request: httpx.Response(
+            200,
+            content=b"x" * 64,
+            headers={"content-type": "text/plain"}
+        ))
+        
+        with patch('src.mcp_rag_server.tools.http_tools.MAX_CONTENT_BYTES', 16):
+            result = await http_tools.fetch_web_content(
+                "https://example.com/large",
+                user_id="test_user",
+                auto_add_to_rag=False
+            )
+        
+        assert result["success"] is True
+        assert result["content_length"] == 16
+        assert result["truncated"] is True
+        assert result["metadata"]["truncated"] is True
+    
+    @pytest.mark.asyncio
+    async def test_fetch_web_content_spills_past_pooled_buffer(self, http_tools):
+        """Test that bodies larger than a pooled buffer are read in full."""
+        body = bytes(range(64))
+        self._mock_transport(http_tools, lambda request: httpx.Response(
+            200,
+            content=body,
+            headers={"content-type": "application/octet-stream"}
+        ))
+        http_tools._buffer_pool = BufferPool(16, 32)
+        
+        result = await http_tools._fetch_only("https://example.com/spill")
+        
+        assert result["content"] == body
+        assert result["truncated"] is False
+        assert len(http_tools._buffer_pool) == 1
+    
+    @pytest.mark.asyncio
+    async def test_fetch_web_content_streams_large_body_into_rag(self, http_tools):
+        """Test that large pages are ingested through the chunk stream."""
+        self._mock_transport(http_tools, lambda request: httpx.Response(
+            200,
+            content=b"y" * 64,
+            headers={"content-type": "text/plain"}
+        ))
+        
+        with patch('src.mcp_rag_server.tools.http_tools.STREAM_INGEST_THRESHOLD', 32):
             result = await http_tools.fetch_web_content(
-                "https://example.com",
+                "https://example.com/big",
                 user_id="test_user",
                 auto_add_to_rag=True
             )
-            
-            assert result["success"] is True
-            assert result["url"] == "https://example.com"
-            assert result["content_length"] > 0
-            assert result["rag_integration"]["added_to_rag"] is True
+        
+        assert result["rag_integration"]["document_id"] == "test_doc_stream"
+        assert result["rag_integration"]["chunks_created"] == 4
+        http_tools.document_processor.process_content_stream.assert_called_once_with(
+            b"y" * 64, "text/plain", None
+        )
+        http_tools.rag_service.add_document.assert_not_called()
     
     @pytest.mark.asyncio
     async def test_fetch_web_content_invalid_url(self, http_tools):
@@ -71,21 +153,16 @@ class TestHTTPIntegrationTools:
     @pytest.mark.asyncio
     async def test_fetch_web_content_http_error(self, http_tools):
         """Test handling HTTP errors."""
-        with patch('httpx.AsyncClient.get') as mock_get:
-            # Mock HTTP error
-            mock_response = Mock()
-            mock_response.status_code = 404
-            mock_response.text = "Not Found"
-            mock_response.raise_for_status.side_effect = Exception("404 Not Found")
-            mock_get.return_value = mock_response
-            
-            result = await http_tools.fetch_web_content(
-                "https://example.com/notfound",
-                user_id="test_user"
-            )
-            
-            assert result["success"] is False
-            assert "404" in result["error"]
+        self._mock_transport(http_tools, lambda request: httpx.Response(404, text="Not Found"))
+        
+        result = await http_tools.fetch_web_content(
+            "https://example.com/notfound",
+            user_id="test_user"
+        )
+        
+        assert result["success"] is False
+        assert "404" in result["error"]
+        assert result["status_code"] == 404
     
     @pytest.mark.asyncio
     async def test_call_external_api_get(self, http_tools):
@@ -93,7 +170,7 @@ class TestHTTPIntegrationTools:
         with patch('httpx.AsyncClient.get') as mock_get:
             # Mock successful response
             mock_response = Mock()
-            mock_response.json.return_value = {"status": "success"}
+            mock_response.content = b'{"status": "success"}'
             mock_response.headers = {"content-type": "application/json"}
             mock_response.status_code = 200
             mock_response.raise_for_status = Mock()
@@ -108,14 +185,40 @@ class TestHTTPIntegrationTools:
             assert result["success"] is True
             assert result["method"] == "GET"
             assert result["status_code"] == 200
-    
+            assert result["response_data"] == {"status": "success"}
+
+    @pytest.mark.asyncio
+    async def test_call_external_api_big_integer(self, http_tools):
+        """Test that integers beyond 64 bits in a JSON response are parsed and added to RAG."""
+        big_id = 2**64 + 1
+        with patch('httpx.AsyncClient.get') as mock_get:
+            mock_response = Mock()
+            mock_response.content = b'{"id": %d}' % big_id
+            mock_response.headers = {"content-type": "application/json"}
+            mock_response.status_code = 200
+            mock_response.raise_for_status = Mock()
+            mock_get.return_value = mock_response
+
+            result = await http_tools.call_external_api(
+                "https://api.example.com/data",
+                method="GET",
+                user_id="test_user",
+                auto_add_response_to_rag=True
+            )
+
+            assert result["success"] is True
+            assert result["response_data"] == {"id": big_id}
+            assert result["rag_integration"]["document_id"] == "test_doc_1"
+            added_content = http_tools.rag_service.submit_document.call_args[0][0]
+            assert str(big_id) in added_content
+
     @pytest.mark.asyncio
     async def test_call_external_api_post(self, http_tools):
         """Test POST API call."""
         with patch('httpx.AsyncClient.post') as mock_post:
             # Mock successful response
             mock_response = Mock()
-            mock_response.json.return_value = {"id": 1, "status": "created"}
+            mock_response.content = b'{"id": 1, "status": "created"}'
             mock_response.headers = {"content-type": "application/json"}
             mock_response.status_code = 201
             mock_response.raise_for_status = Mock()
@@ -131,6 +234,7 @@ class TestHTTPIntegrationTools:
             assert result["success"] is True
             assert result["method"] == "POST"
             assert result["status_code"] == 201
+            assert result["response_data"] == {"id": 1, "status": "created"}
     
     @pytest.mark.asyncio
     async def test_call_external_api_unsupported_method(self, http_tools):
@@ -153,11 +257,11 @@ class TestHTTPIntegrationTools:
             "https://example3.com"
         ]
         
-        with patch.object(http_tools, 'fetch_web_content') as mock_fetch:
+        with patch.object(http_tools, '_fetch_only') as mock_fetch:
             # Mock successful responses
             mock_fetch.side_effect = [
-                {"success": True, "url": urls[0]},
-                {"success": True, "url": urls[1]},
+                {"success": True, "url": urls[0], "content": b"one", "content_type": "text/html", "encoding": None, "metadata": {}},
+                {"success": True, "url": urls[1], "content": b"two", "content_type": "text/html", "encoding": None, "metadata": {}},
                 {"success": False, "url": urls[2], "error": "Connection failed"}
             ]
             
@@ -171,6 +275,14 @@ class TestHTTPIntegrationTools:
             assert result["total_urls"] == 3
             assert result["successful"] == 2
             assert result["failed"] == 1
+            
+            # Fetched pages go through the ingest batcher as they complete
+            assert http_tools.rag_service.submit_document.call_count == 2
+            http_tools.rag_service.add_document.assert_not_called()
+            successful = result["results"]["successful"]
+            assert sorted(r["rag_integration"]["document_id"] for r in successful) == ["test_doc_1", "test_doc_2"]
+            assert result["results"]["failed"] == [{"url": urls[2], "error": "Connection failed"}]
+            assert http_tools._active_streams == {}
     
     @pytest.mark.asyncio
     async def test_process_http_response_extract_text(self, http_tools):
@@ -187,6 +299,13 @@ class TestHTTPIntegrationTools:
         assert result["processing_type"] == "extract_text"
         assert result["extracted_text_length"] > 0
     
+    def test_extract_html_text_regex_fallback(self):
+        """Test HTML text extraction without selectolax installed."""
+        with patch('src.mcp_rag_server.utils.html_text.HTMLParser', None):
+            text = extract_html_text("<html><body><p>Hello</p>\n   <p>world</p></body></html>")
+        
+        assert text == "Hello world"
+    
     @pytest.mark.asyncio
     async def test_process_http_response_json_to_text(self, http_tools):
         """Test JSON to text conversion."""
@@ -223,4 +342,28 @@ class TestHTTPIntegrationTools:
 
 
 if __name__ == "__main__":
-    pytest.main([__file__]) 
\ No newline at end of file
+    pytest.main([__file__]) 
+
+
+class TestBufferPool:
+    """Test cases for BufferPool."""
+    
+    def test_release_keeps_buffers_up_to_byte_cap(self):
+        """Test that released buffers are kept only while under the byte cap."""
+        pool = BufferPool(16, 32)
+        buffers = [pool.rent() for _ in range(3)]
+        
+        for buffer in buffers:
+            pool.release(buffer)
+        
+        assert len(pool) == 2
+        assert pool.retained_bytes == 32
+        assert pool.rent() is buffers[1]
+    
+    def test_release_drops_foreign_sizes(self):
+        """Test that buffers of another size are not pooled."""
+        pool = BufferPool(16, 64)
+        
+        pool.release(bytearray(8))
+        
+        assert len(pool) == 0
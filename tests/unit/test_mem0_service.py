@@ -287,6 +287,83 @@ class TestMem0ServiceEnhanced:
             assert memory is not None
             assert memory["embedding"] == new_embedding 
 
+    @pytest.mark.asyncio
+    async def test_get_relevant_memories_cache(self, mem0_service, sample_memories):
+        """Test relevant memory results are cached until the user's memories change."""
+        mem0_service._initialized = True
+        mem0_service.local_storage = {
+            "memories": {
+                "test_user": sample_memories
+            }
+        }
+        
+        with patch.object(mem0_service, '_save_local_storage', new_callable=AsyncMock):
+            with patch.object(mem0_service, 'search_memories', wraps=mem0_service.search_memories) as search:
+                first = await mem0_service.get_relevant_memories("test_user", "Python programming")
+                second = await mem0_service.get_relevant_memories("test_user", "programming  python")
+                
+                assert search.call_count == 1
+                assert second == first
+                
+                await mem0_service.add_memory("test_user", "More Python programming notes")
+                third = await mem0_service.get_relevant_memories("test_user", "Python programming")
+                
+                assert search.call_count == 2
+                assert len(third) == len(first) + 1
+
+    @pytest.mark.asyncio
+    async def test_search_memories_advanced_cache(self, mem0_service, sample_memories):
+        """Test advanced search results are reused until the user's memories change."""
+        mem0_service._initialized = True
+        mem0_service.local_storage = {"memories": {"test_user": sample_memories}}
+        options = {"search_strategy": "fuzzy", "limit": 5}
+        
+        with patch.object(mem0_service, '_save_local_storage', new_callable=AsyncMock):
+            with patch.object(mem0_service, '_fuzzy_search', wraps=mem0_service._fuzzy_search) as search:
+                first = await mem0_service.search_memories_advanced("test_user", "Python", options)
+                second = await mem0_service.search_memories_advanced("test_user", " python ", options)
+                
+                assert search.call_count == 1
+                assert second == first
+                
+                # Writes from any caller of the service drop the cached results
+                await mem0_service.add_memory("test_user", "More Python notes")
+                await mem0_service.search_memories_advanced("test_user", "Python", options)
+                
+                assert search.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_get_user_memories_reused_until_memories_change(self, mem0_service, sample_memories):
+        """Test memory lists are reused until any write path changes the user's memories."""
+        mem0_service._initialized = True
+        mem0_service.local_storage = {"memories": {"test_user": sample_memories}}
+        
+        with patch.object(mem0_service, '_save_local_storage', new_callable=AsyncMock):
+            first = await mem0_service.get_user_memories("test_user", limit=10)
+            second = await mem0_service.get_user_memories("test_user", limit=10)
+            
+            assert second == first
+            assert mem0_service._memory_fetch_cache.get_stats()["hits"] == 1
+            
+            await mem0_service.add_memory_with_session("test_user", "Session memory", "session-1")
+            third = await mem0_service.get_user_memories("test_user", limit=10)
+            
+            assert len(third) == len(first) + 1
+
+    @pytest.mark.asyncio
+    async def test_empty_user_sees_memories_added_elsewhere(self, mem0_service):
+        """Test a user found empty gets fresh results once a memory is added by any caller."""
+        mem0_service._initialized = True
+        
+        with patch.object(mem0_service, '_save_local_storage', new_callable=AsyncMock):
+            assert await mem0_service.get_user_memories("new_user") == []
+            assert mem0_service._empty_users.get("new_user")
+            
+            await mem0_service.add_memory_with_session("new_user", "First question", "session-1")
+            memories = await mem0_service.get_user_memories("new_user")
+            
+            assert [memory["memory"] for memory in memories] == ["First question"]
+
     async def test_get_memory_stats_by_session(self, mem0_service, mock_gemini_service):
         """Test getting memory statistics by session."""
         # Mock Gemini service for embedding generation
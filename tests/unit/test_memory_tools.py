@@ -58,6 +58,7 @@ class TestMemoryTools:
         ])
         
         service.clear_memories = AsyncMock(return_value=True)
+        service.count_memories = AsyncMock(return_value=2)
         service.get_relevant_memories = AsyncMock(return_value=[
             {"memory": "Previous conversation", "relevance": 0.8}
         ])
@@ -204,6 +205,34 @@ class TestMemoryTools:
         assert "total_sessions" in result
         assert "sessions" in result
         assert result["user_id"] == "test-user"
+        assert result["total_memories"] == 2
+
+    async def test_get_user_session_info_groups_sessions(self, memory_tools, mock_mem0_service):
+        """Test that sessions report their memory count, first and last activity."""
+        mock_mem0_service.get_user_memories = AsyncMock(return_value=[
+            {"memory_type": "question", "created_at": "2024-01-01T10:05:00", "session_id": "s1"},
+            {"memory_type": "conversation", "created_at": "2024-01-01T11:00:00", "session_id": "s2"},
+            {"memory_type": "conversation", "created_at": "2024-01-01T10:00:00", "session_id": "s1"}
+        ])
+        
+        result = await memory_tools.get_user_session_info("test-user")
+        
+        sessions = {session["session_id"]: session for session in result["sessions"]}
+        assert result["total_sessions"] == 2
+        assert sessions["s1"]["memory_count"] == 2
+        assert sessions["s1"]["memory_types"] == {"question": 1, "conversation": 1}
+        assert sessions["s1"]["created_at"] == "2024-01-01T10:00:00"
+        assert sessions["s1"]["last_activity"] == "2024-01-01T10:05:00"
+
+    async def test_get_user_session_info_count_error(self, memory_tools, mock_mem0_service):
+        """Test user session info still reports sessions when counting fails."""
+        mock_mem0_service.count_memories.side_effect = Exception("Count error")
+        
+        result = await memory_tools.get_user_session_info("test-user")
+        
+        assert result["success"] is True
+        assert result["total_memories"] is None
+        assert result["total_sessions"] == 1
 
     async def test_get_user_session_info_service_error(self, memory_tools, mock_mem0_service):
         """Test user session info retrieval with service error."""
@@ -273,6 +302,18 @@ class TestMemoryTools:
         assert result["query"] == "test query"
         assert result["context_options"] == context_options
 
+    async def test_get_enhanced_memory_context_attach_memories(self, memory_tools):
+        """Test that reference memories are attached only on request, projected to the given fields."""
+        result = await memory_tools.get_enhanced_memory_context("test-user", "test query")
+        
+        assert result["memories"] == []
+        
+        result = await memory_tools.get_enhanced_memory_context(
+            "test-user", "test query", {"attach_memories": True, "project_fields": ["memory_id", "content"]}
+        )
+        
+        assert result["memories"] == [{"memory_id": "mem1", "content": "Test memory 1"}]
+
     async def test_get_enhanced_memory_context_no_memories(self, memory_tools, mock_mem0_service):
         """Test enhanced memory context with no memories."""
         mock_mem0_service.search_memories_advanced.return_value = []
@@ -440,6 +481,24 @@ class TestMemoryTools:
         assert result["success"] is False
         assert "error" in result
 
+    async def test_batch_get_memory_insights(self, memory_tools, mock_mem0_service):
+        """Test memory insights for several users in one call."""
+        result = await memory_tools.batch_get_memory_insights(["user-a", "user-b"], "engagement", max_concurrent=1)
+        
+        assert result["success"] is True
+        assert result["count"] == 2
+        assert [insights["user_id"] for insights in result["results"]] == ["user-a", "user-b"]
+        assert all("engagement" in insights["insights"] for insights in result["results"])
+        assert mock_mem0_service.get_user_memories.call_count == 2
+
+    async def test_batch_search_memories_advanced(self, memory_tools, mock_mem0_service):
+        """Test several advanced searches for a user in one call."""
+        result = await memory_tools.batch_search_memories_advanced("test-user", ["first query", "second query"])
+        
+        assert result["success"] is True
+        assert [search["query"] for search in result["results"]] == ["first query", "second query"]
+        assert mock_mem0_service.search_memories_advanced.call_count == 2
+
     # Helper Method Tests
 
     def test_is_memory_in_time_range_hour(self, memory_tools):
@@ -462,6 +521,47 @@ class TestMemoryTools:
         assert memory_tools._is_memory_in_time_range(memory, "day") is False
         assert memory_tools._is_memory_in_time_range(memory, "week") is True
 
+    def test_is_memory_in_time_range_relative_to_now(self, memory_tools):
+        """Test time range filtering against an explicit reference time."""
+        memory = {"created_at": "2024-01-01T12:00:00"}
+        
+        assert memory_tools._is_memory_in_time_range(memory, "day", now=datetime(2024, 1, 2, 11)) is True
+        assert memory_tools._is_memory_in_time_range(memory, "day", now=datetime(2024, 1, 2, 13)) is False
+
+    def test_time_range_cutoff(self, memory_tools):
+        """Test cutoff computation for time ranges."""
+        cutoff = memory_tools._time_range_cutoff("week")
+        
+        assert timedelta(days=7) <= datetime.now() - cutoff < timedelta(days=7, minutes=1)
+        assert memory_tools._time_range_cutoff("all") is None
+        assert memory_tools._time_range_cutoff(None) is None
+
+    async def test_analyze_memory_patterns_filters_old_memories(self, memory_tools, mock_mem0_service):
+        """Test that memories older than the time range are excluded."""
+        mock_mem0_service.get_user_memories = AsyncMock(return_value=[
+            {"memory": "Recent", "created_at": datetime.now().isoformat()},
+            {"memory": "Old", "created_at": (datetime.now() - timedelta(days=2)).isoformat()},
+            {"memory": "Undated"}
+        ])
+        
+        result = await memory_tools.analyze_memory_patterns("test-user", "day")
+        
+        assert result["patterns"]["total_memories"] == 1
+
+    def test_created_after_chronological_memories(self, memory_tools):
+        """Test that chronologically ordered memories are filtered to the suffix after the cutoff."""
+        cutoff = datetime(2024, 1, 2)
+        prepared = memory_tools._preprocess([
+            {"memory": "Old", "created_at": "2024-01-01T00:00:00"},
+            {"memory": "At cutoff", "created_at": "2024-01-02T00:00:00"},
+            {"memory": "New", "created_at": "2024-01-03T00:00:00"},
+            {"memory": "Newest", "created_at": "2024-01-04T00:00:00"}
+        ])
+        
+        filtered = prepared.created_after(cutoff)
+        
+        assert [memory["memory"] for memory in filtered.memories] == ["New", "Newest"]
+
     def test_analyze_temporal_distribution(self, memory_tools):
         """Test temporal distribution analysis."""
         memories = [
@@ -469,7 +569,7 @@ class TestMemoryTools:
             {"created_at": (datetime.now() - timedelta(hours=1)).isoformat()}
         ]
         
-        distribution = memory_tools._analyze_temporal_distribution(memories)
+        distribution = memory_tools._analyze_temporal_distribution(memory_tools._preprocess(memories))
         
         assert "hour" in distribution
         assert "day" in distribution
@@ -491,12 +591,14 @@ class TestMemoryTools:
             }
         ]
         
-        patterns = memory_tools._analyze_session_patterns(memories)
+        patterns = memory_tools._analyze_session_patterns(memory_tools._preprocess(memories))
         
         assert "total_sessions" in patterns
         assert "avg_memories_per_session" in patterns
         assert "avg_session_duration" in patterns
         assert "session_details" in patterns
+        assert patterns["session_details"]["session1"]["memory_count"] == 2
+        assert patterns["session_details"]["session1"]["memory_types"] == {"conversation": 1, "question": 1}
 
     def test_calculate_engagement_metrics(self, memory_tools):
         """Test engagement metrics calculation."""
@@ -511,7 +613,7 @@ class TestMemoryTools:
             }
         ]
         
-        metrics = memory_tools._calculate_engagement_metrics(memories)
+        metrics = memory_tools._calculate_engagement_metrics(memory_tools._preprocess(memories))
         
         assert "total_memories" in metrics
         assert "total_active_days" in metrics
@@ -521,7 +623,7 @@ class TestMemoryTools:
 
     def test_calculate_engagement_metrics_no_memories(self, memory_tools):
         """Test engagement metrics with no memories."""
-        metrics = memory_tools._calculate_engagement_metrics([])
+        metrics = memory_tools._calculate_engagement_metrics(memory_tools._preprocess([]))
         
         assert metrics["total_memories"] == 0
         assert metrics["avg_memories_per_day"] == 0
@@ -535,11 +637,30 @@ class TestMemoryTools:
             {"memory": "I like Python programming"}
         ]
         
-        topics = memory_tools._analyze_topic_distribution(memories)
+        topics = memory_tools._analyze_topic_distribution(memory_tools._preprocess(memories))
         
         assert "topic_distribution" in topics
         assert "dominant_topics" in topics
         assert "total_topics_identified" in topics
+        assert topics["topic_distribution"]["questions"] == 2
+        assert topics["topic_distribution"]["preferences"] == 1
+
+    def test_analyze_topic_distribution_matches_whole_words(self, memory_tools):
+        """Test that topic keywords do not match inside other words."""
+        memories = [{"memory": "This showcase"}]
+        
+        topics = memory_tools._analyze_topic_distribution(memory_tools._preprocess(memories))
+        
+        assert topics["total_topics_identified"] == 0
+
+    def test_topic_distribution_skips_timestamp_parsing(self, memory_tools):
+        """Test that topic analysis does not compute the parsed memory view."""
+        prepared = memory_tools._preprocess([{"memory": "What is this?", "created_at": datetime.now().isoformat()}])
+        
+        memory_tools._analyze_topic_distribution(prepared)
+        
+        assert "lower_contents" in vars(prepared)
+        assert "parsed" not in vars(prepared)
 
     def test_identify_memory_patterns(self, memory_tools):
         """Test memory pattern identification."""
@@ -556,11 +677,13 @@ class TestMemoryTools:
             }
         ]
         
-        patterns = memory_tools._identify_memory_patterns(memories)
+        patterns = memory_tools._identify_memory_patterns(memory_tools._preprocess(memories))
         
         assert "creation_patterns" in patterns
         assert "content_patterns" in patterns
         assert "session_patterns" in patterns
+        assert patterns["content_patterns"] == {"avg_length": 13, "min_length": 13, "max_length": 13}
+        assert sum(count for _, count in patterns["creation_patterns"]["peak_hours"]) == 2
 
     # Error Handling Tests
 
@@ -2,15 +2,18 @@
 Tests for RAG service functionality.
 """
 
+import asyncio
 import pytest
-from unittest.mock import Mock, AsyncMock
+from unittest.mock import Mock, AsyncMock, patch
 from datetime import datetime
 
+from mcp_rag_server.services import rag_service as rag_service_module
 from mcp_rag_server.services.rag_service import RAGService
 from mcp_rag_server.services.gemini_service import GeminiService
 from mcp_rag_server.services.qdrant_service import QdrantService
 from mcp_rag_server.services.mem0_service import Mem0Service
 from mcp_rag_server.services.session_service import SessionService
+from mcp_rag_server.tools.document_tools import DocumentTools
 
 
 @pytest.fixture
@@ -35,6 +38,17 @@ def mock_qdrant_service():
             "metadata": {"source": "test", "document_id": "test-doc-id"}
         }
     ])
+    service.search_documents_batch = AsyncMock(return_value=[
+        [
+            {
+                "id": "test-chunk-id",
+                "score": 0.95,
+                "content": "Test document content",
+                "metadata": {"source": "test", "document_id": "test-doc-id"}
+            }
+        ],
+        []
+    ])
     service.delete_document = AsyncMock(return_value=True)
     service.get_document = AsyncMock(return_value={
         "id": "test-doc-id",
@@ -118,6 +132,225 @@ async def test_add_document(rag_service):
     assert result["metadata"]["source"] == "test"
 
 
+@pytest.mark.asyncio
+async def test_add_document_skips_duplicate_content(rag_service):
+    """Test that re-adding identical content reuses the first ingest."""
+    await rag_service.initialize()
+    
+    first = await rag_service.add_document("Test document content", {"source": "test"}, "test-user")
+    second = await rag_service.add_document("  Test document content\n", {"source": "test"}, "test-user")
+    
+    assert second["id"] == first["id"]
+    rag_service.gemini_service.generate_embeddings.assert_called_once()
+    rag_service.qdrant_service.add_documents.assert_called_once()
+    
+    # Other users get their own copy
+    other = await rag_service.add_document("Test document content", {"source": "test"}, "other-user")
+    assert other["id"] != first["id"]
+
+
+@pytest.mark.asyncio
+async def test_add_document_with_new_metadata_is_stored(rag_service):
+    """Test that re-adding content with different metadata writes a new document."""
+    await rag_service.initialize()
+
+    first = await rag_service.add_document("Test document content", {"source": "a"}, "test-user")
+    first["metadata"]["source"] = "changed"
+    second = await rag_service.add_document("Test document content", {"source": "b"}, "test-user")
+
+    assert second["id"] != first["id"]
+    assert second["metadata"]["source"] == "b"
+    assert rag_service.qdrant_service.add_documents.call_count == 2
+
+    # Mutating a returned result does not corrupt the cached one
+    again = await rag_service.add_document("Test document content", {"source": "a"}, "test-user")
+    assert again["id"] == first["id"]
+    assert again["metadata"]["source"] == "a"
+
+
+@pytest.mark.asyncio
+async def test_document_tools_repeat_ingest_reuses_first_across_seconds(rag_service):
+    """Test that ingest-time timestamps added by the tools do not defeat the ingest cache."""
+    await rag_service.initialize()
+    document_tools = DocumentTools(rag_service)
+    
+    with patch(
+        "mcp_rag_server.tools.document_tools.now_iso",
+        side_effect=["2026-01-01T00:00:00", "2026-01-01T00:00:01"]
+    ):
+        first = await document_tools.add_document("Test document content", {"source": "test"}, "test-user")
+        second = await document_tools.add_document("Test document content", {"source": "test"}, "test-user")
+    await rag_service.cleanup()
+    
+    assert first["success"] and second["success"]
+    assert second["document_id"] == first["document_id"]
+    rag_service.gemini_service.generate_embeddings.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_delete_document_invalidates_ingest_cache(rag_service):
+    """Test that deleting a document allows its content to be ingested again."""
+    await rag_service.initialize()
+    
+    first = await rag_service.add_document("Test document content", {"source": "test"}, "test-user")
+    await rag_service.delete_document(first["id"])
+    second = await rag_service.add_document("Test document content", {"source": "test"}, "test-user")
+    
+    assert second["id"] != first["id"]
+    assert rag_service.qdrant_service.add_documents.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_add_documents_batches_embeddings(rag_service):
+    """Test that a batch of documents is embedded and stored in one call each."""
+    await rag_service.initialize()
+    
+    contents = ["First document content", "Second document content", "First document content"]
+    metadatas = [{"source": "a"}, {"source": "b"}, {"source": "a"}]
+    
+    results = await rag_service.add_documents(contents, metadatas, "test-user")
+    
+    assert len(results) == 3
+    assert results[0]["metadata"]["source"] == "a"
+    assert results[1]["metadata"]["source"] == "b"
+    assert results[2]["id"] == results[0]["id"]
+    rag_service.gemini_service.generate_embeddings.assert_called_once_with(
+        ["First document content", "Second document content"]
+    )
+    rag_service.qdrant_service.add_documents.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_add_documents_bounds_embedding_batches(rag_service, monkeypatch):
+    """Test that the chunks of a batch are embedded in calls of bounded size."""
+    await rag_service.initialize()
+    monkeypatch.setattr(rag_service_module, "EMBEDDING_BATCH_SIZE", 2)
+    rag_service.gemini_service.generate_embeddings.side_effect = lambda texts: [[0.1, 0.2, 0.3] for _ in texts]
+    
+    results = await rag_service.add_documents(
+        ["First document", "Second document", "Third document"], None, "test-user"
+    )
+    
+    assert all(result["success"] for result in results)
+    batch_sizes = [len(call.args[0]) for call in rag_service.gemini_service.generate_embeddings.call_args_list]
+    assert batch_sizes == [2, 1]
+    rag_service.qdrant_service.add_documents.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_add_documents_isolates_failing_document(rag_service):
+    """Test that one document failing to embed does not fail the rest of the batch."""
+    await rag_service.initialize()
+    
+    async def embed(texts):
+        if any("poison" in text for text in texts):
+            raise ValueError("embedding rejected")
+        return [[0.1, 0.2, 0.3] for _ in texts]
+    
+    rag_service.gemini_service.generate_embeddings.side_effect = embed
+    
+    results = await rag_service.add_documents(
+        ["Good document", "poison document", "Another good document"],
+        [{"source": "a"}, {"source": "b"}, {"source": "c"}],
+        "test-user"
+    )
+    
+    assert results[0]["success"] and results[2]["success"]
+    assert results[1] == {"success": False, "error": "embedding rejected", "error_type": "ValueError"}
+    assert rag_service.qdrant_service.add_documents.call_count == 2
+    
+    # The failed document is not cached and can be retried
+    rag_service.gemini_service.generate_embeddings.side_effect = None
+    retried = await rag_service.add_documents(["poison document"], None, "test-user")
+    assert retried[0]["success"]
+
+
+@pytest.mark.asyncio
+async def test_submit_document_raises_for_failed_document(rag_service):
+    """Test that a document failing in a coalesced batch fails only its own caller."""
+    await rag_service.initialize()
+    
+    async def embed(texts):
+        if any("poison" in text for text in texts):
+            raise ValueError("embedding rejected")
+        return [[0.1, 0.2, 0.3] for _ in texts]
+    
+    rag_service.gemini_service.generate_embeddings.side_effect = embed
+    
+    results = await asyncio.gather(
+        rag_service.submit_document("Good document", None, "test-user"),
+        rag_service.submit_document("poison document", None, "test-user"),
+        return_exceptions=True
+    )
+    await rag_service.cleanup()
+    
+    assert results[0]["success"]
+    assert isinstance(results[1], ValueError)
+    assert "embedding rejected" in str(results[1])
+
+
+@pytest.mark.asyncio
+async def test_submit_document_coalesces_concurrent_ingests(rag_service):
+    """Test that concurrently submitted documents share one embedding call."""
+    await rag_service.initialize()
+    
+    results = await asyncio.gather(*[
+        rag_service.submit_document(f"Document number {i}", {"index": i}, "test-user")
+        for i in range(3)
+    ])
+    await rag_service.cleanup()
+    
+    assert [result["metadata"]["index"] for result in results] == [0, 1, 2]
+    assert len({result["id"] for result in results}) == 3
+    rag_service.gemini_service.generate_embeddings.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_submit_document_rejected_after_cleanup(rag_service):
+    """Test that a closed ingest batcher does not start a new flush loop."""
+    await rag_service.initialize()
+    await rag_service.cleanup()
+    
+    with pytest.raises(RuntimeError, match="closed"):
+        await rag_service.submit_document("Late document", None, "test-user")
+    assert rag_service._ingest_batcher._flush_task is None
+
+
+@pytest.mark.asyncio
+async def test_add_document_stream_embeds_in_batches(rag_service):
+    """Test that streamed chunks are embedded and stored batch by batch."""
+    await rag_service.initialize()
+    
+    async def chunks():
+        for i in range(5):
+            yield f"Streamed chunk {i}"
+    
+    result = await rag_service.add_document_stream(chunks(), {"source": "stream"}, "test-user", batch_size=2)
+    
+    assert result["success"] is True
+    assert result["chunks"] == 5
+    assert result["metadata"]["document_id"] == result["id"]
+    assert rag_service.gemini_service.generate_embeddings.call_count == 3
+    assert rag_service.qdrant_service.add_documents.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_add_document_stream_removes_stored_chunks_on_failure(rag_service):
+    """Test that a failing stream deletes the batches it already stored."""
+    await rag_service.initialize()
+    rag_service.qdrant_service.delete_points = AsyncMock(return_value=True)
+    
+    async def chunks():
+        for i in range(3):
+            yield f"Streamed chunk {i}"
+        raise RuntimeError("Source failed")
+    
+    with pytest.raises(RuntimeError):
+        await rag_service.add_document_stream(chunks(), None, "test-user", batch_size=2)
+    
+    rag_service.qdrant_service.delete_points.assert_awaited_once_with(["test-doc-id"])
+
+
 @pytest.mark.asyncio
 async def test_search_documents(rag_service):
     """Test searching for documents."""
@@ -132,6 +365,72 @@ async def test_search_documents(rag_service):
     assert results[0]["chunks"][0]["content"] == "Test document content"
 
 
+@pytest.mark.asyncio
+async def test_search_documents_reuses_cached_results(rag_service):
+    """Test that a repeated search is served from the cache until documents change."""
+    await rag_service.initialize()
+    
+    first = await rag_service.search_documents("test query", limit=5, user_id="test-user")
+    second = await rag_service.search_documents("test query", limit=5, user_id="test-user")
+    
+    assert second == first
+    assert rag_service.qdrant_service.search_documents.call_count == 1
+    
+    await rag_service.add_document("New document content", {"source": "test"}, "test-user")
+    await rag_service.search_documents("test query", limit=5, user_id="test-user")
+    
+    assert rag_service.qdrant_service.search_documents.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_search_started_before_write_is_not_cached(rag_service):
+    """Test that a search overlapping a document write does not cache its result."""
+    await rag_service.initialize()
+    search_results = rag_service.qdrant_service.search_documents.return_value
+    
+    async def search_during_write(**kwargs):
+        await rag_service.add_document("New document content", {"source": "test"}, "test-user")
+        return search_results
+    
+    rag_service.qdrant_service.search_documents = AsyncMock(side_effect=search_during_write)
+    await rag_service.search_documents("test query", limit=5, user_id="test-user")
+    
+    rag_service.qdrant_service.search_documents = AsyncMock(return_value=search_results)
+    await rag_service.search_documents("test query", limit=5, user_id="test-user")
+    
+    rag_service.qdrant_service.search_documents.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_search_documents_batch_searches_only_uncached_queries(rag_service):
+    """Test that a batch search embeds only the queries missing from the cache."""
+    await rag_service.initialize()
+    await rag_service.search_documents("first", limit=5, user_id="test-user")
+    rag_service.gemini_service.generate_embeddings = AsyncMock(return_value=[[0.2]])
+    rag_service.qdrant_service.search_documents_batch = AsyncMock(return_value=[[]])
+    
+    results = await rag_service.search_documents_batch(["first", "second"], limit=5, user_id="test-user")
+    
+    assert results[0][0]["document_id"] == "test-doc-id"
+    assert results[1] == []
+    rag_service.gemini_service.generate_embeddings.assert_awaited_once_with(["second"])
+
+
+@pytest.mark.asyncio
+async def test_search_documents_batch(rag_service):
+    """Test searching for several queries with one embedding call."""
+    await rag_service.initialize()
+    rag_service.gemini_service.generate_embeddings = AsyncMock(return_value=[[0.1], [0.2]])
+    
+    results = await rag_service.search_documents_batch(["first", "second"], limit=5, user_id="test-user")
+    
+    assert len(results) == 2
+    assert results[0][0]["document_id"] == "test-doc-id"
+    assert results[1] == []
+    rag_service.gemini_service.generate_embeddings.assert_awaited_once_with(["first", "second"])
+    rag_service.qdrant_service.search_documents_batch.assert_awaited_once()
+
+
 @pytest.mark.asyncio
 async def test_ask_question(rag_service):
     """Test asking a question with RAG."""
@@ -0,0 +1,118 @@
+"""
+Unit tests for search tools.
+
+This module tests the search and query tools functionality.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import Mock, AsyncMock
+
+from mcp_rag_server.tools.search_tools import SearchTools
+
+
+class TestSearchTools:
+    """Test cases for SearchTools class."""
+
+    @pytest.fixture
+    def mock_rag_service(self):
+        """Create a mock RAGService."""
+        service = Mock()
+        service.search_documents = AsyncMock(return_value=[
+            {"document_id": "doc1", "score": 0.9, "chunks": []}
+        ])
+        service.search_documents_batch = AsyncMock(side_effect=lambda queries, limit, user_id: [
+            [{"document_id": "doc1", "score": 0.9, "chunks": []}] for _ in queries
+        ])
+        service.ask_question = AsyncMock(return_value="Test answer")
+        return service
+
+    @pytest.fixture
+    def search_tools(self, mock_rag_service):
+        """Create SearchTools instance with a mocked service."""
+        return SearchTools(mock_rag_service)
+
+    async def test_search_documents_success(self, search_tools):
+        """Test successful document search."""
+        result = await search_tools.search_documents("test query", limit=5)
+        
+        assert result["success"] is True
+        assert result["count"] == 1
+        assert result["query"] == "test query"
+
+    async def test_search_documents_empty_query(self, search_tools):
+        """Test document search with an empty query."""
+        result = await search_tools.search_documents("  ")
+        
+        assert result["success"] is False
+        assert "error" in result
+
+    async def test_batch_search_success(self, search_tools, mock_rag_service):
+        """Test batch search sends the non-blank queries in one batched call."""
+        result = await search_tools.batch_search(["first", "", "second"], limit=3)
+        
+        assert result["success"] is True
+        assert [entry["query"] for entry in result["batch_results"]] == ["first", "second"]
+        assert result["total_queries"] == 3
+        assert result["successful_searches"] == 2
+        mock_rag_service.search_documents_batch.assert_awaited_once_with(["first", "second"], 3, None)
+        mock_rag_service.search_documents.assert_not_called()
+
+    async def test_batch_search_deduplicates_queries(self, search_tools, mock_rag_service):
+        """Test that repeated queries are searched once and answered in input order."""
+        result = await search_tools.batch_search(["first", "second", " first "])
+        
+        assert [entry["query"] for entry in result["batch_results"]] == ["first", "second", " first "]
+        assert result["successful_searches"] == 3
+        mock_rag_service.search_documents_batch.assert_awaited_once_with(["first", "second"], 5, None)
+
+    async def test_batch_search_falls_back_to_concurrent_searches(self, search_tools, mock_rag_service):
+        """Test that a failed batched call is retried as concurrent single searches."""
+        in_flight = 0
+        max_in_flight = 0
+        
+        async def search(query, limit, user_id):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return []
+        
+        mock_rag_service.search_documents_batch = AsyncMock(side_effect=Exception("Batch error"))
+        mock_rag_service.search_documents = AsyncMock(side_effect=search)
+        
+        result = await search_tools.batch_search(["a", "b", "c"])
+        
+        assert result["successful_searches"] == 3
+        assert max_in_flight == 3
+
+    async def test_batch_search_skips_failed_queries(self, search_tools, mock_rag_service):
+        """Test that one failing query does not fail the whole batch."""
+        mock_rag_service.search_documents_batch = AsyncMock(side_effect=Exception("Batch error"))
+        mock_rag_service.search_documents = AsyncMock(side_effect=[[], Exception("Search error")])
+        
+        result = await search_tools.batch_search(["good", "bad"])
+        
+        assert result["success"] is True
+        assert [entry["query"] for entry in result["batch_results"]] == ["good"]
+        assert result["successful_searches"] == 1
+
+    async def test_batch_search_too_many_queries(self, search_tools):
+        """Test batch search rejects more than 10 queries."""
+        result = await search_tools.batch_search([f"query {i}" for i in range(11)])
+        
+        assert result["success"] is False
+        assert "error" in result
+
+    async def test_get_search_suggestions(self, search_tools):
+        """Test that suggestions are built from the partial query."""
+        result = await search_tools.get_search_suggestions("python")
+        
+        assert result["success"] is True
+        assert result["suggestions"] == [
+            "python documents",
+            "python information",
+            "find python",
+            "search python"
+        ]
@@ -0,0 +1,132 @@
+"""
+Unit tests for the MCP RAG Server.
+
+This module tests lazy service initialization.
+"""
+
+import pytest
+from unittest.mock import Mock, AsyncMock, patch
+
+from mcp_rag_server import server as server_module
+from mcp_rag_server.server import MCPRAGServer
+
+
+def mock_service_class(initialize_error=None):
+    """Create a mock service class whose instances record initialize and cleanup calls."""
+    instance = Mock()
+    instance.initialize = AsyncMock(side_effect=initialize_error)
+    instance.cleanup = AsyncMock()
+    return Mock(return_value=instance)
+
+
+class TestServiceInitialization:
+    """Test cases for MCPRAGServer service initialization."""
+
+    @pytest.fixture
+    def server(self):
+        """Create a server instance."""
+        return MCPRAGServer()
+
+    @pytest.fixture
+    def failing_services(self):
+        """Patch the external services so that mem0 fails to initialize."""
+        classes = {
+            "GeminiService": mock_service_class(),
+            "QdrantService": mock_service_class(),
+            "Mem0Service": mock_service_class(RuntimeError("mem0 down")),
+            "SessionService": mock_service_class()
+        }
+        with patch.multiple(server_module, **classes):
+            yield classes
+
+    async def test_failed_initialization_cleans_up_started_services(self, server, failing_services):
+        """Test that services started before a failure are cleaned up and forgotten."""
+        with pytest.raises(RuntimeError, match="mem0 down"):
+            await server.initialize()
+        
+        failing_services["GeminiService"].return_value.cleanup.assert_awaited_once()
+        failing_services["QdrantService"].return_value.cleanup.assert_awaited_once()
+        failing_services["Mem0Service"].return_value.cleanup.assert_not_awaited()
+        failing_services["SessionService"].assert_not_called()
+        assert server.qdrant_service is None
+        assert server.mem0_service is None
+
+    async def test_failed_initialization_not_retried_within_backoff(self, server, failing_services):
+        """Test that calls right after a failure get the error without reconnecting."""
+        with pytest.raises(RuntimeError):
+            await server.initialize()
+        
+        with pytest.raises(RuntimeError, match="Services unavailable.*mem0 down"):
+            await server.initialize()
+        
+        failing_services["QdrantService"].assert_called_once()
+
+    async def test_initialization_retried_after_backoff(self, server, failing_services):
+        """Test that initialization is attempted again once the backoff has passed."""
+        with pytest.raises(RuntimeError):
+            await server.initialize()
+        
+        with patch.object(server_module, "INIT_RETRY_BACKOFF", 0):
+            with pytest.raises(RuntimeError, match="mem0 down"):
+                await server.initialize()
+        
+        assert failing_services["QdrantService"].call_count == 2
+
+
+class TestServiceCleanup:
+    """Test cases for MCPRAGServer service cleanup."""
+
+    async def test_cleanup_closes_ingest_sources_before_clients(self):
+        """Test that tools, then the RAG service, are closed before the clients they use."""
+        server = MCPRAGServer()
+        order = []
+        names = [
+            "gemini_service", "qdrant_service", "mem0_service", "session_service",
+            "rag_service", "http_tools", "advanced_features"
+        ]
+        for name in names:
+            service = Mock()
+            service.cleanup = AsyncMock(side_effect=lambda name=name: order.append(name))
+            setattr(server, name, service)
+        
+        await server.cleanup()
+        
+        assert order.index("http_tools") < order.index("rag_service")
+        assert order.index("advanced_features") < order.index("rag_service")
+        assert order.index("rag_service") < order.index("gemini_service")
+        assert order.index("rag_service") < order.index("qdrant_service")
+
+
+class TestSessionToolRouting:
+    """Test cases for the session MCP tools."""
+
+    @pytest.fixture
+    def server(self):
+        """Create a server with mocked session tools and no external services."""
+        server = MCPRAGServer()
+        server.initialize = AsyncMock()
+        server.session_tools = Mock()
+        server.session_tools.list_user_sessions = AsyncMock(return_value={
+            "success": True, "sessions": [], "count": 0, "next_cursor": "next-page"
+        })
+        server.session_tools.get_session_info = AsyncMock(return_value={"success": True})
+        return server
+
+    @staticmethod
+    def _tool(server, name):
+        """Get the function registered for an MCP tool."""
+        return server.mcp._tool_manager.get_tool(name).fn
+
+    async def test_list_sessions_pages_with_cursor(self, server):
+        """Test that list_sessions forwards the cursor and returns the next one."""
+        result = await self._tool(server, "list_sessions")(user_id="user1", limit=5, cursor="page-2")
+        
+        assert result["next_cursor"] == "next-page"
+        server.session_tools.list_user_sessions.assert_awaited_once_with("user1", cursor="page-2", limit=5)
+
+    async def test_get_session_uses_session_info(self, server):
+        """Test that get_session is served by get_session_info."""
+        result = await self._tool(server, "get_session")(session_id="session-1")
+        
+        assert result["success"] is True
+        server.session_tools.get_session_info.assert_awaited_once_with("session-1")
@@ -201,6 +201,42 @@ class TestSessionService:
         all_sessions = await session_service.get_user_sessions(user_id, include_expired=True)
         assert len(all_sessions) == 3
     
+    @pytest.mark.asyncio
+    async def test_get_user_sessions_page(self, session_service, temp_storage_path):
+        """Test paging through user sessions with a cursor."""
+        # Mock storage path
+        session_service.storage_path = temp_storage_path
+        
+        # Initialize service
+        await session_service.initialize()
+        
+        # Create multiple sessions for user
+        user_id = "test_user"
+        session_ids = []
+        
+        for i in range(5):
+            session_id = await session_service.create_session(
+                user_id=user_id,
+                session_name=f"Session {i}"
+            )
+            session_ids.append(session_id)
+        
+        # Page through sessions, newest first
+        first_page, cursor = await session_service.get_user_sessions_page(user_id, limit=2)
+        second_page, cursor = await session_service.get_user_sessions_page(user_id, cursor=cursor, limit=2)
+        last_page, cursor = await session_service.get_user_sessions_page(user_id, cursor=cursor, limit=2)
+        
+        pages = [first_page, second_page, last_page]
+        assert [len(page) for page in pages] == [2, 2, 1]
+        assert [s["id"] for page in pages for s in page] == sorted(
+            session_ids, key=lambda sid: (session_service.sessions[sid]["created_at"], sid), reverse=True
+        )
+        assert cursor is None
+        
+        # Invalid cursors are rejected
+        with pytest.raises(ValueError):
+            await session_service.get_user_sessions_page(user_id, cursor="not a cursor")
+    
     @pytest.mark.asyncio
     async def test_session_stats(self, session_service, temp_storage_path):
         """Test session statistics functionality."""
@@ -0,0 +1,99 @@
+"""
+Unit tests for session tools.
+
+This module tests the session management tools functionality.
+"""
+
+import pytest
+from unittest.mock import Mock, AsyncMock
+
+from mcp_rag_server.tools.session_tools import SessionTools
+from mcp_rag_server.services.session_service import SessionService
+
+
+class TestSessionTools:
+    """Test cases for SessionTools class."""
+
+    @pytest.fixture
+    def mock_session_service(self):
+        """Create a mock SessionService."""
+        service = Mock(spec=SessionService)
+        service.create_session = AsyncMock(return_value="session-1")
+        service.get_session = AsyncMock(return_value={"session_id": "session-1"})
+        service.get_session_stats = AsyncMock(return_value={"total_memories": 0})
+        service.expire_session = AsyncMock(return_value=True)
+        service.get_user_sessions_page = AsyncMock(return_value=([{"id": "session-1"}], "next"))
+        return service
+
+    @pytest.fixture
+    def session_tools(self, mock_session_service):
+        """Create SessionTools instance with a mocked service."""
+        return SessionTools(mock_session_service)
+
+    async def test_create_session_success(self, session_tools):
+        """Test successful session creation."""
+        result = await session_tools.create_session("user-1", session_name="Test")
+        
+        assert result["success"] is True
+        assert result["session_id"] == "session-1"
+
+    async def test_create_session_invalid_user(self, session_tools, mock_session_service):
+        """Test that invalid parameters are rejected before calling the service."""
+        result = await session_tools.create_session("")
+        
+        assert result["success"] is False
+        assert result["message"].startswith("Failed to create session")
+        mock_session_service.create_session.assert_not_called()
+
+    async def test_get_session_info_success(self, session_tools, mock_session_service):
+        """Test that session info includes the session statistics."""
+        result = await session_tools.get_session_info("session-1")
+        
+        assert result["success"] is True
+        assert result["session"] == {"session_id": "session-1"}
+        assert result["statistics"] == {"total_memories": 0}
+        mock_session_service.get_session_stats.assert_awaited_once_with("session-1")
+
+    async def test_get_session_info_not_found(self, session_tools, mock_session_service):
+        """Test session info for a missing session."""
+        mock_session_service.get_session = AsyncMock(return_value=None)
+        mock_session_service.get_session_stats = AsyncMock(return_value=None)
+        
+        result = await session_tools.get_session_info("missing")
+        
+        assert result["success"] is False
+        assert result["error"] == "Session not found"
+
+    async def test_get_session_info_invalid_session_id(self, session_tools, mock_session_service):
+        """Test that an empty session ID is rejected before calling the service."""
+        result = await session_tools.get_session_info("")
+        
+        assert result["success"] is False
+        mock_session_service.get_session.assert_not_called()
+
+    async def test_list_user_sessions_page(self, session_tools, mock_session_service):
+        """Test that listing sessions returns one page and the next cursor."""
+        result = await session_tools.list_user_sessions("user-1", cursor="abc", limit=1)
+        
+        assert result["success"] is True
+        assert result["count"] == 1
+        assert result["next_cursor"] == "next"
+        mock_session_service.get_user_sessions_page.assert_awaited_once_with(
+            user_id="user-1", include_expired=False, cursor="abc", limit=1
+        )
+
+    async def test_list_user_sessions_invalid_limit(self, session_tools, mock_session_service):
+        """Test that an out-of-range page size is rejected."""
+        result = await session_tools.list_user_sessions("user-1", limit=0)
+        
+        assert result["success"] is False
+        mock_session_service.get_user_sessions_page.assert_not_called()
+
+    async def test_expire_session_service_error(self, session_tools, mock_session_service):
+        """Test that service errors are still reported as a failed response."""
+        mock_session_service.expire_session = AsyncMock(side_effect=Exception("Storage error"))
+        
+        result = await session_tools.expire_session("session-1")
+        
+        assert result["success"] is False
+        assert result["error"] == "Storage error"
@@ -0,0 +1,167 @@
+"""
+Unit tests for the text splitter.
+
+This module tests SimpleTextSplitter chunking and document splitting.
+"""
+
+import json
+import random
+import pytest
+from unittest.mock import patch
+
+from mcp_rag_server.utils.text_splitter import SimpleTextSplitter
+
+
+def word_count(text):
+    """Length function counting words."""
+    return len(text.split())
+
+
+def random_text(rng, length):
+    """Build text from words, spaces and paragraph breaks."""
+    return "".join(rng.choice(["alpha ", "beta ", "gamma\n", "\n\n", "  "]) for _ in range(length))
+
+
+class TestSimpleTextSplitter:
+    """Test cases for SimpleTextSplitter."""
+
+    def test_short_text_is_one_chunk(self):
+        """Test that text within chunk size is returned as is."""
+        splitter = SimpleTextSplitter(chunk_size=100, chunk_overlap=10)
+        
+        assert splitter.split_text("A short text.") == ["A short text."]
+        assert splitter.split_text("") == []
+
+    def test_chunks_fit_chunk_size(self):
+        """Test that no chunk exceeds chunk size."""
+        rng = random.Random(0)
+        
+        for _ in range(200):
+            chunk_size = rng.randint(5, 60)
+            splitter = SimpleTextSplitter(chunk_size=chunk_size, chunk_overlap=rng.randint(0, chunk_size - 1))
+            chunks = splitter.split_text(random_text(rng, rng.randint(1, 200)))
+        
+            assert all(0 < len(chunk) <= chunk_size for chunk in chunks)
+
+    def test_chunks_fit_chunk_size_with_custom_length_function(self):
+        """Test that the chunk size bound uses the given length function."""
+        splitter = SimpleTextSplitter(chunk_size=5, chunk_overlap=0, length_function=word_count)
+        text = " ".join(f"word{i}" for i in range(23))
+        
+        chunks = splitter.split_text(text)
+        
+        assert all(word_count(chunk) <= 5 for chunk in chunks)
+        assert " ".join(chunks).split() == text.split()
+
+    def test_overlap_repeats_end_of_previous_chunk(self):
+        """Test that each chunk starts with the end of the previous one."""
+        splitter = SimpleTextSplitter(chunk_size=20, chunk_overlap=8)
+        text = "one two three four five six seven eight nine ten eleven twelve"
+        
+        chunks = splitter.split_text(text)
+        
+        assert len(chunks) > 1
+        for previous, chunk in zip(chunks, chunks[1:]):
+            overlap = text[text.index(chunk):text.index(previous) + len(previous)]
+            assert overlap and previous.endswith(overlap) and chunk.startswith(overlap)
+
+    def test_no_overlap_partitions_text(self):
+        """Test that without overlap the chunks are the words of the text in order."""
+        splitter = SimpleTextSplitter(chunk_size=12, chunk_overlap=0)
+        text = "one two three four five six seven eight"
+        
+        chunks = splitter.split_text(text)
+        
+        assert " ".join(chunks) == text
+
+    def test_falls_back_to_character_windows_without_separators(self):
+        """Test that text without separators is split into overlapping windows."""
+        splitter = SimpleTextSplitter(chunk_size=10, chunk_overlap=4)
+        
+        chunks = splitter.split_text("abcdefghijklmnopqrstuvwxyz")
+        
+        assert chunks == ["abcdefghij", "ghijklmnop", "mnopqrstuv", "stuvwxyz"]
+
+    def test_overlap_clamped_to_half_chunk_size(self):
+        """Test that an overlap close to chunk size is clamped once for every split path."""
+        splitter = SimpleTextSplitter(chunk_size=50, chunk_overlap=49)
+        
+        assert splitter.chunk_overlap == 25
+        
+        # Character windows advance by half a chunk rather than one character
+        chunks = splitter.split_text("x" * 10_000)
+        
+        assert len(chunks) == 399
+        assert all(len(chunk) == 50 for chunk in chunks)
+        
+        # Separator splits overlap by the same clamped amount
+        words = SimpleTextSplitter(chunk_size=50, chunk_overlap=25)
+        text = " ".join(f"word{i}" for i in range(200))
+        
+        assert splitter.split_text(text) == words.split_text(text)
+
+    def test_empty_separator_splits_by_character_count(self):
+        """Test that an empty separator list entry means character windows."""
+        splitter = SimpleTextSplitter(chunk_size=8, chunk_overlap=0, separators=[""])
+        
+        chunks = splitter.split_text("The quick brown fox")
+        
+        assert chunks == ["The quic", "k brown", "fox"]
+
+    def test_iter_split_text_matches_split_text(self):
+        """Test that lazy splitting yields the same chunks."""
+        rng = random.Random(1)
+        splitter = SimpleTextSplitter(chunk_size=30, chunk_overlap=5)
+        
+        for _ in range(50):
+            text = random_text(rng, 100)
+            assert list(splitter.iter_split_text(text)) == splitter.split_text(text)
+
+
+class TestSplitDocuments:
+    """Test cases for splitting documents."""
+
+    @pytest.fixture
+    def documents(self):
+        """Documents large enough to split into several chunks."""
+        rng = random.Random(2)
+        return [
+            {"content": random_text(rng, 300), "metadata": {"source": f"doc{i}"}}
+            for i in range(4)
+        ] + [{"content": "", "metadata": {"source": "empty"}}]
+
+    @pytest.fixture
+    def splitter(self):
+        """Create a splitter with small chunks."""
+        return SimpleTextSplitter(chunk_size=80, chunk_overlap=10)
+
+    def test_chunk_metadata(self, splitter, documents):
+        """Test that chunks carry plain, serializable metadata with their position."""
+        chunks = splitter.split_documents(documents)
+        first_doc_chunks = [chunk for chunk in chunks if chunk["metadata"]["source"] == "doc0"]
+        
+        assert all(chunk["metadata"]["source"] != "empty" for chunk in chunks)
+        assert [chunk["metadata"]["chunk_index"] for chunk in first_doc_chunks] == list(range(len(first_doc_chunks)))
+        assert {chunk["metadata"]["total_chunks"] for chunk in first_doc_chunks} == {len(first_doc_chunks)}
+        assert type(chunks[0]["metadata"]) is dict
+        json.dumps(chunks)
+        
+        chunks[0]["metadata"]["extra"] = True
+        assert "extra" not in documents[0]["metadata"]
+
+    def test_repeated_content_served_from_cache(self, splitter, documents):
+        """Test that content split before is not split again."""
+        first = splitter.split_documents(documents)
+        
+        with patch.object(splitter, "split_text", wraps=splitter.split_text) as split_text:
+            second = splitter.split_documents(documents)
+        
+        assert second == first
+        split_text.assert_not_called()
+        assert splitter._chunk_cache.get_stats()["hits"] == 4
+
+    def test_iter_split_documents_matches_split_documents(self, splitter, documents):
+        """Test that lazy document splitting yields the same chunks."""
+        expected = SimpleTextSplitter(chunk_size=80, chunk_overlap=10).split_documents(documents)
+        
+        assert list(splitter.iter_split_documents(iter(documents))) == expected
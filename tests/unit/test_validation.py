@@ -0,0 +1,148 @@
+"""
+Unit tests for request validation schemas.
+
+This module tests the Pydantic request schemas and response helpers.
+"""
+
+import os
+import sys
+import pytest
+from pydantic import ValidationError
+
+# Set up environment variables for testing to avoid config validation errors
+os.environ.setdefault("MCP_GEMINI_API_KEY", "test_api_key_for_testing")
+
+# Add the src directory to the path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from mcp_rag_server.validation import (
+    validate_document_input, validate_search_input, validate_question_input,
+    validate_memory_input, validate_session_creation, validate_user_id,
+    validate_memory_insights_input, validate_memory_pattern_analysis_input,
+    validate_advanced_search_input, validate_memory_clustering_input,
+    validate_document_input_json, validate_search_input_json,
+    create_success_response, create_error_response
+)
+
+
+class TestRequestValidation:
+    """Test cases for request validation functions."""
+
+    def test_search_input_strips_query(self):
+        """Test that surrounding whitespace is stripped from strings."""
+        result = validate_search_input({"query": "  machine learning  ", "limit": 3})
+        
+        assert result.query == "machine learning"
+        assert result.limit == 3
+
+    def test_search_input_rejects_limit_out_of_range(self):
+        """Test that numeric constraints are enforced."""
+        with pytest.raises(ValidationError):
+            validate_search_input({"query": "test", "limit": 0})
+
+    def test_blank_user_id_rejected(self):
+        """Test that whitespace-only strings fail the length constraint."""
+        with pytest.raises(ValidationError):
+            validate_user_id({"user_id": "   "})
+
+    def test_blank_memory_type_rejected(self):
+        """Test that string fields with defaults are length-checked too."""
+        with pytest.raises(ValidationError):
+            validate_memory_input({"content": "Remember this", "memory_type": "  "})
+
+    def test_enum_like_fields_accept_only_known_values(self):
+        """Test that insight types and time ranges are checked against their allowed values."""
+        assert validate_memory_insights_input({"user_id": "user1", "insight_type": "topics"}).insight_type == "topics"
+        assert validate_memory_pattern_analysis_input({"user_id": "user1", "time_range": "week"}).time_range == "week"
+        
+        with pytest.raises(ValidationError):
+            validate_memory_insights_input({"user_id": "user1", "insight_type": "everything"})
+        with pytest.raises(ValidationError):
+            validate_memory_pattern_analysis_input({"user_id": "user1", "time_range": "decade"})
+
+    def test_search_options_typed(self):
+        """Test that search options are parsed into a typed model with defaults."""
+        result = validate_advanced_search_input({
+            "query": "test",
+            "search_options": {"search_strategy": "fuzzy", "limit": 20}
+        })
+        
+        assert result.search_options.search_strategy == "fuzzy"
+        assert result.search_options.limit == 20
+        assert result.search_options.min_confidence == 0.1
+        
+        assert validate_advanced_search_input({"query": "test"}).search_options is None
+        assert validate_advanced_search_input({"query": "test", "search_options": {}}).search_options.search_strategy == "hierarchical"
+
+    def test_invalid_options_rejected(self):
+        """Test that option values outside their allowed values or ranges are rejected."""
+        with pytest.raises(ValidationError):
+            validate_advanced_search_input({"query": "test", "search_options": {"search_strategy": "random"}})
+        with pytest.raises(ValidationError):
+            validate_memory_clustering_input({"user_id": "user1", "cluster_options": {"similarity_threshold": 1.5}})
+
+    def test_validation_error_is_pydantic_error(self):
+        """Test that the module's ValidationError is the one the helpers raise."""
+        from mcp_rag_server import validation
+        
+        with pytest.raises(validation.ValidationError) as exc_info:
+            validate_user_id({})
+        
+        assert exc_info.value.errors()[0]["loc"] == ("user_id",)
+
+    def test_validated_requests_are_frozen(self):
+        """Test that validated requests cannot be modified."""
+        result = validate_search_input({"query": "test"})
+        
+        with pytest.raises(ValidationError):
+            result.query = "changed"
+
+    def test_metadata_forwarded_without_copy(self):
+        """Test that metadata is passed through as is but must be a dict."""
+        metadata = {"source": "test", "tags": ["a", "b"]}
+        
+        assert validate_document_input({"content": "text", "metadata": metadata}).metadata is metadata
+        
+        with pytest.raises(ValidationError):
+            validate_document_input({"content": "text", "metadata": ["not", "a", "dict"]})
+
+    def test_unknown_fields_ignored(self):
+        """Test that extra fields are ignored."""
+        result = validate_question_input({"question": "What is RAG?", "unexpected": True})
+        
+        assert result.question == "What is RAG?"
+        assert not hasattr(result, "unexpected")
+
+    def test_document_input_defaults(self):
+        """Test document input with default user and metadata."""
+        result = validate_document_input({"content": "Some content"})
+        
+        assert result.metadata is None
+        assert result.user_id
+
+    def test_session_creation_requires_user_id(self):
+        """Test that session creation requires a user ID."""
+        with pytest.raises(ValidationError):
+            validate_session_creation({"session_name": "Test"})
+
+
+class TestResponseHelpers:
+    """Test cases for response helper functions."""
+
+    def test_create_success_response(self):
+        """Test the success response shape."""
+        response = create_success_response({"id": 1}, "add_document")
+        
+        assert response["success"] is True
+        assert response["data"] == {"id": 1}
+        assert response["operation"] == "add_document"
+        assert response["timestamp"]
+
+    def test_create_error_response(self):
+        """Test the error response shape."""
+        response = create_error_response(ValueError("bad input"), "search_documents")
+        
+        assert response["success"] is False
+        assert response["error"] == "bad input"
+        assert response["error_type"] == "ValueError"
+        assert response["operation"] == "search_documents"